@@ -3,10 +3,12 @@ SkillBridge - Sistema de Recomendação de Carreira com ML
 FIAP Global Solution 2025
 """
 
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, stream_with_context
+from datetime import datetime, timezone
 import os
 import sys
 import json
+import threading
 
 # Configurar paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -29,6 +31,19 @@ except Exception as e:
     print(f"❌ Erro ao carregar preditor: {e}")
     predictor = None
 
+# Agrupador de predições em micro-lotes (opcional)
+# Ative com PREDICAO_MICROLOTE=1; ajuste PREDICAO_JANELA_MS e PREDICAO_LOTE_MAXIMO
+agrupador = None
+
+if predictor is not None and os.getenv('PREDICAO_MICROLOTE', '0') == '1':
+    from agrupador_predicoes import AgrupadorPredicoes
+    agrupador = AgrupadorPredicoes(
+        predictor,
+        janela_ms=float(os.getenv('PREDICAO_JANELA_MS', '3')),
+        lote_maximo=int(os.getenv('PREDICAO_LOTE_MAXIMO', '32'))
+    )
+    print(f"✅ Micro-lotes ativos (janela {agrupador.janela_ms}ms, até {agrupador.lote_maximo} perfis)")
+
 
 @app.route('/')
 def index():
@@ -56,7 +71,22 @@ def status_modelos():
         'num_modelos_clf': len(predictor.clf_models),
         'num_modelos_reg': len(predictor.reg_models),
         'modelos_clf': list(predictor.clf_models.keys()),
-        'modelos_reg': list(predictor.reg_models.keys())
+        'modelos_reg': list(predictor.reg_models.keys()),
+        'versao_modelos': predictor.versao_modelos,
+        'cache_predicoes': predictor.cache.estatisticas(),
+        'carregamento_modelos': predictor.relatorio_carregamento()
+    })
+
+
+@app.route('/estatisticas-predicao', methods=['GET'])
+def estatisticas_predicao():
+    """Estatísticas dos micro-lotes de predição (tamanho e latência)"""
+    if agrupador is None:
+        return jsonify({'microlote_ativo': False})
+    
+    return jsonify({
+        'microlote_ativo': True,
+        **agrupador.estatisticas()
     })
 
 
@@ -80,22 +110,24 @@ def analisar_perfil():
         print("="*70)
         
         # Fazer predições ML
-        predicoes = predictor.prever(dados)
+        if agrupador is not None:
+            predicoes = agrupador.prever(dados)
+        else:
+            predicoes = predictor.prever(dados)
         
         # Buscar cursos recomendados
-        from database import firebase_db
+        from catalogo import catalogo_db
         
         area_recomendada = predicoes['recomendacao_final']['area_recomendada']
         habilidades = dados.get('habilidades_atuais_hard', [])
         
-        cursos = firebase_db.buscar_cursos_filtrados(
+        # Os 10 cursos mais relevantes para a área e as habilidades
+        cursos_top = catalogo_db.buscar_cursos_recomendados(
             area_interesse=area_recomendada,
-            habilidades=habilidades
+            habilidades=habilidades,
+            limite=10
         )
         
-        # Limitar a 10 cursos
-        cursos_top = cursos[:10] if cursos else []
-        
         # Montar resposta completa
         resposta = {
             'success': True,
@@ -109,7 +141,8 @@ def analisar_perfil():
             },
             'predicoes': predicoes,
             'cursos_recomendados': cursos_top,
-            'resultados_treinamento': predictor.resultados_treinamento
+            # Métricas completas ficam em /resultados-treinamento (cacheável)
+            'versao_modelos': predictor.versao_modelos
         }
         
         print("\n✅ Análise concluída com sucesso!")
@@ -130,6 +163,130 @@ def analisar_perfil():
         }), 500
 
 
+@app.route('/resultados-treinamento', methods=['GET'])
+def resultados_treinamento():
+    """Métricas de treinamento dos modelos, com ETag/Last-Modified e gzip"""
+    if predictor is None or predictor.resultados_serializados is None:
+        return jsonify({
+            'success': False,
+            'message': 'Resultados de treinamento não disponíveis'
+        }), 404
+    
+    artefato = predictor.resultados_serializados
+    usar_gzip = request.accept_encodings['gzip'] > 0
+    
+    resposta = app.response_class(
+        artefato['gzip'] if usar_gzip else artefato['json'],
+        mimetype='application/json'
+    )
+    if usar_gzip:
+        resposta.headers['Content-Encoding'] = 'gzip'
+    resposta.vary.add('Accept-Encoding')
+    
+    # ETag distinta por codificação, como pede o HTTP para representações diferentes
+    resposta.set_etag(artefato['etag'] + ('-gzip' if usar_gzip else ''))
+    resposta.last_modified = datetime.fromtimestamp(artefato['modificado_em'], timezone.utc)
+    resposta.cache_control.no_cache = True  # sempre revalidar (responde 304 se não mudou)
+    resposta.headers['X-Versao-Modelos'] = predictor.versao_modelos or ''
+    
+    return resposta.make_conditional(request)
+
+
+@app.route('/cursos', methods=['GET'])
+def listar_cursos():
+    """Catálogo de cursos paginado por cursor (?tamanho=20&cursor=...)"""
+    from catalogo import catalogo_db
+
+    tamanho = min(max(request.args.get('tamanho', 20, type=int), 1), 100)
+    pagina = catalogo_db.buscar_cursos_pagina(tamanho, request.args.get('cursor'))
+
+    return jsonify({
+        'success': True,
+        'cursos': pagina['cursos'],
+        'proximo_cursor': pagina['proximo_cursor'],
+        'total': catalogo_db.contar_cursos()
+    })
+
+
+_gerenciador_planos = None
+_gerenciador_planos_lock = threading.Lock()
+
+
+def gerenciador_planos():
+    """Gerenciador de jobs de planos de carreira (criado no primeiro uso)"""
+    global _gerenciador_planos
+    if _gerenciador_planos is None:
+        # Primeiros pedidos simultâneos: só um cria o gerenciador (e o pool)
+        with _gerenciador_planos_lock:
+            if _gerenciador_planos is None:
+                from planos_carreira import GerenciadorPlanos
+                _gerenciador_planos = GerenciadorPlanos()
+    return _gerenciador_planos
+
+
+@app.route('/planos', methods=['POST'])
+def criar_plano():
+    """Submete a geração do plano de carreira; responde com o id do job"""
+    try:
+        job = gerenciador_planos().submeter(request.get_json() or {})
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Erro ao submeter plano: {e}'}), 500
+
+    status = 200 if job['estado'] in ('concluido', 'erro') else 202
+    resposta = jsonify({'success': True, **job})
+    resposta.headers['Location'] = f"/planos/{job['id']}"
+    return resposta, status
+
+
+def _evento_sse(dados, evento=None):
+    """Mensagem Server-Sent Events com os dados em JSON (uma linha)"""
+    linhas = f"event: {evento}\n" if evento else ""
+    return f"{linhas}data: {json.dumps(dados, ensure_ascii=False)}\n\n"
+
+
+@app.route('/planos/fluxo', methods=['POST'])
+def plano_em_fluxo():
+    """
+    Gera o plano de carreira e envia os trechos por SSE, conforme chegam
+    
+    Eventos: "trecho" ({"texto": ...}) a cada parte do plano, "fim" ao
+    terminar e "erro" ({"mensagem": ...}) em caso de falha. Se o cliente
+    desconectar, o servidor fecha o gerador na próxima escrita e a geração
+    no modelo é interrompida.
+    """
+    formulario = request.get_json() or {}
+    
+    def eventos():
+        try:
+            fluxo = gerenciador_planos().fluxo(formulario)
+            try:
+                for trecho in fluxo:
+                    yield _evento_sse({'texto': trecho}, 'trecho')
+            finally:
+                fluxo.close()
+            yield _evento_sse({}, 'fim')
+        except GeneratorExit:
+            print("⚠️  Cliente desconectou: geração do plano cancelada")
+            raise
+        except Exception as e:
+            yield _evento_sse({'mensagem': str(e)}, 'erro')
+    
+    return Response(
+        stream_with_context(eventos()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/planos/<job_id>', methods=['GET'])
+def consultar_plano(job_id):
+    """Estado do job de plano de carreira (e o plano, quando concluído)"""
+    job = gerenciador_planos().consultar(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Job não encontrado'}), 404
+    return jsonify({'success': True, **job})
+
+
 @app.route('/resultados')
 def resultados():
     """Página de resultados - mostra as predições ML"""
@@ -144,7 +301,7 @@ def resultados():
                 'recomendacao_final': {}
             },
             'cursos_recomendados': [],
-            'resultados_treinamento': {}
+            'versao_modelos': None
         })
     except Exception as e:
         return f"Erro ao carregar página de resultados: {e}", 500
@@ -0,0 +1,130 @@
+"""
+Agrupador de Predições em Micro-Lotes
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Fica na frente do MLPredictor no servidor Flask: junta as requisições que
+chegam dentro de uma janela curta (ou até um número máximo de perfis),
+executa todas com uma única chamada a prever_lote e devolve cada resultado
+à requisição que está esperando por ele.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+
+def _percentil(valores, p):
+    """Percentil simples (nearest-rank) de uma sequência"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, int(round(p / 100 * len(ordenados))) - 1))
+    return ordenados[indice]
+
+
+class AgrupadorPredicoes:
+    """Agrupa predições concorrentes em lotes para o MLPredictor"""
+
+    def __init__(self, predictor, janela_ms=3, lote_maximo=32, historico=1000):
+        """
+        Args:
+            predictor (MLPredictor): Preditor com o método prever_lote
+            janela_ms (float): Tempo máximo de espera por mais requisições
+                depois que a primeira do lote chega
+            lote_maximo (int): Número máximo de perfis por lote
+            historico (int): Quantos lotes/requisições recentes entram nas
+                estatísticas de latência
+        """
+        self.predictor = predictor
+        self.janela_ms = janela_ms
+        self.lote_maximo = lote_maximo
+
+        self._fila = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._tamanhos = deque(maxlen=historico)
+        self._latencias_lote = deque(maxlen=historico)  # ms de execução por lote
+        self._latencias_pedido = deque(maxlen=historico)  # ms da fila até o resultado
+        self._total_lotes = 0
+        self._total_pedidos = 0
+
+        self._thread = threading.Thread(
+            target=self._executar, name="agrupador-predicoes", daemon=True
+        )
+        self._thread.start()
+
+    def prever(self, formulario, timeout=None):
+        """Enfileira um formulário e bloqueia até o resultado do seu lote"""
+        futuro = Future()
+        self._fila.put((formulario, futuro, time.perf_counter()))
+        return futuro.result(timeout)
+
+    def _coletar_lote(self):
+        """Espera o primeiro pedido e junta os que chegarem dentro da janela"""
+        lote = [self._fila.get()]
+        prazo = time.perf_counter() + self.janela_ms / 1000
+
+        while len(lote) < self.lote_maximo:
+            restante = prazo - time.perf_counter()
+            if restante <= 0:
+                break
+            try:
+                lote.append(self._fila.get(timeout=restante))
+            except queue.Empty:
+                break
+
+        return lote
+
+    def _executar(self):
+        while True:
+            lote = self._coletar_lote()
+            inicio = time.perf_counter()
+
+            try:
+                resultados = self.predictor.prever_lote([f for f, _, _ in lote])
+            except Exception:
+                # Um formulário inválido não pode derrubar o lote inteiro:
+                # refaz um a um para isolar o erro em quem o causou
+                for formulario, futuro, _ in lote:
+                    try:
+                        futuro.set_result(self.predictor.prever(formulario))
+                    except Exception as e:
+                        futuro.set_exception(e)
+            else:
+                for (_, futuro, _), resultado in zip(lote, resultados):
+                    futuro.set_result(resultado)
+
+            fim = time.perf_counter()
+            with self._stats_lock:
+                self._total_lotes += 1
+                self._total_pedidos += len(lote)
+                self._tamanhos.append(len(lote))
+                self._latencias_lote.append((fim - inicio) * 1000)
+                self._latencias_pedido.extend((fim - chegada) * 1000 for _, _, chegada in lote)
+
+    def estatisticas(self):
+        """Tamanho dos lotes e latências, para calibrar janela x throughput"""
+        with self._stats_lock:
+            tamanhos = list(self._tamanhos)
+            latencias_lote = list(self._latencias_lote)
+            latencias_pedido = list(self._latencias_pedido)
+            total_lotes = self._total_lotes
+            total_pedidos = self._total_pedidos
+
+        return {
+            'janela_ms': self.janela_ms,
+            'lote_maximo': self.lote_maximo,
+            'total_lotes': total_lotes,
+            'total_pedidos': total_pedidos,
+            'tamanho_medio_lote': sum(tamanhos) / len(tamanhos) if tamanhos else 0.0,
+            'tamanho_maximo_lote': max(tamanhos, default=0),
+            'latencia_lote_ms': {
+                'p50': _percentil(latencias_lote, 50),
+                'p99': _percentil(latencias_lote, 99)
+            },
+            'latencia_pedido_ms': {
+                'p50': _percentil(latencias_pedido, 50),
+                'p99': _percentil(latencias_pedido, 99)
+            }
+        }
@@ -1,78 +1,527 @@
+import json
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
 import requests
+from requests.adapters import HTTPAdapter
 from lxml import html
-from database import firebase_db
+from cache_paginas import CachePaginas, hash_conteudo
+from catalogo import catalogo_db
 
 BASE_URL = "https://www.alura.com.br"
-LISTA_CURSOS_URL = f"{BASE_URL}/cursos-online-tecnologia"
+LISTA_CURSOS_PATH = "/cursos-online-tecnologia"
+LISTA_CURSOS_URL = f"{BASE_URL}{LISTA_CURSOS_PATH}"
 
+# Configurações do crawler (podem ser ajustadas por variável de ambiente)
+CONCORRENCIA = int(os.getenv("SCRAPER_CONCORRENCIA", "8"))
+REQUISICOES_POR_SEGUNDO = float(os.getenv("SCRAPER_REQUISICOES_POR_SEGUNDO", "5"))
+TENTATIVAS = int(os.getenv("SCRAPER_TENTATIVAS", "3"))
+TIMEOUT = 10
+TAMANHO_LOTE = int(os.getenv("SCRAPER_TAMANHO_LOTE", "100"))  # cursos por escrita no Firestore
 
-def extrair_links_alura(url=LISTA_CURSOS_URL):
-    """Extrai links dos cursos"""
-    response = requests.get(url)
-    response.raise_for_status()
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_CHECKPOINT = os.getenv(
+    "SCRAPER_CHECKPOINT", os.path.join(BASE_DIR, "data", "checkpoint_scraper.jsonl")
+)
+CAMINHO_FALHAS = os.getenv(
+    "SCRAPER_FALHAS", os.path.join(BASE_DIR, "data", "falhas_scraper.json")
+)
 
-    tree = html.fromstring(response.content)
-    links = tree.xpath('//a[contains(@class, "card-curso")]/@href')
-    links_completos = [BASE_URL + link for link in set(links)]
-    return links_completos
+# Respostas que valem nova tentativa (limite de taxa e erros do servidor)
+STATUS_RETENTAVEIS = {429, 500, 502, 503, 504}
 
 
-def extrair_detalhes_curso(url):
-    """Extrai detalhes de um curso"""
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+class LimitadorTaxa:
+    """Limita as requisições por segundo para cada host"""
+
+    def __init__(self, requisicoes_por_segundo):
+        self.intervalo = 1 / requisicoes_por_segundo if requisicoes_por_segundo > 0 else 0
+        self._proxima_vaga = {}  # host -> instante liberado para a próxima requisição
+        self._lock = threading.Lock()
+
+    def aguardar(self, url):
+        """Bloqueia até a próxima vaga do host da URL"""
+        if not self.intervalo:
+            return
+
+        host = urlparse(url).netloc
+        with self._lock:
+            agora = time.monotonic()
+            vaga = max(agora, self._proxima_vaga.get(host, agora))
+            self._proxima_vaga[host] = vaga + self.intervalo
+
+        espera = vaga - agora
+        if espera > 0:
+            time.sleep(espera)
+
+
+class CheckpointScraper:
+    """
+    URLs já gravadas no Firestore, uma linha JSON por lote confirmado
+
+    Cada lote é anexado ao arquivo depois do commit, então uma execução
+    interrompida retoma a partir do último lote gravado. Uma última linha
+    truncada (queda no meio da escrita) é ignorada.
+
+    O checkpoint só vale para retomar uma passagem interrompida: ao fim de
+    toda passagem completa ele é apagado (mesmo com erros), e as URLs que
+    falharam vão para uma lista à parte, tentada primeiro na próxima
+    execução.
+    """
+
+    def __init__(self, caminho=CAMINHO_CHECKPOINT, caminho_falhas=CAMINHO_FALHAS):
+        self.caminho = caminho
+        self.caminho_falhas = caminho_falhas
+
+    def carregar(self):
+        concluidos = set()
+        if not os.path.exists(self.caminho):
+            return concluidos
+
+        with open(self.caminho, "r", encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    concluidos.update(json.loads(linha))
+                except json.JSONDecodeError:
+                    break
+        return concluidos
+
+    def registrar(self, urls):
+        os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+        with open(self.caminho, "a", encoding="utf-8") as f:
+            f.write(json.dumps(urls) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def limpar(self):
+        if os.path.exists(self.caminho):
+            os.remove(self.caminho)
+
+    def carregar_falhas(self):
+        """URLs que falharam na última passagem completa"""
+        if not os.path.exists(self.caminho_falhas):
+            return []
+        with open(self.caminho_falhas, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def registrar_falhas(self, urls):
+        """Substitui a lista de falhas (vazia = apaga o arquivo)"""
+        if not urls:
+            if os.path.exists(self.caminho_falhas):
+                os.remove(self.caminho_falhas)
+            return
+        os.makedirs(os.path.dirname(self.caminho_falhas) or ".", exist_ok=True)
+        temporario = self.caminho_falhas + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(sorted(urls), f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.caminho_falhas)
+
+
+def _colocar(fila, item, parar):
+    """put() bloqueante que desiste quando o pipeline é encerrado"""
+    while not parar.is_set():
+        try:
+            fila.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def em_lotes(itens, tamanho):
+    """Agrupa um iterável em listas de até `tamanho` itens"""
+    lote = []
+    for item in itens:
+        lote.append(item)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+class CrawlerAlura:
+    """Crawler concorrente: pool de threads sobre uma sessão HTTP compartilhada"""
+
+    def __init__(self, base_url=BASE_URL, concorrencia=CONCORRENCIA,
+                 requisicoes_por_segundo=REQUISICOES_POR_SEGUNDO, tentativas=TENTATIVAS,
+                 timeout=TIMEOUT, backoff=0.5, session=None, cache=None):
+        """
+        Args:
+            base_url (str): Raiz do site (troque por um servidor local nos testes)
+            concorrencia (int): Número máximo de requisições simultâneas
+            requisicoes_por_segundo (float): Limite por host (0 = sem limite)
+            tentativas (int): Tentativas por URL antes de desistir
+            timeout (float): Timeout de cada requisição, em segundos
+            backoff (float): Espera base entre tentativas (dobra a cada falha)
+            session (requests.Session): Sessão a reutilizar (opcional)
+            cache (CachePaginas): Cache de páginas para recrawls incrementais
+                (opcional; sem ele toda página é baixada e processada)
+        """
+        self.base_url = base_url
+        self.concorrencia = concorrencia
+        self.tentativas = tentativas
+        self.timeout = timeout
+        self.backoff = backoff
+        self.limitador = LimitadorTaxa(requisicoes_por_segundo)
+        self.session = session or self._criar_sessao()
+        self.cache = cache
+
+        self.estatisticas = {}  # url -> tempo, tentativas e status
+        self.situacoes = {}  # url -> novo, alterado, inalterado ou erro
+        self._stats_lock = threading.Lock()
+
+    def _criar_sessao(self):
+        """Sessão com pool de conexões do tamanho da concorrência"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.concorrencia)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = "SkillBridge-Scraper/1.0"
+        return session
+
+    def buscar(self, url, cabecalhos=None):
+        """
+        GET com limite de taxa e novas tentativas com backoff exponencial
+
+        Erros de rede, 429 e 5xx são retentados; demais erros HTTP não.
+        Um 304 (resposta a um GET condicional) é devolvido normalmente.
+        """
+        inicio = time.perf_counter()
+        tentativa = 0
+        status = None
+
+        try:
+            while True:
+                tentativa += 1
+                self.limitador.aguardar(url)
+                try:
+                    response = self.session.get(url, headers=cabecalhos, timeout=self.timeout)
+                    status = response.status_code
+                    if status not in STATUS_RETENTAVEIS:
+                        response.raise_for_status()
+                        return response
+                    erro = requests.HTTPError(f"HTTP {status}", response=response)
+                except requests.HTTPError:
+                    raise
+                except requests.RequestException as e:
+                    erro = e
+
+                if tentativa >= self.tentativas:
+                    raise erro
+
+                # Backoff exponencial com jitter para não sincronizar as threads
+                time.sleep(self.backoff * 2 ** (tentativa - 1) * random.uniform(0.5, 1.5))
+        finally:
+            with self._stats_lock:
+                self.estatisticas[url] = {
+                    "tempo_ms": (time.perf_counter() - inicio) * 1000,
+                    "tentativas": tentativa,
+                    "status": status
+                }
+
+    def extrair_links(self, path=LISTA_CURSOS_PATH):
+        """Extrai links dos cursos da página de listagem"""
+        response = self.buscar(urljoin(self.base_url, path))
+
         tree = html.fromstring(response.content)
+        links = tree.xpath('//a[contains(@class, "card-curso")]/@href')
+        return [urljoin(self.base_url, link) for link in sorted(set(links))]
+
+    def extrair_detalhes_curso(self, url):
+        """
+        Extrai detalhes de um curso (None em caso de erro)
+
+        Com cache, a página é pedida com GET condicional. Um 304 ou um
+        conteúdo com o mesmo hash da última execução dispensa o parse e
+        devolve o curso guardado, marcado como inalterado em `situacoes`.
+        """
+        try:
+            if self.cache is None:
+                curso = parsear_detalhes_curso(url, self.buscar(url).content)
+                self._registrar_situacao(url, "novo")
+                return curso
+
+            entrada = self.cache.obter(url)
+            response = self.buscar(url, self.cache.cabecalhos_condicionais(url))
+
+            if response.status_code == 304 and entrada:
+                self._registrar_situacao(url, "inalterado")
+                return entrada["curso"]
+
+            validadores = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified")
+            }
+            hash_pagina = hash_conteudo(response.content)
+
+            if entrada and entrada.get("hash_pagina") == hash_pagina:
+                self.cache.gravar(url, **validadores)
+                self._registrar_situacao(url, "inalterado")
+                return entrada["curso"]
+
+            # Páginas com trechos dinâmicos mudam de hash a cada requisição;
+            # o hash do curso extraído decide se houve mudança de fato
+            curso = parsear_detalhes_curso(url, response.content)
+            hash_curso = hash_conteudo(curso)
+
+            if entrada is None:
+                situacao = "novo"
+            elif entrada.get("hash_curso") == hash_curso:
+                situacao = "inalterado"
+            else:
+                situacao = "alterado"
 
-        titulo = tree.xpath('string(//h1[contains(@class, "curso-banner-course-title")])').strip()
-        aprendizado = tree.xpath('//ul[@class="course-list"]/li/text()')
-        aprendizado_texto = " | ".join([a.strip() for a in aprendizado if a.strip()])
-        publico_alvo = tree.xpath('string(//p[contains(@class, "couse-text--target-audience")])').strip()
+            self.cache.gravar(url, hash_pagina=hash_pagina, hash_curso=hash_curso,
+                              curso=curso, **validadores)
+            self._registrar_situacao(url, situacao)
+            return curso
+
+        except Exception as e:
+            print(f"⚠️  Erro ao processar {url}: {e}")
+            self._registrar_situacao(url, "erro")
+            return None
+
+    def _registrar_situacao(self, url, situacao):
+        with self._stats_lock:
+            self.situacoes[url] = situacao
+
+    def extrair_detalhes(self, links, apenas_alterados=False):
+        """
+        Extrai os detalhes de vários cursos em paralelo, na ordem dos links
+
+        O cache de páginas é atualizado só em memória: quem chama grava os
+        cursos e depois persiste o cache (self.cache.salvar()). Se a
+        gravação falhar, o cache em disco continua apontando os cursos
+        como novos/alterados e eles voltam na próxima execução.
+
+        Args:
+            links (list): URLs dos cursos
+            apenas_alterados (bool): Devolve só os cursos novos ou alterados
+                desde a última execução (requer cache)
+        """
+        with ThreadPoolExecutor(max_workers=self.concorrencia) as executor:
+            cursos = list(executor.map(self.extrair_detalhes_curso, links))
+
+        if apenas_alterados:
+            return [
+                curso for link, curso in zip(links, cursos)
+                if self.situacoes.get(link) in ("novo", "alterado")
+            ]
+        return cursos
+
+    def processar_em_fluxo(self, links, tamanho_fila=None):
+        """
+        Gerador: baixa e processa os links à medida que chegam
+
+        Os links (qualquer iterável, inclusive outro gerador) passam por uma
+        fila limitada até as threads do crawler, e os resultados por outra
+        fila limitada até quem consome o gerador. A memória fica limitada
+        pelo tamanho das filas, não pelo tamanho do catálogo. A ordem de
+        saída é a de conclusão, não a dos links.
+
+        Yields:
+            tuple: (url, curso ou None, situação)
+        """
+        tamanho_fila = tamanho_fila or self.concorrencia * 2
+        fila_links = queue.Queue(maxsize=tamanho_fila)
+        fila_saida = queue.Queue(maxsize=tamanho_fila)
+        parar = threading.Event()
+        fim = object()
+
+        def alimentar():
+            try:
+                for link in links:
+                    if not _colocar(fila_links, link, parar):
+                        return
+            finally:
+                for _ in range(self.concorrencia):
+                    _colocar(fila_links, fim, parar)
+
+        def trabalhar():
+            while not parar.is_set():
+                try:
+                    link = fila_links.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if link is fim:
+                    break
+                curso = self.extrair_detalhes_curso(link)
+                if not _colocar(fila_saida, (link, curso, self.situacoes.get(link)), parar):
+                    return
+            _colocar(fila_saida, fim, parar)
+
+        threads = [threading.Thread(target=alimentar, daemon=True)]
+        threads += [threading.Thread(target=trabalhar, daemon=True) for _ in range(self.concorrencia)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            ativos = self.concorrencia
+            while ativos:
+                item = fila_saida.get()
+                if item is fim:
+                    ativos -= 1
+                else:
+                    yield item
+        finally:
+            # Consumidor encerrou (fim, erro ou close()): libera as threads
+            parar.set()
+            for thread in threads:
+                thread.join()
+
+    def resumo_situacoes(self):
+        """Quantidade de cursos novos, alterados, inalterados e com erro"""
+        with self._stats_lock:
+            situacoes = list(self.situacoes.values())
+        return {s: situacoes.count(s) for s in ("novo", "alterado", "inalterado", "erro")}
+
+    def resumo_estatisticas(self):
+        """Tempo por URL agregado: total, falhas, novas tentativas e percentis"""
+        with self._stats_lock:
+            stats = list(self.estatisticas.values())
+
+        tempos = sorted(s["tempo_ms"] for s in stats)
+
+        def percentil(p):
+            return tempos[min(len(tempos) - 1, int(p / 100 * len(tempos)))] if tempos else 0.0
 
         return {
-            "titulo": titulo,
-            "url": url,
-            "aprendizado": aprendizado_texto,
-            "publico_alvo": publico_alvo
+            "urls": len(stats),
+            "falhas": sum(1 for s in stats if s["status"] is None or s["status"] >= 400),
+            "novas_tentativas": sum(s["tentativas"] - 1 for s in stats),
+            "tempo_medio_ms": sum(tempos) / len(tempos) if tempos else 0.0,
+            "tempo_p50_ms": percentil(50),
+            "tempo_p95_ms": percentil(95),
+            "tempo_max_ms": tempos[-1] if tempos else 0.0
         }
 
-    except Exception as e:
-        print(f"⚠️  Erro ao processar {url}: {e}")
-        return None
+
+def parsear_detalhes_curso(url, conteudo):
+    """Extrai título, aprendizado e público-alvo do HTML de um curso"""
+    tree = html.fromstring(conteudo)
+
+    titulo = tree.xpath('string(//h1[contains(@class, "curso-banner-course-title")])').strip()
+    aprendizado = tree.xpath('//ul[@class="course-list"]/li/text()')
+    aprendizado_texto = " | ".join([a.strip() for a in aprendizado if a.strip()])
+    publico_alvo = tree.xpath('string(//p[contains(@class, "couse-text--target-audience")])').strip()
+
+    return {
+        "titulo": titulo,
+        "url": url,
+        "aprendizado": aprendizado_texto,
+        "publico_alvo": publico_alvo
+    }
+
+
+def extrair_links_alura(url=LISTA_CURSOS_URL):
+    """Extrai links dos cursos"""
+    return CrawlerAlura().extrair_links(url)
+
+
+def extrair_detalhes_curso(url):
+    """Extrai detalhes de um curso"""
+    return CrawlerAlura().extrair_detalhes_curso(url)
 
 
-def extrair_todos_detalhes():
-    """Extrai todos os cursos e salva no Firebase"""
+def extrair_todos_detalhes(crawler=None, tamanho_lote=TAMANHO_LOTE, checkpoint=None):
+    """
+    Extrai todos os cursos e salva no Firebase em fluxo
+
+    Pipeline: descoberta dos links -> download/parse concorrente -> escrita
+    em lotes. Cada lote de `tamanho_lote` cursos é gravado (upsert) assim
+    que fica pronto e registrado no checkpoint; uma execução interrompida
+    retoma dos links ainda não gravados. Com cache de páginas (padrão), só
+    cursos novos ou alterados são enviados ao Firestore. Ao final, cursos
+    que saíram da listagem são removidos, o checkpoint é apagado e as URLs
+    com erro ficam na lista de falhas, tentadas primeiro na próxima vez.
+    """
+    crawler = crawler or CrawlerAlura(cache=CachePaginas())
+    checkpoint = checkpoint or CheckpointScraper()
+    incremental = crawler.cache is not None
+
     print("=" * 60)
     print("🔍 SCRAPER DE CURSOS DA ALURA → FIREBASE")
     print("=" * 60)
-    
+
     print("\n📋 Extraindo links de cursos...")
-    links = extrair_links_alura()
+    links = crawler.extrair_links()
     print(f"✅ {len(links)} cursos encontrados")
 
-    print("\n🔄 Extraindo detalhes dos cursos...")
-    cursos_detalhados = []
-    # for i, link in enumerate(links[:10], 1):
-    for i, link in enumerate(links, 1):
-        print(f"   [{i}/{len(links)}] {link}")
-        detalhes = extrair_detalhes_curso(link)
-        if detalhes:
-            cursos_detalhados.append(detalhes)
-
-    print(f"\n📊 Total coletado: {len(cursos_detalhados)} cursos")
-
-    print("\n🔥 Salvando no Firebase Firestore...")
-    sucesso = firebase_db.inserir_cursos(cursos_detalhados)
-    
-    if sucesso:
-        print("\n" + "=" * 60)
-        print("✅ PROCESSO CONCLUÍDO COM SUCESSO!")
-        print("=" * 60)
-        print(f"📌 {len(cursos_detalhados)} cursos disponíveis no Firebase")
-    else:
-        print("\n❌ Falha ao salvar no Firebase")
+    concluidos = checkpoint.carregar()
+    if concluidos:
+        print(f"↩️  Retomando execução anterior: {len(concluidos)} cursos já gravados")
+
+    # Falhas da passagem anterior vão na frente
+    falhas_anteriores = set(checkpoint.carregar_falhas()) & set(links)
+    if falhas_anteriores:
+        print(f"🔁 {len(falhas_anteriores)} cursos com erro na execução anterior serão tentados primeiro")
+    ordem = sorted(links, key=lambda link: link not in falhas_anteriores)
+    pendentes = (link for link in ordem if link not in concluidos)
+
+    print(f"\n🔄 Extraindo e salvando cursos ({crawler.concorrencia} em paralelo, "
+          f"lotes de {tamanho_lote})...")
+    inicio = time.perf_counter()
+    gravados = processados = 0
+    falhas = []
+
+    for lote in em_lotes(crawler.processar_em_fluxo(pendentes), tamanho_lote):
+        cursos = [
+            curso for _, curso, situacao in lote
+            if curso and (not incremental or situacao in ("novo", "alterado"))
+        ]
+
+        if cursos and not catalogo_db.salvar_cursos(cursos):
+            print("\n❌ Falha ao salvar no Firebase; execute novamente para retomar")
+            return
+
+        # Cursos com erro ficam fora do checkpoint e são tentados de novo
+        checkpoint.registrar([url for url, curso, _ in lote if curso])
+        gravados += len(cursos)
+        processados += len(lote)
+        falhas += [url for url, curso, _ in lote if not curso]
+        print(f"   ✓ {processados}/{len(links) - len(concluidos)} processados, {gravados} gravados")
+
+    duracao = time.perf_counter() - inicio
+
+    # Só agora, com todos os lotes gravados, o cache deixa de ver esses
+    # cursos como novos/alterados
+    if incremental:
+        crawler.cache.salvar()
+
+    print(f"\n📊 Total processado: {processados} cursos em {duracao:.1f}s")
+    if incremental:
+        situacoes = crawler.resumo_situacoes()
+        print(f"   🆕 Novos: {situacoes['novo']} | ✏️  Alterados: {situacoes['alterado']} | "
+              f"💤 Inalterados: {situacoes['inalterado']} | ❌ Erros: {situacoes['erro']}")
+    resumo = crawler.resumo_estatisticas()
+    print(f"   ⏱️  Por URL: média {resumo['tempo_medio_ms']:.0f}ms | "
+          f"p50 {resumo['tempo_p50_ms']:.0f}ms | p95 {resumo['tempo_p95_ms']:.0f}ms")
+    print(f"   🔁 Novas tentativas: {resumo['novas_tentativas']} | ❌ Falhas: {resumo['falhas']}")
+
+    if links:
+        catalogo_db.remover_ausentes(links)
+
+    # Passagem completa: a próxima execução recomeça do zero (o cache de
+    # páginas evita reenviar o que não mudou)
+    checkpoint.limpar()
+    checkpoint.registrar_falhas(falhas)
+
+    if falhas:
+        print(f"\n⚠️  {len(falhas)} cursos com erro (lista em {checkpoint.caminho_falhas}); "
+              f"serão tentados primeiro na próxima execução")
+        return
+
+    print("\n" + "=" * 60)
+    print("✅ PROCESSO CONCLUÍDO COM SUCESSO!")
+    print("=" * 60)
+    print(f"📌 {gravados} cursos gravados no Firebase")
 
 
 if __name__ == "__main__":
-    extrair_todos_detalhes()
\ No newline at end of file
+    extrair_todos_detalhes()
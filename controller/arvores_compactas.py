@@ -0,0 +1,250 @@
+"""
+Árvores Compactas em Arrays Mapeados em Memória
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Os ensembles de árvores (RandomForest e GradientBoosting) são achatados em
+arrays numpy contíguos (feature, threshold, filhos e valores das folhas) e
+gravados como arquivos .npy ao lado dos .joblib em models/. Abertos com
+mmap_mode="r", esses arquivos ficam no page cache do sistema operacional e
+são compartilhados por todos os workers, em vez de cada processo manter a
+sua própria cópia das florestas.
+
+Os mesmos arrays formam um motor de inferência: todas as árvores são
+percorridas ao mesmo tempo, de forma vetorizada, e as saídas são somadas
+na ordem do ensemble, reproduzindo os valores do sklearn.
+"""
+
+import json
+import os
+import numpy as np
+
+# Arrays gravados para cada modelo
+ARRAYS = ('feature', 'threshold', 'esquerda', 'direita', 'valores', 'raizes')
+
+# Linhas avaliadas por vez (limita a matriz árvores x linhas em memória)
+TAMANHO_BLOCO = 4096
+
+# Diferença máxima aceita entre o motor compilado e o sklearn
+TOLERANCIA = 1e-12
+
+
+def suporta(modelo):
+    """Indica se o modelo é um ensemble de árvores que pode ser compactado"""
+    return _tipo(modelo) is not None
+
+
+def _tipo(modelo):
+    nome = type(modelo).__name__
+    return {
+        'RandomForestClassifier': 'rf_clf',
+        'RandomForestRegressor': 'rf_reg',
+        'GradientBoostingClassifier': 'gb_clf'
+    }.get(nome)
+
+
+def _valores_folhas(arvore, tipo):
+    """Valor de cada nó, já no formato que a árvore do sklearn devolve"""
+    valores = arvore.tree_.value[:, 0, :]
+
+    if tipo == 'rf_clf':
+        # Mesma normalização de DecisionTreeClassifier.predict_proba
+        normalizador = valores.sum(axis=1)[:, np.newaxis]
+        normalizador[normalizador == 0.0] = 1.0
+        return valores / normalizador
+
+    return valores[:, :1]
+
+
+def compilar(modelo):
+    """
+    Achata todas as árvores do ensemble em arrays contíguos
+
+    Returns:
+        tuple: (arrays, meta) - dicionário de arrays numpy e metadados
+    """
+    tipo = _tipo(modelo)
+    if tipo is None:
+        raise ValueError(f"Modelo não suportado: {type(modelo).__name__}")
+
+    # GradientBoosting: estimators_ tem forma (estágios, classes)
+    arvores = list(np.asarray(modelo.estimators_).ravel())
+
+    feature, threshold, esquerda, direita, valores, raizes = [], [], [], [], [], []
+    deslocamento = 0
+
+    for arvore in arvores:
+        tree = arvore.tree_
+        folha = tree.children_left == -1
+
+        raizes.append(deslocamento)
+        feature.append(np.where(folha, 0, tree.feature))
+        threshold.append(np.where(folha, 0.0, tree.threshold))
+        esquerda.append(np.where(folha, -1, tree.children_left + deslocamento))
+        direita.append(np.where(folha, -1, tree.children_right + deslocamento))
+        valores.append(_valores_folhas(arvore, tipo))
+
+        deslocamento += tree.node_count
+
+    arrays = {
+        'feature': np.concatenate(feature).astype(np.int32),
+        'threshold': np.concatenate(threshold).astype(np.float64),
+        'esquerda': np.concatenate(esquerda).astype(np.int32),
+        'direita': np.concatenate(direita).astype(np.int32),
+        'valores': np.ascontiguousarray(np.concatenate(valores), dtype=np.float64),
+        'raizes': np.array(raizes, dtype=np.int64)
+    }
+
+    meta = {'tipo': tipo, 'n_arvores': len(arvores)}
+
+    if tipo in ('rf_clf', 'gb_clf'):
+        meta['classes'] = modelo.classes_.tolist()
+
+    if tipo == 'gb_clf':
+        estagios, k = modelo.estimators_.shape
+        meta['n_estagios'] = estagios
+        meta['k'] = k
+        meta['learning_rate'] = modelo.learning_rate
+        # Predição inicial (prior das classes): constante para qualquer linha
+        zeros = np.zeros((1, modelo.n_features_in_))
+        meta['raw_inicial'] = modelo._raw_predict_init(zeros)[0].tolist()
+
+    return arrays, meta
+
+
+def salvar_arvores(modelo, diretorio):
+    """Grava os arrays (.npy) e os metadados (meta.json) do modelo"""
+    arrays, meta = compilar(modelo)
+    os.makedirs(diretorio, exist_ok=True)
+
+    for nome, array in arrays.items():
+        np.save(os.path.join(diretorio, f'{nome}.npy'), array)
+
+    with open(os.path.join(diretorio, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    return diretorio
+
+
+class ArvoresCompactas:
+    """Ensemble de árvores avaliado diretamente sobre os arrays achatados"""
+
+    def __init__(self, arrays, meta):
+        for nome in ARRAYS:
+            setattr(self, nome, arrays[nome])
+
+        self.meta = meta
+        self.tipo = meta['tipo']
+        if 'classes' in meta:
+            self.classes_ = np.array(meta['classes'])
+
+    @classmethod
+    def de_modelo(cls, modelo):
+        """Compila um ensemble treinado do sklearn em memória"""
+        return cls(*compilar(modelo))
+
+    @classmethod
+    def carregar(cls, diretorio, mmap_mode='r'):
+        """Abre os arrays de um diretório gerado por salvar_arvores"""
+        with open(os.path.join(diretorio, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+
+        arrays = {
+            nome: np.load(os.path.join(diretorio, f'{nome}.npy'), mmap_mode=mmap_mode)
+            for nome in ARRAYS
+        }
+        return cls(arrays, meta)
+
+    def _folhas(self, X):
+        """
+        Folha alcançada por cada linha em cada árvore: matriz (árvores, linhas)
+
+        Todas as árvores descem um nível por iteração; o laço roda no
+        máximo a profundidade da árvore mais funda.
+        """
+        n = X.shape[0]
+        no = np.repeat(self.raizes[:, np.newaxis], n, axis=1)
+        colunas = np.broadcast_to(np.arange(n), no.shape)
+
+        while True:
+            esquerda = self.esquerda[no]
+            folha = esquerda == -1
+            if folha.all():
+                return no
+
+            vai_esquerda = X[colunas, self.feature[no]] <= self.threshold[no]
+            proximo = np.where(vai_esquerda, esquerda, self.direita[no])
+            no = np.where(folha, no, proximo)
+
+    def _em_blocos(self, funcao, X):
+        """Aplica a função em blocos de linhas e concatena os resultados"""
+        # As árvores do sklearn comparam as features em float32
+        X = np.asarray(X, dtype=np.float32)
+        if X.shape[0] <= TAMANHO_BLOCO:
+            return funcao(X)
+        return np.concatenate([
+            funcao(X[inicio:inicio + TAMANHO_BLOCO])
+            for inicio in range(0, X.shape[0], TAMANHO_BLOCO)
+        ])
+
+    def _media_arvores(self, X):
+        """Soma as saídas das árvores na ordem do ensemble e divide pelo total"""
+        folhas = self._folhas(X)
+        soma = np.zeros((folhas.shape[1], self.valores.shape[1]))
+        for folhas_arvore in folhas:
+            soma += self.valores[folhas_arvore]
+        soma /= len(folhas)
+        return soma
+
+    def _raw_gradient_boosting(self, X):
+        """Predição inicial + learning_rate x folha, estágio a estágio (como o sklearn)"""
+        folhas = self._folhas(X)
+        k = self.meta['k']
+        learning_rate = self.meta['learning_rate']
+
+        raw = np.tile(np.array(self.meta['raw_inicial']), (folhas.shape[1], 1))
+        for t, folhas_arvore in enumerate(folhas):
+            raw[:, t % k] += learning_rate * self.valores[folhas_arvore, 0]
+        return raw
+
+    def predict_proba(self, X):
+        if self.tipo == 'rf_clf':
+            return self._em_blocos(self._media_arvores, X)
+
+        if self.tipo == 'gb_clf':
+            raw = self._em_blocos(self._raw_gradient_boosting, X)
+            if self.meta['k'] == 1:
+                proba = 1 / (1 + np.exp(-raw[:, 0]))
+                return np.column_stack([1 - proba, proba])
+            # Softmax como em sklearn.utils.extmath.softmax
+            raw -= raw.max(axis=1)[:, np.newaxis]
+            np.exp(raw, raw)
+            raw /= raw.sum(axis=1)[:, np.newaxis]
+            return raw
+
+        raise AttributeError("predict_proba só existe para classificadores")
+
+    def predict(self, X):
+        if self.tipo == 'rf_reg':
+            return self._em_blocos(self._media_arvores, X)[:, 0]
+
+        proba = self.predict_proba(X)
+        return self.classes_[proba.argmax(axis=1)]
+
+
+def verificar_equivalencia(modelo, X, motor=None):
+    """
+    Compara as saídas do motor compilado com as do sklearn
+
+    Returns:
+        float: Maior diferença absoluta entre as saídas (probabilidades para
+            classificadores, valores previstos para regressores)
+    """
+    motor = motor or ArvoresCompactas.de_modelo(modelo)
+    X = np.asarray(X)
+
+    if hasattr(modelo, 'predict_proba'):
+        esperado, obtido = modelo.predict_proba(X), motor.predict_proba(X)
+    else:
+        esperado, obtido = modelo.predict(X), motor.predict(X)
+
+    return float(np.max(np.abs(esperado - obtido))) if len(X) else 0.0
@@ -0,0 +1,115 @@
+"""
+Benchmark de Memória por Worker
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Simula N workers (como no Gunicorn sem --preload): cada processo cria o
+seu próprio MLPredictor, carrega todos os modelos e faz uma predição. Com
+todos os workers vivos ao mesmo tempo, mede RSS e PSS de cada um.
+
+O RSS conta páginas compartilhadas integralmente em cada processo; o PSS
+divide cada página compartilhada pelo número de processos que a usam, então
+a soma do PSS é a memória física realmente ocupada pelos workers.
+
+Uso:
+    python controller/benchmark_memoria_workers.py --workers 4
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+
+CONTROLLER_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, CONTROLLER_DIR)
+
+FORMULARIO_EXEMPLO = {
+    "objetivo_principal": "Realocar Carreira",
+    "profissao_atual": "QA Tester",
+    "anos_experiencia": 5,
+    "habilidades_atuais_hard": ["Selenium", "SQL"],
+    "tempo_disponivel_estudo": "20 horas/semana"
+}
+
+
+def _memoria_processo():
+    """RSS e PSS do processo atual, em KB (Linux)"""
+    memoria = {'rss_kb': None, 'pss_kb': None}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for linha in f:
+                campo, valor = linha.split(':', 1) if ':' in linha else (linha, '')
+                if campo == 'Rss':
+                    memoria['rss_kb'] = int(valor.split()[0])
+                elif campo == 'Pss':
+                    memoria['pss_kb'] = int(valor.split()[0])
+    except OSError:
+        pass
+    return memoria
+
+
+def _worker(motor, fila, liberar):
+    # Silencia os logs do preditor para não poluir a saída do benchmark
+    sys.stdout = open(os.devnull, 'w')
+
+    from ml_predictor import MLPredictor
+
+    predictor = MLPredictor(motor=motor, cache_tamanho=0)
+    predictor.carregar_todos()
+    predictor.prever(FORMULARIO_EXEMPLO)
+
+    fila.put(_memoria_processo())
+    # Mantém o processo vivo até todos medirem, para o PSS refletir o compartilhamento
+    liberar.wait()
+
+
+def medir(motor, n_workers):
+    """Sobe N workers com o motor indicado e coleta a memória de cada um"""
+    contexto = mp.get_context('spawn')
+    fila = contexto.Queue()
+    liberar = contexto.Event()
+
+    processos = [
+        contexto.Process(target=_worker, args=(motor, fila, liberar))
+        for _ in range(n_workers)
+    ]
+    for processo in processos:
+        processo.start()
+
+    medidas = [fila.get() for _ in processos]
+
+    liberar.set()
+    for processo in processos:
+        processo.join()
+
+    return medidas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=4, help='Número de workers simulados')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"🧪 MEMÓRIA POR WORKER - {args.workers} workers")
+    print("=" * 70)
+
+    resumo = {}
+    for motor in ('sklearn', 'mmap'):
+        medidas = medir(motor, args.workers)
+        rss = [m['rss_kb'] or 0 for m in medidas]
+        pss = [m['pss_kb'] or 0 for m in medidas]
+        resumo[motor] = sum(pss)
+
+        print(f"\n📊 Motor: {motor}")
+        for i, (r, p) in enumerate(zip(rss, pss), 1):
+            print(f"   Worker {i}: RSS {r / 1024:7.1f} MB | PSS {p / 1024:7.1f} MB")
+        print(f"   Média:    RSS {sum(rss) / len(rss) / 1024:7.1f} MB | PSS {sum(pss) / len(pss) / 1024:7.1f} MB")
+        print(f"   Total PSS (memória física dos workers): {sum(pss) / 1024:.1f} MB")
+
+    if resumo['sklearn']:
+        economia = 1 - resumo['mmap'] / resumo['sklearn']
+        print(f"\n✅ Economia de memória física com mmap: {economia * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Cache LRU em memória com TTL opcional
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """Cache LRU thread-safe com expiração opcional e contadores de acerto"""
+
+    def __init__(self, capacidade=1024, ttl=None):
+        """
+        Args:
+            capacidade (int): Número máximo de entradas (0 desativa o cache)
+            ttl (float): Segundos até uma entrada expirar (None = nunca)
+        """
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._dados = OrderedDict()  # chave -> (valor, instante de gravação)
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+
+    def obter(self, chave, padrao=None):
+        """Retorna o valor da chave (ou `padrao`), contando acerto/falta"""
+        with self._lock:
+            item = self._dados.get(chave)
+
+            if item is not None and self.ttl is not None:
+                if time.monotonic() - item[1] > self.ttl:
+                    del self._dados[chave]
+                    item = None
+
+            if item is None:
+                self.faltas += 1
+                return padrao
+
+            self._dados.move_to_end(chave)
+            self.acertos += 1
+            return item[0]
+
+    def gravar(self, chave, valor):
+        if self.capacidade <= 0:
+            return
+
+        with self._lock:
+            self._dados[chave] = (valor, time.monotonic())
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.capacidade:
+                self._dados.popitem(last=False)
+
+    def limpar(self):
+        """Remove todas as entradas (os contadores são mantidos)"""
+        with self._lock:
+            self._dados.clear()
+
+    def __len__(self):
+        return len(self._dados)
+
+    def estatisticas(self):
+        with self._lock:
+            total = self.acertos + self.faltas
+            return {
+                'tamanho': len(self._dados),
+                'capacidade': self.capacidade,
+                'ttl': self.ttl,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'taxa_acerto': self.acertos / total if total else 0.0
+            }
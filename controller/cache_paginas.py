@@ -0,0 +1,74 @@
+"""
+Cache em Disco das Páginas de Cursos
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Guarda, por URL, os validadores HTTP (ETag/Last-Modified) e os hashes do
+conteúdo de cada página já raspada, junto com o curso extraído. Com isso
+o scraper faz GETs condicionais e só reprocessa e reenvia os cursos que
+mudaram desde a última execução.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_PADRAO = os.getenv("SCRAPER_CACHE", os.path.join(BASE_DIR, "data", "cache_paginas.json"))
+
+
+def hash_conteudo(dados):
+    """SHA-256 de bytes ou de um dicionário (serializado de forma estável)"""
+    if isinstance(dados, dict):
+        dados = json.dumps(dados, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(dados).hexdigest()
+
+
+class CachePaginas:
+    """Cache de páginas por URL, persistido em um arquivo JSON"""
+
+    def __init__(self, caminho=CAMINHO_PADRAO):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._entradas = {}
+
+        if os.path.exists(caminho):
+            with open(caminho, "r", encoding="utf-8") as f:
+                self._entradas = json.load(f)
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def obter(self, url):
+        with self._lock:
+            return self._entradas.get(url)
+
+    def cabecalhos_condicionais(self, url):
+        """If-None-Match / If-Modified-Since a partir da última resposta da URL"""
+        entrada = self.obter(url)
+        cabecalhos = {}
+        if entrada:
+            if entrada.get("etag"):
+                cabecalhos["If-None-Match"] = entrada["etag"]
+            if entrada.get("last_modified"):
+                cabecalhos["If-Modified-Since"] = entrada["last_modified"]
+        return cabecalhos
+
+    def gravar(self, url, **campos):
+        """Atualiza (ou cria) a entrada da URL com os campos informados"""
+        with self._lock:
+            self._entradas.setdefault(url, {}).update(campos)
+
+    def cursos(self):
+        """Todos os cursos guardados no cache"""
+        with self._lock:
+            return [e["curso"] for e in self._entradas.values() if e.get("curso")]
+
+    def salvar(self):
+        """Persiste o cache de forma atômica (arquivo temporário + rename)"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+            temporario = self.caminho + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(self._entradas, f, ensure_ascii=False)
+            os.replace(temporario, self.caminho)
@@ -0,0 +1,38 @@
+"""
+Seleção do Backend do Catálogo
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+CATALOGO_BACKEND escolhe onde o catálogo de cursos é lido e gravado:
+    firestore (padrão) - Firebase Firestore (database.py)
+    sqlite             - arquivo SQLite local com FTS5 (catalogo_sqlite.py)
+
+Quem usa o catálogo importa apenas `catalogo_db`:
+
+    from catalogo import catalogo_db
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BACKENDS = ('firestore', 'sqlite')
+
+
+def criar_catalogo(backend=None):
+    """Instancia o backend configurado (os imports são sob demanda)"""
+    backend = (backend or os.getenv("CATALOGO_BACKEND", "firestore")).lower()
+
+    if backend == 'firestore':
+        from database import firebase_db
+        return firebase_db
+
+    if backend == 'sqlite':
+        from catalogo_sqlite import CatalogoSQLite
+        return CatalogoSQLite()
+
+    raise ValueError(f"CATALOGO_BACKEND inválido: {backend} (use um de {BACKENDS})")
+
+
+# Instância global
+catalogo_db = criar_catalogo()
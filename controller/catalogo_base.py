@@ -0,0 +1,84 @@
+"""
+Interface do Catálogo de Cursos
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Operações que todo backend de armazenamento do catálogo implementa
+(Firestore em database.py, SQLite em catalogo_sqlite.py). O backend em
+uso é escolhido em catalogo.py.
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+
+
+def id_curso(curso):
+    """ID estável do documento de um curso (hash da URL)"""
+    return hashlib.sha1(curso['url'].encode('utf-8')).hexdigest()
+
+
+class CatalogoCursos(ABC):
+    """Contrato comum dos backends do catálogo"""
+
+    @abstractmethod
+    def buscar_cursos(self, limite=None):
+        """Lista os cursos (no máximo `limite`)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def buscar_cursos_pagina(self, tamanho=20, cursor=None):
+        """
+        Uma página do catálogo, ordenada por URL (paginação por cursor)
+
+        Returns:
+            dict: cursos e proximo_cursor (None na última página)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def buscar_cursos_filtrados(self, area_interesse=None, habilidades=None, limite=None):
+        """
+        Cursos que citam a área ou alguma das habilidades
+
+        Com `limite`, devolve os mais relevantes em ordem de relevância;
+        sem nenhum resultado, devolve os primeiros cursos do catálogo.
+        """
+        raise NotImplementedError
+
+    def buscar_cursos_recomendados(self, area_interesse=None, habilidades=None, limite=10):
+        """
+        Os `limite` cursos recomendados para a área e as habilidades
+
+        Backends com visões materializadas respondem com uma leitura por
+        chave; os demais usam a busca filtrada.
+        """
+        return self.buscar_cursos_filtrados(area_interesse, habilidades, limite)
+
+    @abstractmethod
+    def contar_cursos(self):
+        """Total de cursos no catálogo"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def sincronizar_cursos(self, cursos, remover_ausentes=True):
+        """
+        Deixa o catálogo igual à lista, escrevendo só a diferença
+
+        Returns:
+            dict: Contagens (adicionados, atualizados, removidos, inalterados,
+                batches, tempo_ms) ou None em caso de erro
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def salvar_cursos(self, cursos):
+        """Grava (upsert) cursos sem apagar os demais; retorna sucesso"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def remover_ausentes(self, urls):
+        """Apaga os cursos fora da lista de URLs; retorna quantos (None em erro)"""
+        raise NotImplementedError
+
+    def inserir_cursos(self, cursos):
+        """Inserir cursos (sincroniza o catálogo com a lista informada)"""
+        return self.sincronizar_cursos(cursos) is not None
@@ -0,0 +1,356 @@
+"""
+Catálogo de Cursos em SQLite (FTS5)
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Backend local do catálogo: os cursos ficam em uma tabela SQLite e a busca
+textual sobre título, aprendizado e público-alvo usa dois índices FTS5:
+
+    cursos_fts     - tokenizer unicode61 sem acentos, para o ranking bm25
+                     (pesos de campo e da área iguais aos do índice em memória)
+    cursos_trechos - tokenizer trigram, para o filtro por substring do
+                     índice em memória ("Java" também encontra "JavaScript")
+
+O tokenizer trigram exige SQLite 3.34 ou mais novo. Não depende de nenhum
+serviço externo.
+
+Ative com CATALOGO_BACKEND=sqlite (arquivo em CATALOGO_SQLITE).
+"""
+
+import contextlib
+import heapq
+import os
+import sqlite3
+import threading
+import time
+
+from catalogo_base import CatalogoCursos, id_curso
+from indice_cursos import CAMPOS_BUSCA, PESO_AREA, PESOS_CAMPOS, TAMANHO_NGRAMA, texto_trechos, tokenizar
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_PADRAO = os.getenv("CATALOGO_SQLITE", os.path.join(BASE_DIR, "data", "catalogo.db"))
+
+CAMPOS = ('titulo', 'url', 'aprendizado', 'publico_alvo')
+
+# Texto do filtro por substring (o mesmo de texto_trechos, sem o lower:
+# o tokenizer trigram já ignora maiúsculas)
+_TEXTO_TRECHOS = ' || '.join('{0}.' + c for c in CAMPOS_BUSCA)
+
+ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS cursos (
+    id TEXT PRIMARY KEY,
+    titulo TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL,
+    aprendizado TEXT NOT NULL DEFAULT '',
+    publico_alvo TEXT NOT NULL DEFAULT ''
+);
+
+CREATE INDEX IF NOT EXISTS cursos_url ON cursos(url);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS cursos_fts USING fts5(
+    {', '.join(CAMPOS_BUSCA)},
+    content='cursos', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS cursos_trechos USING fts5(
+    texto, content='', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS cursos_ai AFTER INSERT ON cursos BEGIN
+    INSERT INTO cursos_fts(rowid, {', '.join(CAMPOS_BUSCA)})
+    VALUES (new.rowid, {', '.join('new.' + c for c in CAMPOS_BUSCA)});
+    INSERT INTO cursos_trechos(rowid, texto) VALUES (new.rowid, {_TEXTO_TRECHOS.format('new')});
+END;
+
+CREATE TRIGGER IF NOT EXISTS cursos_ad AFTER DELETE ON cursos BEGIN
+    INSERT INTO cursos_fts(cursos_fts, rowid, {', '.join(CAMPOS_BUSCA)})
+    VALUES ('delete', old.rowid, {', '.join('old.' + c for c in CAMPOS_BUSCA)});
+    INSERT INTO cursos_trechos(cursos_trechos, rowid, texto)
+    VALUES ('delete', old.rowid, {_TEXTO_TRECHOS.format('old')});
+END;
+
+CREATE TRIGGER IF NOT EXISTS cursos_au AFTER UPDATE ON cursos BEGIN
+    INSERT INTO cursos_fts(cursos_fts, rowid, {', '.join(CAMPOS_BUSCA)})
+    VALUES ('delete', old.rowid, {', '.join('old.' + c for c in CAMPOS_BUSCA)});
+    INSERT INTO cursos_fts(rowid, {', '.join(CAMPOS_BUSCA)})
+    VALUES (new.rowid, {', '.join('new.' + c for c in CAMPOS_BUSCA)});
+    INSERT INTO cursos_trechos(cursos_trechos, rowid, texto)
+    VALUES ('delete', old.rowid, {_TEXTO_TRECHOS.format('old')});
+    INSERT INTO cursos_trechos(rowid, texto) VALUES (new.rowid, {_TEXTO_TRECHOS.format('new')});
+END;
+"""
+
+# Bancos criados antes de cursos_trechos: os triggers antigos são trocados
+# e o índice de trechos é preenchido com os cursos existentes
+MIGRAR_TRECHOS = f"""
+DROP TRIGGER IF EXISTS cursos_ai;
+DROP TRIGGER IF EXISTS cursos_ad;
+DROP TRIGGER IF EXISTS cursos_au;
+{ESQUEMA}
+INSERT INTO cursos_trechos(rowid, texto) SELECT rowid, {_TEXTO_TRECHOS.format('cursos')} FROM cursos;
+"""
+
+UPSERT = f"""
+INSERT INTO cursos (id, {', '.join(CAMPOS)}) VALUES (?, {', '.join('?' for _ in CAMPOS)})
+ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in CAMPOS)}
+"""
+
+
+def _linha(curso):
+    return (id_curso(curso),) + tuple(curso.get(c) or '' for c in CAMPOS)
+
+
+def _frase(texto):
+    """Frase FTS5 com os tokens do texto (None se não sobrar nenhum)"""
+    tokens = tokenizar(texto)
+    return '"' + ' '.join(tokens) + '"' if tokens else None
+
+
+def _trecho(texto):
+    """Frase FTS5 literal, para o índice de trigramas"""
+    return '"' + texto.replace('"', '""') + '"'
+
+
+class CatalogoSQLite(CatalogoCursos):
+    """Catálogo de cursos em um arquivo SQLite com busca FTS5"""
+
+    def __init__(self, caminho=CAMINHO_PADRAO):
+        self.caminho = caminho
+        # sqlite3 não compartilha conexões entre threads: uma por thread
+        self._local = threading.local()
+        self._escrita_lock = threading.Lock()
+        self._conexao_memoria = None
+        self._leitura_lock = contextlib.nullcontext()
+
+        if caminho == ':memory:':
+            # Cada conexão a ':memory:' abre um banco novo e vazio: uma
+            # conexão só, compartilhada pelas threads e usada sempre sob o
+            # lock (leituras inclusive)
+            self._conexao_memoria = sqlite3.connect(caminho, check_same_thread=False)
+            self._conexao_memoria.row_factory = sqlite3.Row
+            self._leitura_lock = self._escrita_lock
+        else:
+            os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+
+        with self._escrita_lock:
+            conn = self._conexao()
+            existente = conn.execute(
+                "SELECT name FROM sqlite_master WHERE name IN ('cursos', 'cursos_trechos')"
+            ).fetchall()
+            # Só 'cursos': banco de antes do índice de trechos
+            conn.executescript(MIGRAR_TRECHOS if len(existente) == 1 else ESQUEMA)
+            conn.commit()
+
+    def _conexao(self):
+        if self._conexao_memoria is not None:
+            return self._conexao_memoria
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.caminho)
+            conn.row_factory = sqlite3.Row
+            # Leitores não bloqueiam durante uma sincronização
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def _consultar(self, sql, parametros=()):
+        with self._leitura_lock:
+            return [
+                {c: linha[c] for c in CAMPOS}
+                for linha in self._conexao().execute(sql, parametros)
+            ]
+
+    def buscar_cursos(self, limite=None):
+        """Buscar todos os cursos (na ordem de inserção)"""
+        try:
+            return self._consultar(
+                f"SELECT {', '.join(CAMPOS)} FROM cursos ORDER BY rowid LIMIT ?",
+                (limite or -1,)
+            )
+        except sqlite3.Error as e:
+            print(f"❌ Erro ao buscar: {e}")
+            return []
+
+    def buscar_cursos_pagina(self, tamanho=20, cursor=None):
+        """Uma página do catálogo, ordenada por URL (paginação por cursor)"""
+        try:
+            cursos = self._consultar(
+                f"SELECT {', '.join(CAMPOS)} FROM cursos WHERE url > ? ORDER BY url LIMIT ?",
+                (cursor or '', tamanho)
+            )
+            proximo = cursos[-1]['url'] if len(cursos) == tamanho else None
+            return {'cursos': cursos, 'proximo_cursor': proximo}
+        except sqlite3.Error as e:
+            print(f"❌ Erro ao paginar: {e}")
+            return {'cursos': [], 'proximo_cursor': None}
+
+    def buscar_cursos_filtrados(self, area_interesse=None, habilidades=None, limite=None):
+        """
+        Buscar cursos filtrados (via FTS5)
+
+        Sem limite, a semântica é a do filtro do índice em memória: cursos
+        que contêm a área ou alguma habilidade como substring, na ordem de
+        inserção. Com limite, o ranking bm25 pondera a área com PESO_AREA,
+        como IndiceCursos.ranquear.
+
+        Args:
+            area_interesse (str): Área usada no filtro
+            habilidades (list): Habilidades usadas no filtro
+            limite (int): Se informado, retorna apenas os `limite` cursos
+                mais relevantes (bm25), em ordem de relevância
+        """
+        try:
+            if limite:
+                consultas = [(area_interesse, PESO_AREA)] if area_interesse else []
+                consultas += [(habilidade, 1.0) for habilidade in habilidades or []]
+                cursos_relevantes = self._ranquear(consultas, limite)
+            else:
+                trechos = [area_interesse] if area_interesse else []
+                trechos += list(habilidades or [])
+                cursos_relevantes = self._filtrar(trechos)
+
+            if cursos_relevantes:
+                return cursos_relevantes
+            return self.buscar_cursos(min(limite, 50) if limite else 50)
+
+        except sqlite3.Error as e:
+            print(f"❌ Erro ao filtrar: {e}")
+            return []
+
+    def _filtrar(self, trechos):
+        """
+        Cursos que contêm algum dos trechos (sem diferenciar maiúsculas)
+
+        O índice de trigramas aponta os candidatos e o trecho é conferido
+        em texto_trechos, como em IndiceCursos.buscar_trecho. Trechos
+        menores que um trigrama são procurados em todos os cursos.
+        """
+        trechos = sorted({texto.lower() for texto in trechos if texto})
+        if not trechos:
+            return []
+
+        if any(len(trecho) < TAMANHO_NGRAMA for trecho in trechos):
+            candidatos = self.buscar_cursos()
+        else:
+            colunas = ', '.join(f'c.{c}' for c in CAMPOS)
+            candidatos = self._consultar(
+                f"SELECT {colunas} FROM cursos_trechos JOIN cursos c ON c.rowid = cursos_trechos.rowid "
+                f"WHERE cursos_trechos MATCH ? ORDER BY c.rowid",
+                (' OR '.join(_trecho(trecho) for trecho in trechos),)
+            )
+
+        return [
+            curso for curso in candidatos
+            if any(trecho in texto_trechos(curso) for trecho in trechos)
+        ]
+
+    def _ranquear(self, consultas, limite):
+        """
+        Os `limite` cursos mais relevantes para as consultas (texto, peso)
+
+        Cada frase é pontuada com o bm25 do FTS5 (pesos de campo de
+        PESOS_CAMPOS) e as pontuações são somadas com o peso da consulta.
+        Empates mantêm a ordem de inserção.
+        """
+        pesos = ', '.join(str(p) for p in PESOS_CAMPOS)
+        scores = {}
+
+        with self._leitura_lock:
+            conn = self._conexao()
+            for texto, peso in consultas:
+                frase = _frase(texto)
+                if not frase:
+                    continue
+                for rowid, score in conn.execute(
+                    f"SELECT rowid, bm25(cursos_fts, {pesos}) FROM cursos_fts WHERE cursos_fts MATCH ?",
+                    (frase,)
+                ):
+                    # bm25() do FTS5 é negativo: quanto menor, mais relevante
+                    scores[rowid] = scores.get(rowid, 0.0) - peso * score
+
+            melhores = heapq.nlargest(limite, scores.items(), key=lambda item: (item[1], -item[0]))
+            ids = [rowid for rowid, _ in melhores]
+            linhas = {
+                linha['rowid']: {c: linha[c] for c in CAMPOS}
+                for linha in conn.execute(
+                    f"SELECT rowid, {', '.join(CAMPOS)} FROM cursos "
+                    f"WHERE rowid IN ({', '.join('?' for _ in ids)})",
+                    ids
+                )
+            }
+        return [linhas[rowid] for rowid in ids]
+
+    def contar_cursos(self):
+        """Contar total de cursos"""
+        try:
+            with self._leitura_lock:
+                return self._conexao().execute("SELECT COUNT(*) FROM cursos").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"❌ Erro ao contar: {e}")
+            return 0
+
+    def sincronizar_cursos(self, cursos, remover_ausentes=True):
+        """Sincroniza a tabela com a lista de cursos escrevendo só a diferença"""
+        inicio = time.perf_counter()
+        conn = self._conexao()
+
+        try:
+            with self._escrita_lock, conn:
+                atuais = {
+                    linha['id']: tuple(linha[c] for c in CAMPOS)
+                    for linha in conn.execute(f"SELECT id, {', '.join(CAMPOS)} FROM cursos")
+                }
+                desejados = {linha[0]: linha for linha in map(_linha, cursos)}
+
+                adicionar = [l for i, l in desejados.items() if i not in atuais]
+                atualizar = [l for i, l in desejados.items() if i in atuais and atuais[i] != l[1:]]
+                remover = [(i,) for i in atuais if i not in desejados] if remover_ausentes else []
+
+                conn.executemany(UPSERT, adicionar + atualizar)
+                conn.executemany("DELETE FROM cursos WHERE id = ?", remover)
+
+            resumo = {
+                'adicionados': len(adicionar),
+                'atualizados': len(atualizar),
+                'removidos': len(remover),
+                'inalterados': len(desejados) - len(adicionar) - len(atualizar),
+                'batches': 1,
+                'tempo_ms': (time.perf_counter() - inicio) * 1000
+            }
+            print(f"✅ Sincronização concluída: {resumo['adicionados']} adicionados, "
+                  f"{resumo['atualizados']} atualizados, {resumo['removidos']} removidos, "
+                  f"{resumo['inalterados']} inalterados")
+            return resumo
+
+        except sqlite3.Error as e:
+            print(f"❌ Erro ao sincronizar: {e}")
+            return None
+
+    def salvar_cursos(self, cursos):
+        """Grava (upsert) cursos sem apagar os demais"""
+        try:
+            with self._escrita_lock, self._conexao() as conn:
+                conn.executemany(UPSERT, [_linha(curso) for curso in cursos])
+            print(f"✅ {len(cursos)} cursos atualizados em '{self.caminho}'!")
+            return True
+        except sqlite3.Error as e:
+            print(f"❌ Erro ao salvar: {e}")
+            return False
+
+    def remover_ausentes(self, urls):
+        """Apaga os cursos cujas URLs não estão na lista"""
+        manter = {id_curso({'url': url}) for url in urls}
+        try:
+            with self._escrita_lock, self._conexao() as conn:
+                remover = [
+                    (linha['id'],) for linha in conn.execute("SELECT id FROM cursos")
+                    if linha['id'] not in manter
+                ]
+                conn.executemany("DELETE FROM cursos WHERE id = ?", remover)
+            if remover:
+                print(f"🗑️  {len(remover)} cursos fora da listagem removidos de '{self.caminho}'")
+            return len(remover)
+        except sqlite3.Error as e:
+            print(f"❌ Erro ao remover: {e}")
+            return None
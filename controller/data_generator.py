@@ -10,15 +10,30 @@ import pandas as pd
 import numpy as np
 import json
 from datetime import datetime
+import multiprocessing as mp
 import os
+from concurrent.futures import ProcessPoolExecutor
+from pandas.api.types import union_categoricals
 
-# Configurar seed para reprodutibilidade
-np.random.seed(42)
+# Semente padrão: datasets reprodutíveis sem estado global do numpy
+SEMENTE = 42
+
+# Geração de datasets maiores que a memória: shards Parquet/Feather + manifesto
+TAMANHO_SHARD = 1_000_000
+ARQUIVO_MANIFESTO = 'manifesto.json'
+FORMATOS_SHARD = ('parquet', 'feather')
 
 class DataGenerator:
     """Classe para gerar dados sintéticos de profissionais e suas carreiras"""
     
-    def __init__(self):
+    def __init__(self, semente=SEMENTE):
+        """
+        Args:
+            semente (int): Semente do gerador aleatório usado quando
+                gerar_dataset não recebe um `rng`
+        """
+        self.rng = np.random.default_rng(semente)
+        
         self.areas_carreira = [
             'Desenvolvimento Web',
             'Data Science',
@@ -48,44 +63,179 @@ class DataGenerator:
             'Cloud Computing': ['AWS', 'Azure', 'GCP', 'Serverless', 'Containers'],
             'Inteligência Artificial': ['Python', 'TensorFlow', 'PyTorch', 'NLP', 'Computer Vision']
         }
+        
+        # Áreas afins a cada profissão atual
+        self.afinidade_areas = {
+            'Desenvolvedor': ['Desenvolvimento Web', 'Mobile', 'DevOps'],
+            'Analista de Sistemas': ['Desenvolvimento Web', 'Data Science', 'Cloud Computing'],
+            'QA Tester': ['DevOps', 'Desenvolvimento Web', 'Segurança da Informação'],
+            'Suporte Técnico': ['DevOps', 'Cloud Computing', 'Segurança da Informação'],
+            'Designer': ['UX/UI Design', 'Desenvolvimento Web', 'Mobile'],
+            'Gerente de Projetos': ['DevOps', 'Cloud Computing', 'Data Science'],
+            'Analista de Dados': ['Data Science', 'Inteligência Artificial', 'Cloud Computing'],
+            'DBA': ['Data Science', 'Cloud Computing', 'DevOps'],
+            'Administrador de Redes': ['DevOps', 'Cloud Computing', 'Segurança da Informação']
+        }
     
-    def gerar_dataset(self, n_amostras=1000):
+    def gerar_dataset(self, n_amostras=1000, rng=None):
         """
         Gera um dataset sintético de profissionais
         
+        Sorteia colunas inteiras de uma vez (nível, área, habilidades e
+        score por operações de array), com as mesmas distribuições da
+        geração linha a linha. As colunas de texto saem como categóricas.
+        
+        Args:
+            n_amostras (int): Número de amostras a gerar
+            rng (np.random.Generator): Gerador aleatório (padrão: o da instância)
+            
+        Returns:
+            pd.DataFrame: Dataset gerado
+        """
+        rng = self.rng if rng is None else rng
+        n = n_amostras
+        
+        # Características do profissional
+        anos_exp = rng.integers(0, 21, size=n)
+        nivel = np.digitize(anos_exp, [3, 7])  # 0 Júnior, 1 Pleno, 2 Sênior
+        profissao = rng.integers(len(self.profissoes_atuais), size=n)
+        
+        # Objetivo (60% quer realocar, 40% quer atualizar)
+        atualizar = rng.random(n) >= 0.6
+        
+        # Área de interesse: qualquer uma ao realocar, uma afim ao atualizar
+        area = self._sortear_areas(profissao, atualizar, rng)
+        
+        # Tempo disponível para estudo (horas/semana)
+        tempo_estudo = rng.choice([5, 10, 15, 20, 25, 30], size=n, p=[0.1, 0.2, 0.3, 0.25, 0.1, 0.05])
+        
+        # Habilidades atuais (baseadas na área de interesse)
+        tamanho_listas = np.array([len(self.habilidades_tecnicas[a]) for a in self.areas_carreira])
+        num_habilidades = np.minimum(rng.integers(2, 6, size=n), tamanho_listas[area])
+        habilidades = self._sortear_habilidades(area, num_habilidades, rng)
+        
+        # Motivação (0-10)
+        motivacao = rng.integers(5, 11, size=n)
+        
+        # Score de adequação com ruído realista
+        score_adequacao = (
+            50
+            + np.array([5, 15, 20])[nivel]
+            + (tempo_estudo / 30) * 25
+            + (num_habilidades / 7) * 20
+            + (motivacao / 10) * 20
+            + np.where(atualizar, 15, 5)
+        )
+        score_adequacao = score_adequacao + rng.normal(0, 5, size=n)
+        score_adequacao = np.clip(score_adequacao, 0, 100).round(2)
+        
+        objetivos = ['Realocar Carreira', 'Atualizar Carreira']
+        
+        return pd.DataFrame({
+            'profissao_atual': pd.Categorical.from_codes(profissao, self.profissoes_atuais),
+            'anos_experiencia': anos_exp,
+            'nivel_atual': pd.Categorical.from_codes(nivel, self.niveis),
+            'objetivo_principal': pd.Categorical.from_codes(atualizar.astype(np.int8), objetivos),
+            'area_interesse': pd.Categorical.from_codes(area, self.areas_carreira),
+            'tempo_disponivel_estudo': tempo_estudo,
+            'num_habilidades': num_habilidades,
+            'habilidades_atuais': habilidades,
+            'motivacao': motivacao,
+            'score_adequacao': score_adequacao
+        })
+    
+    def _sortear_areas(self, profissao, atualizar, rng):
+        """Índice da área de interesse de cada linha (vetorizado)"""
+        n = len(profissao)
+        afins = [
+            [self.areas_carreira.index(a) for a in self.afinidade_areas[p]]
+            for p in self.profissoes_atuais
+        ]
+        # Listas de afinidade completadas até o mesmo tamanho: sorteia uma
+        # posição válida de cada linha
+        largura = max(len(lista) for lista in afins)
+        tabela = np.array([lista + [0] * (largura - len(lista)) for lista in afins])
+        tamanhos = np.array([len(lista) for lista in afins])
+        
+        posicao = (rng.random(n) * tamanhos[profissao]).astype(np.int64)
+        qualquer = rng.integers(len(self.areas_carreira), size=n)
+        return np.where(atualizar, tabela[profissao, posicao], qualquer)
+    
+    def _sortear_habilidades(self, area, num_habilidades, rng):
+        """
+        Habilidades de cada linha, sem repetição, como categórica
+        
+        Por área, ordena chaves aleatórias (uma permutação por linha) e fica
+        com as primeiras `num_habilidades`. Cada sequência sorteada vira um
+        código inteiro; o texto ("HTML,CSS") é montado uma vez por código
+        distinto, não por linha.
+        """
+        codigos = np.empty(len(area), dtype=np.int64)
+        textos = []
+        
+        for i, nome_area in enumerate(self.areas_carreira):
+            linhas = np.flatnonzero(area == i)
+            if len(linhas) == 0:
+                continue
+            lista = self.habilidades_tecnicas[nome_area]
+            base = len(lista)
+            
+            permutacoes = np.argsort(rng.random((len(linhas), base)), axis=1)
+            k = num_habilidades[linhas]
+            usadas = np.arange(base) < k[:, None]
+            codigo = k * base ** base + (np.where(usadas, permutacoes, 0) * base ** np.arange(base)).sum(axis=1)
+            
+            unicos, posicao, inverso = np.unique(codigo, return_index=True, return_inverse=True)
+            codigos[linhas] = len(textos) + inverso
+            textos += [
+                ','.join(lista[j] for j in permutacoes[p, :k[p]])
+                for p in posicao
+            ]
+        
+        # Sequências iguais em áreas diferentes viram uma categoria só
+        categorias, remapear = np.unique(np.array(textos, dtype=object), return_inverse=True)
+        return pd.Categorical.from_codes(remapear[codigos], categorias)
+    
+    def gerar_dataset_iterativo(self, n_amostras=1000, rng=None):
+        """
+        Gera o dataset linha a linha (implementação original, mantida como
+        referência para o benchmark de gerar_dataset)
+        
         Args:
             n_amostras (int): Número de amostras a gerar
+            rng (np.random.Generator): Gerador aleatório (padrão: o da instância)
             
         Returns:
             pd.DataFrame: Dataset gerado
         """
+        rng = self.rng if rng is None else rng
         dados = []
         
         for i in range(n_amostras):
             # Características do profissional
-            anos_exp = np.random.randint(0, 21)
+            anos_exp = rng.integers(0, 21)
             nivel = self._definir_nivel(anos_exp)
-            profissao_atual = np.random.choice(self.profissoes_atuais)
+            profissao_atual = rng.choice(self.profissoes_atuais)
             
             # Objetivo (60% quer realocar, 40% quer atualizar)
-            objetivo = np.random.choice(['Realocar Carreira', 'Atualizar Carreira'], p=[0.6, 0.4])
+            objetivo = rng.choice(['Realocar Carreira', 'Atualizar Carreira'], p=[0.6, 0.4])
             
             # Área de interesse (depende do objetivo e background)
-            area_interesse = self._definir_area_interesse(profissao_atual, objetivo)
+            area_interesse = self._definir_area_interesse(profissao_atual, objetivo, rng)
             
             # Tempo disponível para estudo (horas/semana)
-            tempo_estudo = np.random.choice([5, 10, 15, 20, 25, 30], p=[0.1, 0.2, 0.3, 0.25, 0.1, 0.05])
+            tempo_estudo = rng.choice([5, 10, 15, 20, 25, 30], p=[0.1, 0.2, 0.3, 0.25, 0.1, 0.05])
             
             # Habilidades atuais (baseadas na área de interesse)
-            num_habilidades = np.random.randint(2, 6)
-            habilidades = np.random.choice(
+            num_habilidades = rng.integers(2, 6)
+            habilidades = rng.choice(
                 self.habilidades_tecnicas.get(area_interesse, ['Python', 'SQL']),
                 size=min(num_habilidades, len(self.habilidades_tecnicas.get(area_interesse, []))),
                 replace=False
             ).tolist()
             
             # Motivação (0-10)
-            motivacao = np.random.randint(5, 11)
+            motivacao = rng.integers(5, 11)
             
             # Score de adequação (variável alvo para regressão)
             # Calculado com base em múltiplos fatores
@@ -94,7 +244,7 @@ class DataGenerator:
             )
             
             # Adicionar ruído realista
-            score_adequacao += np.random.normal(0, 5)
+            score_adequacao += rng.normal(0, 5)
             score_adequacao = np.clip(score_adequacao, 0, 100)
             
             dados.append({
@@ -122,28 +272,16 @@ class DataGenerator:
         else:
             return 'Sênior'
     
-    def _definir_area_interesse(self, profissao_atual, objetivo):
+    def _definir_area_interesse(self, profissao_atual, objetivo, rng):
         """Define a área de interesse baseada na profissão atual e objetivo"""
-        mapeamento_afinidade = {
-            'Desenvolvedor': ['Desenvolvimento Web', 'Mobile', 'DevOps'],
-            'Analista de Sistemas': ['Desenvolvimento Web', 'Data Science', 'Cloud Computing'],
-            'QA Tester': ['DevOps', 'Desenvolvimento Web', 'Segurança da Informação'],
-            'Suporte Técnico': ['DevOps', 'Cloud Computing', 'Segurança da Informação'],
-            'Designer': ['UX/UI Design', 'Desenvolvimento Web', 'Mobile'],
-            'Gerente de Projetos': ['DevOps', 'Cloud Computing', 'Data Science'],
-            'Analista de Dados': ['Data Science', 'Inteligência Artificial', 'Cloud Computing'],
-            'DBA': ['Data Science', 'Cloud Computing', 'DevOps'],
-            'Administrador de Redes': ['DevOps', 'Cloud Computing', 'Segurança da Informação']
-        }
-        
-        areas_afins = mapeamento_afinidade.get(profissao_atual, self.areas_carreira)
+        areas_afins = self.afinidade_areas.get(profissao_atual, self.areas_carreira)
         
         if objetivo == 'Realocar Carreira':
             # Maior chance de escolher áreas diferentes
-            return np.random.choice(self.areas_carreira)
+            return rng.choice(self.areas_carreira)
         else:
             # Maior chance de escolher áreas afins
-            return np.random.choice(areas_afins)
+            return rng.choice(areas_afins)
     
     def _calcular_score_adequacao(self, anos_exp, nivel, tempo_estudo, num_habilidades, motivacao, objetivo):
         """
@@ -190,6 +328,170 @@ class DataGenerator:
         print(f"✅ Dataset salvo em: {caminho}")
         print(f"📊 Total de amostras: {len(df)}")
         return caminho
+    
+    def gerar_shards(self, n_amostras, diretorio, tamanho_shard=TAMANHO_SHARD,
+                     workers=None, semente=SEMENTE, formato='parquet'):
+        """
+        Gera o dataset em shards, em paralelo, sem montá-lo em memória
+        
+        Cada shard é gerado por um processo com o seu próprio gerador
+        aleatório, derivado de SeedSequence(semente).spawn(): as sequências
+        são independentes e cada shard sai igual qualquer que seja o número
+        de workers. Os arquivos (colunas de texto categóricas) e o
+        manifesto ficam em `diretorio`.
+        
+        Args:
+            n_amostras (int): Total de amostras
+            diretorio (str): Pasta de saída
+            tamanho_shard (int): Amostras por shard
+            workers (int): Processos (padrão: todos os núcleos)
+            semente (int): Semente raiz
+            formato (str): 'parquet' ou 'feather'
+            
+        Returns:
+            str: Caminho do manifesto
+        """
+        if formato not in FORMATOS_SHARD:
+            raise ValueError(f"Formato inválido: {formato} (use {' ou '.join(FORMATOS_SHARD)})")
+        
+        os.makedirs(diretorio, exist_ok=True)
+        tamanhos = [min(tamanho_shard, n_amostras - inicio) for inicio in range(0, n_amostras, tamanho_shard)]
+        sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+        tarefas = [
+            (os.path.join(diretorio, f'shard_{i:05d}.{formato}'), linhas, semente_shard, formato)
+            for i, (linhas, semente_shard) in enumerate(zip(tamanhos, sementes))
+        ]
+        
+        print(f"🔄 Gerando {n_amostras:,} amostras em {len(tarefas)} shards de até {tamanho_shard:,}...")
+        inicio = datetime.now()
+        
+        # fork onde existir: o script de treinamento não tem guarda de __main__
+        contexto = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=contexto) as executor:
+            shards = list(executor.map(_gerar_shard, *zip(*tarefas)))
+        
+        manifesto = {
+            'n_amostras': n_amostras,
+            'tamanho_shard': tamanho_shard,
+            'semente': semente,
+            'formato': formato,
+            'gerado_em': datetime.now().isoformat(timespec='seconds'),
+            'shards': shards
+        }
+        caminho = os.path.join(diretorio, ARQUIVO_MANIFESTO)
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(manifesto, f, indent=2, ensure_ascii=False)
+        os.replace(temporario, caminho)
+        
+        # Shards de uma geração anterior maior que não entram no manifesto
+        atuais = {shard['arquivo'] for shard in shards}
+        for arquivo in os.listdir(diretorio):
+            if arquivo.startswith('shard_') and arquivo not in atuais:
+                os.remove(os.path.join(diretorio, arquivo))
+        
+        segundos = (datetime.now() - inicio).total_seconds()
+        tamanho_mb = sum(shard['bytes'] for shard in shards) / 1024 ** 2
+        print(f"✅ {len(shards)} shards salvos em: {diretorio} ({tamanho_mb:,.0f} MB, {segundos:.1f}s)")
+        return caminho
+
+
+def _gerar_shard(caminho, linhas, semente, formato):
+    """Gera e grava um shard (executado nos processos do pool)"""
+    df = DataGenerator().gerar_dataset(linhas, rng=np.random.default_rng(semente))
+    if formato == 'parquet':
+        df.to_parquet(caminho, index=False)
+    else:
+        df.to_feather(caminho)
+    return {'arquivo': os.path.basename(caminho), 'linhas': linhas, 'bytes': os.path.getsize(caminho)}
+
+
+def ler_manifesto(caminho):
+    """Manifesto de um dataset em shards (aceita o arquivo ou a pasta)"""
+    if os.path.isdir(caminho):
+        caminho = os.path.join(caminho, ARQUIVO_MANIFESTO)
+    with open(caminho, 'r', encoding='utf-8') as f:
+        manifesto = json.load(f)
+    manifesto['diretorio'] = os.path.dirname(os.path.abspath(caminho))
+    return manifesto
+
+
+def iterar_shards(caminho, colunas=None, max_linhas=None, semente=SEMENTE):
+    """
+    Lê os shards do manifesto um a um (só o shard da vez fica em memória)
+    
+    Args:
+        caminho (str): Manifesto ou pasta do dataset
+        colunas (list): Colunas a ler (padrão: todas)
+        max_linhas (int): Se o dataset for maior, cada shard é reduzido a
+            uma amostra aleatória proporcional ao seu tamanho, somando
+            `max_linhas` linhas no total (None = todas as linhas)
+        semente (int): Semente da amostragem
+    """
+    manifesto = ler_manifesto(caminho)
+    cotas = _cotas_amostra([shard['linhas'] for shard in manifesto['shards']], max_linhas)
+    rng = np.random.default_rng(semente)
+    
+    for shard, cota in zip(manifesto['shards'], cotas):
+        arquivo = os.path.join(manifesto['diretorio'], shard['arquivo'])
+        if manifesto['formato'] == 'parquet':
+            parte = pd.read_parquet(arquivo, columns=colunas)
+        else:
+            parte = pd.read_feather(arquivo, columns=colunas)
+        if cota < len(parte):
+            linhas = np.sort(rng.choice(len(parte), size=cota, replace=False))
+            parte = parte.iloc[linhas].reset_index(drop=True)
+        yield parte
+
+
+def _cotas_amostra(tamanhos, max_linhas):
+    """Linhas a manter de cada shard para somar no máximo `max_linhas`"""
+    total = sum(tamanhos)
+    if not max_linhas or total <= max_linhas:
+        return list(tamanhos)
+    
+    # Proporcional ao shard; as sobras vão para os maiores restos
+    exatas = np.array(tamanhos, dtype=np.float64) * max_linhas / total
+    cotas = np.floor(exatas).astype(np.int64)
+    restos = np.argsort(-(exatas - cotas), kind='stable')[:max_linhas - cotas.sum()]
+    cotas[restos] += 1
+    return cotas.tolist()
+
+
+def carregar_shards(caminho, colunas=None, transformar=None, max_linhas=None, semente=SEMENTE):
+    """
+    Junta os shards em um DataFrame, mantendo as colunas categóricas
+    (as categorias de cada shard são unificadas)
+    
+    O resultado fica inteiro em memória: para datasets maiores que ela,
+    `max_linhas` limita a carga a uma amostra uniforme de todos os shards
+    (ver iterar_shards), feita enquanto só um shard está em memória.
+    
+    Args:
+        caminho (str): Manifesto ou pasta do dataset
+        colunas (list): Colunas a ler (padrão: todas)
+        transformar (callable): Aplicado a cada shard antes de juntar
+            (ex.: reduzir os tipos enquanto só um shard está em memória)
+        max_linhas (int): Máximo de linhas carregadas (None = todas)
+        semente (int): Semente da amostragem
+    """
+    partes = [
+        parte if transformar is None else transformar(parte)
+        for parte in iterar_shards(caminho, colunas, max_linhas, semente)
+    ]
+    if not partes:
+        return pd.DataFrame(columns=colunas)
+    
+    dados = {}
+    for coluna in partes[0].columns:
+        series = [parte[coluna] for parte in partes]
+        if isinstance(series[0].dtype, pd.CategoricalDtype):
+            dados[coluna] = union_categoricals(series)
+        else:
+            dados[coluna] = np.concatenate([serie.to_numpy() for serie in series])
+        for parte in partes:
+            del parte[coluna]  # libera a coluna do shard assim que foi copiada
+    return pd.DataFrame(dados)
 
 
 def main():
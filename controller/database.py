@@ -1,15 +1,39 @@
 import firebase_admin
 from firebase_admin import credentials, firestore
+import heapq
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from catalogo_base import CatalogoCursos, id_curso
+from indexacao_cursos import (
+    CAMPOS_TAMANHO, LIMITE_VALORES_FILTRO, TAMANHO_VISAO, chave, documento,
+    id_visao, montar_visoes, pontuacoes_visoes, publico, visoes,
+    visoes_do_documento, vocabulario
+)
+from indice_cursos import PESO_AREA, TAMANHO_NGRAMA, IndiceCursos, ngramas, tokenizar
 
 load_dotenv()
 
-class FirebaseDB:
+
+def _sem_metadados(item):
+    """Curso de uma visão sem o id e a pontuação"""
+    return {k: v for k, v in item.items() if k not in ('id', 'pontuacao')}
+
+
+class FirebaseDB(CatalogoCursos):
     """Gerenciador de conexão com Firebase Firestore"""
     
     _instance = None
     COLLECTION_NAME = 'alura'  # ✅ Nome da coleção definido aqui
+    COLLECTION_VISOES = 'alura_visoes'  # área/habilidade -> cursos (visões materializadas)
+    SUBCOLECAO_PONTUACOES = 'pontuacoes'  # alura_visoes/{visão}/pontuacoes/{curso}: só a ingestão lê
+    CACHE_TTL = float(os.getenv("CATALOGO_CACHE_TTL", "300"))  # segundos
+    LIMITE_BATCH = 500  # escritas por write batch (limite do Firestore)
+    CONCORRENCIA_SYNC = int(os.getenv("CATALOGO_SYNC_CONCORRENCIA", "4"))  # batches simultâneos
+    # "snapshot": catálogo inteiro em memória (TTL); "servidor": filtros e limites no Firestore
+    CONSULTA = os.getenv("CATALOGO_CONSULTA", "snapshot")
     
     def __new__(cls):
         if cls._instance is None:
@@ -17,6 +41,14 @@ class FirebaseDB:
             cls._instance.db = None
             cls._instance.app = None
             cls._instance._initialized = False
+            # Snapshot compartilhado do catálogo (cache em memória + índice)
+            cls._instance._cache_indice = None
+            cls._instance._cache_timestamp = 0.0
+            cls._instance._cache_lock = threading.Lock()
+            # Total de cursos e tamanho médio dos campos (modo servidor)
+            cls._instance._cache_estatisticas = None
+            # Visões calculadas sobre o snapshot: (índice de origem, visões)
+            cls._instance._cache_visoes = None
         return cls._instance
     
     def connect(self):
@@ -26,6 +58,15 @@ class FirebaseDB:
             if self._initialized and self.db:
                 return True
             
+            # Emulador do Firestore: dispensa credenciais
+            if os.getenv("FIRESTORE_EMULATOR_HOST"):
+                from google.cloud import firestore as gcloud_firestore
+                projeto = os.getenv("FIREBASE_PROJECT_ID", "demo-skillbridge")
+                self.db = gcloud_firestore.Client(project=projeto)
+                self._initialized = True
+                print(f"✅ Conectado ao emulador do Firestore ({os.getenv('FIRESTORE_EMULATOR_HOST')})")
+                return True
+            
             # Verificar se já existe app Firebase
             if not firebase_admin._apps:
                 # ✅ PASSO 1: Carregar credenciais
@@ -54,126 +95,661 @@ class FirebaseDB:
             traceback.print_exc()
             return False
     
-    def inserir_cursos(self, cursos):
-        """Inserir cursos no Firestore"""
+    def usar_cliente(self, db):
+        """
+        Usa um cliente Firestore já construído (ex.: ClienteFirestoreMemoria
+        de tests/firestore_memoria.py) no lugar da conexão com o Firebase
+        """
+        self.db = db
+        self._initialized = True
+        self.invalidar_cache()
+    
+    def sincronizar_cursos(self, cursos, remover_ausentes=True):
+        """
+        Sincroniza a coleção com a lista de cursos escrevendo só a diferença
+        
+        Os documentos têm ID estável (hash da URL): cursos novos são criados,
+        cursos com conteúdo diferente são sobrescritos e, com
+        `remover_ausentes`, documentos que não estão na lista são apagados.
+        Cursos iguais aos já gravados não geram escrita. A coleção nunca fica
+        vazia durante a sincronização.
+        
+        Returns:
+            dict: Contagens (adicionados, atualizados, removidos, inalterados,
+                batches, tempo_ms) ou None em caso de erro
+        """
         try:
             if not self.connect():
-                return False
+                return None
             
-            # ✅ Usar o nome da coleção definido
+            inicio = time.perf_counter()
             collection_ref = self.db.collection(self.COLLECTION_NAME)
             
-            # Limpar coleção
-            print(f"🗑️  Limpando coleção '{self.COLLECTION_NAME}'...")
-            docs = collection_ref.limit(500).stream()
-            batch = self.db.batch()
-            count = 0
+            atuais = {doc.id: doc.to_dict() for doc in collection_ref.stream()}
+            # Documentos gravados com os campos indexados (tags, habilidades e termos)
+            desejados = {id_curso(curso): documento(curso) for curso in cursos}
+            
+            adicionar = [doc_id for doc_id in desejados if doc_id not in atuais]
+            atualizar = [
+                doc_id for doc_id in desejados
+                if doc_id in atuais and atuais[doc_id] != desejados[doc_id]
+            ]
+            remover = [doc_id for doc_id in atuais if doc_id not in desejados] if remover_ausentes else []
             
-            for doc in docs:
-                batch.delete(doc.reference)
-                count += 1
-                if count % 500 == 0:
-                    batch.commit()
-                    batch = self.db.batch()
+            operacoes = [
+                ('set', collection_ref.document(doc_id), desejados[doc_id])
+                for doc_id in adicionar + atualizar
+            ]
+            operacoes += [('delete', collection_ref.document(doc_id), None) for doc_id in remover]
             
-            if count > 0:
-                batch.commit()
-                print(f"   Removidos {count} cursos antigos")
+            print(f"🔄 Sincronizando coleção '{self.COLLECTION_NAME}': "
+                  f"+{len(adicionar)} ~{len(atualizar)} -{len(remover)}")
+            batches = self._aplicar_operacoes(operacoes)
+            visoes_atualizadas = self._atualizar_visoes_seguro(
+                {doc_id: desejados[doc_id] for doc_id in adicionar + atualizar}, remover,
+                {doc_id: visoes_do_documento(atuais[doc_id]) for doc_id in atualizar + remover}
+            )
             
-            # Inserir novos
-            print(f"💾 Inserindo {len(cursos)} cursos na coleção '{self.COLLECTION_NAME}'...")
+            resumo = {
+                'adicionados': len(adicionar),
+                'atualizados': len(atualizar),
+                'removidos': len(remover),
+                'inalterados': len(desejados) - len(adicionar) - len(atualizar),
+                'batches': batches,
+                'visoes_atualizadas': visoes_atualizadas,
+                'tempo_ms': (time.perf_counter() - inicio) * 1000
+            }
+            print(f"✅ Sincronização concluída: {resumo['adicionados']} adicionados, "
+                  f"{resumo['atualizados']} atualizados, {resumo['removidos']} removidos, "
+                  f"{resumo['inalterados']} inalterados ({batches} batches)")
+            return resumo
+            
+        except Exception as e:
+            print(f"❌ Erro ao sincronizar: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+        
+        finally:
+            self.invalidar_cache()
+    
+    def _aplicar_operacoes(self, operacoes):
+        """
+        Grava as operações (tipo, referência do documento, dados) em write
+        batches de até LIMITE_BATCH escritas, com até CONCORRENCIA_SYNC
+        commits simultâneos
+        
+        Returns:
+            int: Número de batches enviados
+        """
+        def commit(lote):
             batch = self.db.batch()
-            count = 0
+            for tipo, doc_ref, dados in lote:
+                if tipo == 'set':
+                    batch.set(doc_ref, dados)
+                else:
+                    batch.delete(doc_ref)
+            batch.commit()
+        
+        lotes = [
+            operacoes[i:i + self.LIMITE_BATCH]
+            for i in range(0, len(operacoes), self.LIMITE_BATCH)
+        ]
+        if not lotes:
+            return 0
+        
+        with ThreadPoolExecutor(max_workers=min(self.CONCORRENCIA_SYNC, len(lotes))) as executor:
+            # list() propaga a exceção do primeiro batch que falhar
+            list(executor.map(commit, lotes))
+        
+        return len(lotes)
+    
+    def salvar_cursos(self, cursos):
+        """
+        Grava (upsert) cursos no Firestore sem apagar os demais
+        
+        Cada curso vai para o documento de ID estável derivado da URL, então
+        reenviar um curso sobrescreve o documento existente em vez de duplicá-lo.
+        """
+        try:
+            if not self.connect():
+                return False
             
-            for curso in cursos:
-                doc_ref = collection_ref.document()
-                batch.set(doc_ref, curso)
-                count += 1
-                
-                if count % 500 == 0:
-                    batch.commit()
-                    print(f"   ✓ {count}/{len(cursos)} salvos...")
-                    batch = self.db.batch()
+            collection_ref = self.db.collection(self.COLLECTION_NAME)
             
-            # Commit final
-            if count % 500 != 0:
-                batch.commit()
+            print(f"💾 Atualizando {len(cursos)} cursos na coleção '{self.COLLECTION_NAME}'...")
+            documentos = {id_curso(curso): documento(curso) for curso in cursos}
+            # Visões em que os cursos estavam antes (para tirá-los das que deixaram de citar)
+            anteriores = {
+                snap.id: visoes_do_documento(snap.to_dict())
+                for snap in self.db.get_all(
+                    [collection_ref.document(doc_id) for doc_id in documentos],
+                    field_paths=['tags_area', 'habilidades']
+                )
+                if snap.exists
+            }
+            self._aplicar_operacoes([
+                ('set', collection_ref.document(doc_id), dados) for doc_id, dados in documentos.items()
+            ])
+            self._atualizar_visoes_seguro(documentos, anteriores=anteriores)
             
-            print(f"✅ {len(cursos)} cursos salvos com sucesso na coleção '{self.COLLECTION_NAME}'!")
+            print(f"✅ {len(cursos)} cursos atualizados na coleção '{self.COLLECTION_NAME}'!")
             return True
             
         except Exception as e:
-            print(f"❌ Erro ao inserir: {e}")
+            print(f"❌ Erro ao salvar: {e}")
             import traceback
             traceback.print_exc()
             return False
+        
+        finally:
+            self.invalidar_cache()
     
-    def buscar_cursos(self, limite=None):
-        """Buscar todos os cursos"""
+    def remover_ausentes(self, urls):
+        """
+        Apaga os documentos cujos cursos não estão entre as URLs informadas
+        
+        Returns:
+            int: Documentos removidos (None em caso de erro)
+        """
         try:
             if not self.connect():
-                return []
+                return None
             
-            # ✅ Usar o nome da coleção definido
             collection_ref = self.db.collection(self.COLLECTION_NAME)
+            manter = {id_curso({'url': url}) for url in urls}
+            anteriores = {
+                doc.id: visoes_do_documento(doc.to_dict())
+                for doc in collection_ref.stream() if doc.id not in manter
+            }
+            remover = list(anteriores)
             
-            if limite:
-                docs = collection_ref.limit(limite).stream()
-            else:
-                docs = collection_ref.stream()
+            self._aplicar_operacoes([('delete', collection_ref.document(doc_id), None) for doc_id in remover])
+            self._atualizar_visoes_seguro(removidos=remover, anteriores=anteriores)
+            if remover:
+                print(f"🗑️  {len(remover)} cursos fora da listagem removidos de '{self.COLLECTION_NAME}'")
+            return len(remover)
+            
+        except Exception as e:
+            print(f"❌ Erro ao remover: {e}")
+            return None
+        
+        finally:
+            self.invalidar_cache()
+    
+    def _atualizar_visoes_seguro(self, alterados=None, removidos=(), anteriores=None):
+        """Atualiza as visões sem derrubar a gravação dos cursos em caso de erro"""
+        try:
+            return self._atualizar_visoes(alterados, removidos, anteriores)
+        except Exception as e:
+            print(f"⚠️  Erro ao atualizar as visões ({e}); execute reconstruir_visoes()")
+            return None
+    
+    def _atualizar_visoes(self, alterados=None, removidos=(), anteriores=None, reconstruir=False):
+        """
+        Aplica cursos alterados/removidos às visões área -> cursos e
+        habilidade -> cursos
+        
+        A pontuação de cada curso em cada visão fica em um documento da
+        subcoleção SUBCOLECAO_PONTUACOES da visão, lida só aqui; o
+        documento da visão guarda apenas os TAMANHO_VISAO melhores cursos
+        por extenso, já ordenados, e não cresce com o catálogo. Como a
+        pontuação depende só do próprio curso, basta regravar as
+        pontuações dos cursos alterados e reler o topo das visões em que
+        eles entraram ou das quais saíram; só as visões que mudaram são
+        regravadas.
+        
+        Args:
+            alterados (dict): doc_id -> documento gravado
+            removidos (iterable): doc_ids apagados
+            anteriores (dict): doc_id -> visões (tipo, chave) em que o
+                curso estava antes da mudança
+            reconstruir (bool): Reler o topo de todas as visões
+        
+        Returns:
+            int: Número de visões gravadas
+        """
+        alterados = alterados or {}
+        anteriores = anteriores or {}
+        if not alterados and not removidos and not reconstruir:
+            return 0
+        
+        visoes_ref = self.db.collection(self.COLLECTION_VISOES)
+        todas = visoes()
+        snapshots = self.db.get_all([visoes_ref.document(id_visao(t, c)) for t, c in todas])
+        atuais = {snap.id: snap.to_dict() for snap in snapshots if snap.exists}
+        
+        # Visões ainda não existem, ou estão no formato antigo (todas as
+        # pontuações no próprio documento): montar a partir da coleção inteira
+        if not reconstruir and (not atuais or any('pontuacoes' in v for v in atuais.values())):
+            return self.reconstruir_visoes()
+        
+        def pontuacao_ref(visao, doc_id):
+            return (visoes_ref.document(id_visao(*visao))
+                    .collection(self.SUBCOLECAO_PONTUACOES).document(doc_id))
+        
+        operacoes = []
+        afetadas = set(todas) if reconstruir else set()
+        for doc_id in removidos:
+            for visao in anteriores.get(doc_id, ()):
+                operacoes.append(('delete', pontuacao_ref(visao, doc_id), None))
+                afetadas.add(visao)
+        for doc_id, curso in alterados.items():
+            pontuacoes_curso = pontuacoes_visoes(curso)
+            for visao in set(anteriores.get(doc_id, ())) - set(pontuacoes_curso):
+                operacoes.append(('delete', pontuacao_ref(visao, doc_id), None))
+                afetadas.add(visao)
+            for visao, pontuacao in pontuacoes_curso.items():
+                operacoes.append(('set', pontuacao_ref(visao, doc_id), {'pontuacao': pontuacao}))
+                afetadas.add(visao)
+        self._aplicar_operacoes(operacoes)
+        
+        # Topo de cada visão afetada, já na ordem (pontuação e ID decrescentes)
+        topos = {}
+        for tipo, c in afetadas:
+            consulta = (
+                visoes_ref.document(id_visao(tipo, c)).collection(self.SUBCOLECAO_PONTUACOES)
+                .order_by('pontuacao', direction=firestore.Query.DESCENDING)
+                .limit(TAMANHO_VISAO)
+            )
+            topos[(tipo, c)] = [(snap.id, snap.to_dict()['pontuacao']) for snap in consulta.stream()]
+        
+        # Dados dos cursos que já estavam nas visões, atualizados pelos alterados
+        conhecidos = {}
+        for visao in atuais.values():
+            for item in visao.get('cursos', []):
+                conhecidos[item['id']] = _sem_metadados(item)
+        conhecidos.update({doc_id: publico(curso) for doc_id, curso in alterados.items()})
+        
+        # Cursos que subiram para o topo de alguma visão sem estarem em memória
+        faltantes = {doc_id for topo in topos.values() for doc_id, _ in topo} - set(conhecidos)
+        if faltantes:
+            cursos_ref = self.db.collection(self.COLLECTION_NAME)
+            for snap in self.db.get_all([cursos_ref.document(doc_id) for doc_id in sorted(faltantes)]):
+                if snap.exists:
+                    conhecidos[snap.id] = publico(snap.to_dict())
+        
+        gravacoes = []
+        for (tipo, c), topo in topos.items():
+            vid = id_visao(tipo, c)
+            visao = {
+                'tipo': tipo,
+                'chave': c,
+                'cursos': [
+                    {**conhecidos[doc_id], 'id': doc_id, 'pontuacao': pontuacao}
+                    for doc_id, pontuacao in topo if doc_id in conhecidos
+                ]
+            }
+            if visao != atuais.get(vid):
+                gravacoes.append(('set', visoes_ref.document(vid), visao))
+        
+        self._aplicar_operacoes(gravacoes)
+        return len(gravacoes)
+    
+    def reconstruir_visoes(self):
+        """Recalcula todas as visões materializadas a partir da coleção de cursos"""
+        if not self.connect():
+            return None
+        
+        cursos = {
+            doc.id: doc.to_dict()
+            for doc in self.db.collection(self.COLLECTION_NAME).stream()
+        }
+        
+        # Pontuações já gravadas: as de cursos que não existem mais são apagadas
+        visoes_ref = self.db.collection(self.COLLECTION_VISOES)
+        anteriores = {}
+        for tipo, c in visoes():
+            pontuacoes_ref = visoes_ref.document(id_visao(tipo, c)).collection(self.SUBCOLECAO_PONTUACOES)
+            for snap in pontuacoes_ref.stream():
+                anteriores.setdefault(snap.id, set()).add((tipo, c))
+        removidos = [doc_id for doc_id in anteriores if doc_id not in cursos]
+        
+        gravadas = self._atualizar_visoes(cursos, removidos, anteriores, reconstruir=True)
+        print(f"✅ Visões materializadas reconstruídas: {gravadas} gravadas ({len(cursos)} cursos)")
+        return gravadas
+    
+    def buscar_cursos_recomendados(self, area_interesse=None, habilidades=None, limite=10):
+        """
+        Cursos recomendados a partir das visões materializadas
+        
+        No modo snapshot, as visões são calculadas uma vez sobre o catálogo
+        em memória (sem ida ao Firestore); com CATALOGO_CONSULTA=servidor,
+        uma única leitura em lote (get_all, só o campo `cursos`) traz a
+        visão da área e as das habilidades. A área pesa PESO_AREA.
+        
+        Visões só existem para o vocabulário do DataGenerator: se a área ou
+        alguma habilidade ficar fora dele (ex.: "Selenium", "Excel"), ou
+        se as visões não tiverem nenhum curso, a consulta inteira vai para
+        buscar_cursos_filtrados, que ranqueia todos os termos.
+        """
+        try:
+            areas, vocabulario_habilidades = vocabulario()
+            consultas = []
+            sem_visao = False
+            if area_interesse and chave(area_interesse):
+                if chave(area_interesse) in areas:
+                    consultas.append((id_visao('area', chave(area_interesse)), PESO_AREA))
+                else:
+                    sem_visao = True
+            for habilidade in dict.fromkeys(chave(h) for h in habilidades or []):
+                if habilidade in vocabulario_habilidades:
+                    consultas.append((id_visao('habilidade', habilidade), 1.0))
+                elif habilidade:
+                    sem_visao = True
+            
+            if sem_visao or not consultas:
+                return self.buscar_cursos_filtrados(area_interesse, habilidades, limite)
             
-            cursos = []
-            for doc in docs:
-                curso = doc.to_dict()
-                cursos.append(curso)
+            listas = self._ler_visoes([vid for vid, _ in consultas])
             
-            print(f"✅ {len(cursos)} cursos carregados da coleção '{self.COLLECTION_NAME}'")
-            return cursos
+            pontuacoes, cursos = {}, {}
+            for vid, peso in consultas:
+                for item in listas.get(vid, []):
+                    pontuacoes[item['id']] = pontuacoes.get(item['id'], 0.0) + peso * item['pontuacao']
+                    cursos[item['id']] = _sem_metadados(item)
+            
+            if not pontuacoes:
+                return self.buscar_cursos_filtrados(area_interesse, habilidades, limite)
+            
+            melhores = heapq.nsmallest(limite, pontuacoes.items(), key=lambda i: (-i[1], i[0]))
+            return [cursos[doc_id] for doc_id, _ in melhores]
+            
+        except Exception as e:
+            print(f"❌ Erro ao buscar recomendados: {e}")
+            return self.buscar_cursos_filtrados(area_interesse, habilidades, limite)
+    
+    def _ler_visoes(self, ids_visoes):
+        """
+        Cursos das visões pedidas (id_visao -> itens, melhores primeiro)
+        
+        No modo snapshot, vêm das visões calculadas sobre o catálogo em
+        memória (montar_visoes), refeitas só quando o snapshot muda.
+        """
+        if self.CONSULTA == 'servidor':
+            if not self.connect():
+                return {}
+            visoes_ref = self.db.collection(self.COLLECTION_VISOES)
+            snapshots = self.db.get_all(
+                [visoes_ref.document(vid) for vid in ids_visoes], field_paths=['cursos']
+            )
+            return {snap.id: snap.to_dict().get('cursos', []) for snap in snapshots if snap.exists}
+        
+        indice = self._obter_catalogo()
+        cache = self._cache_visoes
+        if cache is None or cache[0] is not indice:
+            cache = (indice, montar_visoes(indice.cursos))
+            self._cache_visoes = cache
+        return {vid: cache[1][vid] for vid in ids_visoes if vid in cache[1]}
+    
+    def invalidar_cache(self):
+        """Descarta o snapshot do catálogo em memória"""
+        # Aguarda uma eventual recarga em andamento para não ressuscitar dados antigos
+        with self._cache_lock:
+            self._cache_indice = None
+            self._cache_timestamp = 0.0
+            self._cache_estatisticas = None
+            self._cache_visoes = None
+    
+    def _cache_valido(self):
+        """Indica se o snapshot em memória ainda está dentro do TTL"""
+        return (
+            self._cache_indice is not None and
+            time.monotonic() - self._cache_timestamp < self.CACHE_TTL
+        )
+    
+    def _carregar_catalogo(self):
+        """Lê a coleção inteira do Firestore"""
+        if not self.connect():
+            return None
+        
+        docs = self.db.collection(self.COLLECTION_NAME).stream()
+        cursos = [publico(doc.to_dict()) for doc in docs]
+        print(f"✅ {len(cursos)} cursos carregados da coleção '{self.COLLECTION_NAME}'")
+        return cursos
+    
+    def _obter_catalogo(self):
+        """
+        Retorna o snapshot do catálogo (já indexado), recarregando-o quando
+        o TTL expira.
+        
+        Apenas uma thread recarrega por vez (single-flight); as demais
+        aguardam o lock e reutilizam o snapshot recém-carregado.
+        """
+        if self._cache_valido():
+            return self._cache_indice
+        
+        with self._cache_lock:
+            # Outra thread pode ter recarregado enquanto esperávamos
+            if self._cache_valido():
+                return self._cache_indice
+            
+            try:
+                cursos = self._carregar_catalogo()
+            except Exception as e:
+                print(f"❌ Erro ao recarregar catálogo: {e}")
+                cursos = None
+            
+            if cursos is None:
+                # Falha no backend: servir o snapshot antigo, se houver
+                return self._cache_indice or IndiceCursos([])
+            
+            # O índice é construído uma única vez por snapshot
+            self._cache_indice = IndiceCursos(cursos)
+            self._cache_timestamp = time.monotonic()
+            return self._cache_indice
+    
+    def buscar_cursos(self, limite=None):
+        """Buscar todos os cursos (servidos do snapshot em memória)"""
+        try:
+            if limite and self.CONSULTA == 'servidor':
+                return self.buscar_cursos_pagina(limite)['cursos']
+            
+            cursos = self._obter_catalogo().cursos
+            
+            # Cópia rasa: quem chama pode manipular a lista sem afetar o cache
+            if limite:
+                return cursos[:limite]
+            return list(cursos)
             
         except Exception as e:
             print(f"❌ Erro ao buscar: {e}")
             return []
     
-    def buscar_cursos_filtrados(self, area_interesse=None, habilidades=None):
-        """Buscar cursos filtrados"""
+    def buscar_cursos_pagina(self, tamanho=20, cursor=None):
+        """
+        Uma página do catálogo, ordenada por URL
+        
+        Args:
+            tamanho (int): Cursos por página
+            cursor (str): `proximo_cursor` da página anterior (None = início)
+        
+        Returns:
+            dict: cursos e proximo_cursor (None na última página)
+        """
         try:
-            cursos = self.buscar_cursos()
+            if not self.connect():
+                return {'cursos': [], 'proximo_cursor': None}
             
-            if not cursos:
-                return []
+            consulta = self.db.collection(self.COLLECTION_NAME).order_by('url')
+            if cursor:
+                consulta = consulta.start_after({'url': cursor})
             
-            area_lower = area_interesse.lower() if area_interesse else ""
-            habilidades_lower = [h.lower() for h in habilidades] if habilidades else []
+            cursos = [publico(doc.to_dict()) for doc in consulta.limit(tamanho).stream()]
+            proximo = cursos[-1]['url'] if len(cursos) == tamanho else None
+            return {'cursos': cursos, 'proximo_cursor': proximo}
             
-            cursos_relevantes = []
+        except Exception as e:
+            print(f"❌ Erro ao paginar: {e}")
+            return {'cursos': [], 'proximo_cursor': None}
+    
+    def _consultas_filtro(self, area_interesse, habilidades):
+        """
+        Consultas do Firestore que cobrem o filtro (a união dos resultados
+        contém todos os cursos que citam a área ou alguma habilidade)
+        
+        Área e habilidades do vocabulário usam os campos tags_area e
+        habilidades; textos fora dele caem no campo termos.
+        """
+        collection_ref = self.db.collection(self.COLLECTION_NAME)
+        areas, vocabulario_habilidades = vocabulario()
+        
+        consultas = []
+        habilidades_conhecidas = []
+        termos_livres = set()
+        
+        if area_interesse:
+            if chave(area_interesse) in areas:
+                consultas.append(collection_ref.where('tags_area', 'array_contains', chave(area_interesse)))
+            else:
+                termos_livres.update(tokenizar(area_interesse)[:1])
+        
+        for habilidade in habilidades or []:
+            if chave(habilidade) in vocabulario_habilidades:
+                habilidades_conhecidas.append(chave(habilidade))
+            else:
+                # Qualquer curso com a frase contém o seu primeiro termo
+                termos_livres.update(tokenizar(habilidade)[:1])
+        
+        for campo, valores in (('habilidades', sorted(set(habilidades_conhecidas))),
+                               ('termos', sorted(termos_livres))):
+            for i in range(0, len(valores), LIMITE_VALORES_FILTRO):
+                consultas.append(
+                    collection_ref.where(campo, 'array_contains_any', valores[i:i + LIMITE_VALORES_FILTRO])
+                )
+        
+        return consultas
+    
+    def _consultas_trechos(self, area_interesse, habilidades):
+        """
+        Consultas do Firestore que cobrem o filtro por substring de
+        IndiceCursos.filtrar ("Java" também encontra "JavaScript")
+        
+        Todo curso que contém um trecho tem todos os trigramas dele no campo
+        trigramas, então basta um array_contains no trigrama mais raro
+        (contado com agregações). Um trecho menor que um trigrama pode estar
+        em qualquer curso: a coleção inteira é lida.
+        """
+        collection_ref = self.db.collection(self.COLLECTION_NAME)
+        trechos = {texto.lower() for texto in [area_interesse, *(habilidades or [])] if texto}
+        
+        consultas = []
+        for trecho in sorted(trechos):
+            if len(trecho) < TAMANHO_NGRAMA:
+                return [collection_ref]
             
-            for curso in cursos:
-                titulo = curso.get("titulo", "").lower()
-                aprendizado = curso.get("aprendizado", "").lower()
-                publico = curso.get("publico_alvo", "").lower()
-                texto_completo = titulo + aprendizado + publico
-                
-                if area_lower and area_lower in texto_completo:
-                    cursos_relevantes.append(curso)
-                elif any(skill in texto_completo for skill in habilidades_lower):
-                    cursos_relevantes.append(curso)
+            contagens = {
+                ngrama: collection_ref.where('trigramas', 'array_contains', ngrama).count().get()[0][0].value
+                for ngrama in sorted(ngramas(trecho))
+            }
+            mais_raro = min(contagens, key=contagens.get)
+            if contagens[mais_raro]:
+                consultas.append(collection_ref.where('trigramas', 'array_contains', mais_raro))
+        
+        return consultas
+    
+    def _buscar_candidatos(self, consultas):
+        """
+        Executa as consultas do filtro e une os resultados (por ID)
+        
+        Os candidatos são lidos por inteiro: cortar cada consulta antes do
+        ranking devolveria um subconjunto arbitrário e deixaria de fora
+        cursos relevantes (e as frequências do idf).
+        """
+        candidatos = {}
+        for consulta in consultas:
+            for doc in consulta.stream():
+                candidatos.setdefault(doc.id, publico(doc.to_dict()))
+        # Ordem estável entre execuções (a do snapshot depende da leitura)
+        return [candidatos[doc_id] for doc_id in sorted(candidatos)]
+    
+    def _estatisticas_catalogo(self):
+        """
+        Total de cursos e tamanho médio de cada campo de busca no catálogo
+        inteiro, com uma consulta de agregação (count + sum) no servidor
+        
+        Com elas, o BM25F sobre os candidatos usa o mesmo idf e a mesma
+        normalização de tamanho que o índice do snapshot completo. Fica em
+        cache até o TTL ou a próxima escrita.
+        """
+        estatisticas = self._cache_estatisticas
+        if estatisticas and time.monotonic() - estatisticas['timestamp'] < self.CACHE_TTL:
+            return estatisticas
+        
+        agregacao = self.db.collection(self.COLLECTION_NAME).count(alias='cursos')
+        for campo in CAMPOS_TAMANHO:
+            agregacao = agregacao.sum(campo, alias=campo)
+        valores = {resultado.alias: resultado.value for resultado in agregacao.get()[0]}
+        
+        total = int(valores['cursos'])
+        estatisticas = {
+            'cursos': total,
+            'tamanho_medio': [(valores[campo] or 0) / max(total, 1) for campo in CAMPOS_TAMANHO],
+            'timestamp': time.monotonic()
+        }
+        self._cache_estatisticas = estatisticas
+        return estatisticas
+    
+    def buscar_cursos_filtrados(self, area_interesse=None, habilidades=None, limite=None):
+        """
+        Buscar cursos filtrados (via índice invertido do snapshot)
+        
+        Com CATALOGO_CONSULTA=servidor, o filtro é feito pelo Firestore
+        (array_contains/array_contains_any nos campos indexados) e só os
+        candidatos são lidos e ranqueados; as leituras crescem com o número
+        de cursos que citam a consulta, não com o tamanho do catálogo. O
+        idf e os tamanhos médios vêm do catálogo inteiro
+        (_estatisticas_catalogo), então o ranking é o mesmo do snapshot.
+        Sem `limite`, os candidatos vêm dos trigramas (_consultas_trechos)
+        e o filtro por substring também é o mesmo do snapshot.
+        
+        Args:
+            area_interesse (str): Área usada no filtro
+            habilidades (list): Habilidades usadas no filtro
+            limite (int): Se informado, retorna apenas os `limite` cursos
+                mais relevantes (BM25), em ordem de relevância
+        """
+        try:
+            if self.CONSULTA == 'servidor':
+                if not self.connect():
+                    return []
+                # Os campos indexados só ampliam a busca: a frase exata (ou o
+                # trecho) e o ranking são conferidos no índice dos candidatos
+                if limite:
+                    candidatos = self._buscar_candidatos(self._consultas_filtro(area_interesse, habilidades))
+                    indice = IndiceCursos(candidatos, self._estatisticas_catalogo())
+                    cursos_relevantes = indice.ranquear(area_interesse, habilidades, limite)
+                else:
+                    candidatos = self._buscar_candidatos(self._consultas_trechos(area_interesse, habilidades))
+                    cursos_relevantes = IndiceCursos(candidatos).filtrar(area_interesse, habilidades)
+                return cursos_relevantes or self.buscar_cursos_pagina(min(limite, 50) if limite else 50)['cursos']
+            
+            indice = self._obter_catalogo()
+            
+            if not len(indice):
+                return []
+            
+            if limite:
+                cursos_relevantes = indice.ranquear(area_interesse, habilidades, limite)
+                return cursos_relevantes if cursos_relevantes else indice.cursos[:min(limite, 50)]
+            
+            cursos_relevantes = indice.filtrar(area_interesse, habilidades)
             
-            return cursos_relevantes if cursos_relevantes else cursos[:50]
+            return cursos_relevantes if cursos_relevantes else indice.cursos[:50]
             
         except Exception as e:
             print(f"❌ Erro ao filtrar: {e}")
             return []
     
     def contar_cursos(self):
-        """Contar total de cursos"""
+        """Contar total de cursos (consulta de agregação no servidor)"""
         try:
             if not self.connect():
                 return 0
             
             # ✅ Usar o nome da coleção definido
-            docs = self.db.collection(self.COLLECTION_NAME).stream()
-            count = sum(1 for _ in docs)
-            return count
+            resultado = self.db.collection(self.COLLECTION_NAME).count().get()
+            return int(resultado[0][0].value)
             
         except Exception as e:
             print(f"❌ Erro ao contar: {e}")
@@ -1,10 +1,119 @@
-import google.generativeai as genai
 import os
+import time
+from functools import lru_cache
 from dotenv import load_dotenv
-from database import firebase_db
+from cache_lru import CacheLRU
+from catalogo import catalogo_db
 
 load_dotenv()
 
+MODELO_GEMINI = "gemini-2.0-flash"
+
+# Cursos selecionados por (área, habilidades): evita refiltrar o catálogo a cada plano
+_cache_cursos = CacheLRU(capacidade=256, ttl=float(os.getenv("CATALOGO_CACHE_TTL", "300")))
+
+
+class ClienteGemini:
+    """Cliente do Gemini: configura a API uma única vez e reutiliza o modelo"""
+    
+    def __init__(self, api_key=None, modelo=MODELO_GEMINI):
+        import google.generativeai as genai
+        
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise RuntimeError("Configure GEMINI_API_KEY no .env")
+        
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(modelo)
+    
+    def gerar(self, prompt):
+        """Texto completo gerado para o prompt"""
+        return self.model.generate_content(prompt).text
+    
+    def gerar_fluxo(self, prompt):
+        """
+        Gerador com os trechos do texto à medida que o modelo os produz
+        
+        Fechar o gerador (close()) interrompe a leitura da resposta.
+        Trechos sem texto (só metadados, como o último) são pulados; uma
+        resposta bloqueada pelos filtros vira um erro com o motivo.
+        """
+        for trecho in self.model.generate_content(prompt, stream=True):
+            try:
+                texto = trecho.text
+            except ValueError:
+                # .text levanta ValueError quando o trecho não tem partes
+                motivo = _motivo_bloqueio(trecho)
+                if motivo:
+                    raise RuntimeError(f"Resposta bloqueada pelo Gemini ({motivo})")
+                continue
+            if texto:
+                yield texto
+
+
+def _motivo_bloqueio(trecho):
+    """Motivo do bloqueio do trecho pelos filtros do Gemini (None se não houve)"""
+    bloqueio = getattr(getattr(trecho, 'prompt_feedback', None), 'block_reason', None)
+    if bloqueio:
+        return getattr(bloqueio, 'name', str(bloqueio))
+    for candidato in getattr(trecho, 'candidates', None) or []:
+        motivo = getattr(getattr(candidato, 'finish_reason', None), 'name', None)
+        if motivo in ('SAFETY', 'RECITATION', 'BLOCKLIST', 'PROHIBITED_CONTENT', 'SPII'):
+            return motivo
+    return None
+
+
+class ClienteLLMFalso:
+    """
+    Cliente local para testes: devolve um plano fixo depois de `atraso`
+    segundos, sem chamar nenhuma API
+    """
+    
+    def __init__(self, atraso=0.5, resposta=None, atraso_trecho=0.05):
+        self.atraso = atraso
+        self.resposta = resposta
+        self.atraso_trecho = atraso_trecho
+        self.chamadas = 0
+        self.cancelados = 0
+    
+    def _texto(self, prompt):
+        if self.resposta is not None:
+            return self.resposta
+        linhas = prompt.splitlines()
+        return "PLANO DE CARREIRA (gerado localmente)\n\n" + "\n".join(linhas[:4])
+    
+    def gerar(self, prompt):
+        self.chamadas += 1
+        time.sleep(self.atraso)
+        return self._texto(prompt)
+    
+    def gerar_fluxo(self, prompt):
+        """Mesmo texto de gerar(), em trechos de uma linha com atraso entre eles"""
+        self.chamadas += 1
+        try:
+            for trecho in self._texto(prompt).splitlines(keepends=True):
+                time.sleep(self.atraso_trecho)
+                yield trecho
+        except GeneratorExit:
+            self.cancelados += 1
+            raise
+
+
+def criar_cliente_llm():
+    """Cliente configurado em PLANOS_LLM: "gemini" (padrão) ou "falso" """
+    if os.getenv("PLANOS_LLM", "gemini").lower() == "falso":
+        return ClienteLLMFalso(
+            atraso=float(os.getenv("PLANOS_LLM_ATRASO", "0.5")),
+            atraso_trecho=float(os.getenv("PLANOS_LLM_ATRASO_TRECHO", "0.05"))
+        )
+    return ClienteGemini()
+
+
+@lru_cache(maxsize=1)
+def cliente_llm_padrao():
+    """Cliente compartilhado pelo processo (a API é configurada uma vez só)"""
+    return criar_cliente_llm()
+
 def montar_input(formulario):
     """Transforma os dados do formulário em input_data"""
     
@@ -32,44 +141,41 @@ def montar_input(formulario):
     return input_data
 
 
-def recommender(input_data):
-    """Gera plano de ação buscando do Firebase"""
+def selecionar_cursos(input_data):
+    """Cursos do catálogo relevantes para a área e as habilidades do perfil"""
+    area_interesse = input_data.get("area_interesse") or ""
+    habilidades = input_data.get("habilidades_atuais") or []
     
-    print("🔥 Carregando cursos do Firebase...")
+    chave = (area_interesse, tuple(habilidades))
+    cursos_relevantes = _cache_cursos.obter(chave)
+    if cursos_relevantes is not None:
+        return cursos_relevantes
     
-    area_interesse = input_data.get("area_interesse", "")
-    habilidades = input_data.get("habilidades_atuais", [])
+    print("🔥 Carregando cursos do catálogo...")
     
-    cursos_relevantes = firebase_db.buscar_cursos_filtrados(
+    cursos_relevantes = catalogo_db.buscar_cursos_filtrados(
         area_interesse=area_interesse,
-        habilidades=habilidades
+        habilidades=habilidades,
+        limite=20
     )
     
     if not cursos_relevantes:
         print("⚠️  Buscando todos os cursos...")
-        cursos_relevantes = firebase_db.buscar_cursos(limite=50)
-    
-    if not cursos_relevantes:
-        return "Erro: Nenhum curso encontrado. Execute: python controller/alura_scraper.py"
-    
-    print(f"✅ {len(cursos_relevantes)} cursos relevantes")
-    
-    cursos_relevantes = cursos_relevantes[:20]
-    
-    API_KEY = os.getenv("GEMINI_API_KEY")
+        cursos_relevantes = catalogo_db.buscar_cursos(limite=50)
     
-    if not API_KEY:
-        return "Erro: Configure GEMINI_API_KEY no .env"
+    if cursos_relevantes:
+        _cache_cursos.gravar(chave, cursos_relevantes)
+    return cursos_relevantes
+
+
+def montar_prompt(input_data, cursos_relevantes):
+    """Prompt do plano de carreira com os 15 primeiros cursos relevantes"""
+    cursos_texto = "\n".join([
+        f"{i+1}. {curso.get('titulo', 'Sem titulo')} - {curso.get('url', 'N/A')}"
+        for i, curso in enumerate(cursos_relevantes[:15])
+    ])
     
-    try:
-        genai.configure(api_key=API_KEY)
-        
-        cursos_texto = "\n".join([
-            f"{i+1}. {curso.get('titulo', 'Sem titulo')} - {curso.get('url', 'N/A')}"
-            for i, curso in enumerate(cursos_relevantes[:15])
-        ])
-        
-        prompt = f"""Crie um plano de carreira CONCISO para:
+    prompt = f"""Crie um plano de carreira CONCISO para:
 Profissional: {input_data.get('profissao')} ({input_data.get('nivel')})
 Habilidades: {', '.join(input_data.get('habilidades_atuais', []))}
 Objetivo: {input_data.get('area_interesse')}
@@ -113,15 +219,29 @@ REGRAS:
 - Use URLs reais da lista
 - Maximo 2 linhas por item
 - Seja direto e pratico"""
-        
-        model = genai.GenerativeModel("gemini-2.0-flash")
+    
+    return prompt
+
+
+def recommender(input_data, cliente=None):
+    """Gera plano de ação buscando do catálogo de cursos"""
+    
+    cursos_relevantes = selecionar_cursos(input_data)
+    
+    if not cursos_relevantes:
+        return "Erro: Nenhum curso encontrado. Execute: python controller/alura_scraper.py"
+    
+    print(f"✅ {len(cursos_relevantes)} cursos relevantes")
+    
+    try:
+        cliente = cliente or cliente_llm_padrao()
         
         print("🚀 Gerando com Gemini...")
-        response = model.generate_content(prompt)
+        plano = cliente.gerar(montar_prompt(input_data, cursos_relevantes))
         print("✅ Plano gerado!")
         
-        return response.text
+        return plano
         
     except Exception as e:
         print(f"❌ Erro: {e}")
-        return f"Erro ao gerar recomendacoes: {str(e)}"
\ No newline at end of file
+        return f"Erro ao gerar recomendacoes: {str(e)}"
@@ -0,0 +1,159 @@
+"""
+Campos Indexados dos Cursos
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Na ingestão, cada curso recebe campos derivados do seu texto que o backend
+consegue filtrar no servidor (array_contains / array_contains_any):
+
+    termos      - termos normalizados de título, aprendizado e público-alvo
+    tags_area   - áreas de carreira citadas no curso
+    habilidades - habilidades técnicas citadas no curso
+    trigramas   - trigramas do texto do filtro por substring (texto_trechos),
+                  para achar no servidor os cursos que contêm um trecho
+                  ("Java" também em "JavaScript", "Kube" em "Kubernetes")
+
+e o número de termos de cada campo de busca (tamanho_titulo, ...), que
+somado no servidor dá o tamanho médio dos campos usado pelo BM25F.
+
+Áreas e habilidades vêm do mesmo vocabulário do DataGenerator e são
+gravadas na forma de `chave` (termos normalizados separados por espaço).
+
+As mesmas ocorrências alimentam as visões materializadas área -> cursos e
+habilidade -> cursos. A pontuação de um curso em uma visão depende só do
+próprio curso (frequência saturada por campo, com os pesos do BM25F, sem
+idf), então a visão pode ser atualizada curso a curso. Em cada visão, os
+cursos são ordenados por pontuação e, nos empates, pelo ID decrescente
+(a ordem de um order_by(..., DESCENDING) no Firestore).
+"""
+
+import heapq
+from functools import lru_cache
+
+from catalogo_base import id_curso
+from indice_cursos import BM25_K1, CAMPOS_BUSCA, PESOS_CAMPOS, ngramas, texto_trechos, tokenizar
+
+# Número de termos de cada campo de busca (mesma ordem de CAMPOS_BUSCA)
+CAMPOS_TAMANHO = tuple(f'tamanho_{campo}' for campo in CAMPOS_BUSCA)
+
+CAMPOS_INDEXADOS = ('termos', 'tags_area', 'habilidades', 'trigramas') + CAMPOS_TAMANHO
+
+# Máximo de valores por filtro array_contains_any no Firestore
+LIMITE_VALORES_FILTRO = 30
+
+# Cursos guardados por extenso (já ordenados) em cada visão materializada
+TAMANHO_VISAO = 50
+
+
+def chave(texto):
+    """Forma normalizada de uma área ou habilidade ("UX/UI Design" -> "ux ui design")"""
+    return ' '.join(tokenizar(texto))
+
+
+@lru_cache(maxsize=1)
+def vocabulario():
+    """(áreas, habilidades) normalizadas do DataGenerator"""
+    from data_generator import DataGenerator
+
+    gerador = DataGenerator()
+    areas = tuple(chave(area) for area in gerador.areas_carreira)
+    habilidades = tuple(sorted({
+        chave(h) for lista in gerador.habilidades_tecnicas.values() for h in lista
+    }))
+    return areas, habilidades
+
+
+def visoes():
+    """Todas as visões materializadas: (tipo, chave)"""
+    areas, habilidades = vocabulario()
+    return [('area', a) for a in areas] + [('habilidade', h) for h in habilidades]
+
+
+def id_visao(tipo, chave_visao):
+    """ID do documento da visão ("area:data science")"""
+    return f"{tipo}:{chave_visao}"
+
+
+def visoes_do_documento(documento):
+    """Visões (tipo, chave) em que um documento gravado aparece"""
+    return (
+        {('area', c) for c in documento.get('tags_area', [])} |
+        {('habilidade', c) for c in documento.get('habilidades', [])}
+    )
+
+
+def montar_visoes(cursos):
+    """
+    Visões materializadas calculadas em memória a partir do catálogo,
+    com os mesmos itens gravados nos documentos das visões
+
+    Returns:
+        dict: id_visao -> até TAMANHO_VISAO cursos ({...curso, 'id',
+            'pontuacao'}), melhores primeiro
+    """
+    itens = {}
+    for curso in cursos:
+        doc_id = id_curso(curso)
+        for (tipo, c), pontuacao in pontuacoes_visoes(curso).items():
+            itens.setdefault(id_visao(tipo, c), []).append((pontuacao, doc_id, curso))
+
+    return {
+        vid: [
+            {**publico(curso), 'id': doc_id, 'pontuacao': pontuacao}
+            for pontuacao, doc_id, curso in heapq.nlargest(TAMANHO_VISAO, lista, key=lambda i: i[:2])
+        ]
+        for vid, lista in itens.items()
+    }
+
+
+def _pontuacao(campos, frase):
+    """Soma, por campo, do peso do campo x frequência saturada da frase"""
+    n = len(frase)
+    total = 0.0
+    for peso, termos in zip(PESOS_CAMPOS, campos):
+        freq = sum(1 for i in range(len(termos) - n + 1) if termos[i:i + n] == frase)
+        if freq:
+            total += peso * freq * (BM25_K1 + 1) / (BM25_K1 + freq)
+    return total
+
+
+def pontuacoes_visoes(curso):
+    """
+    Pontuação do curso em cada visão em que aparece
+
+    Returns:
+        dict: (tipo, chave) -> pontuação, com tipo 'area' ou 'habilidade'
+    """
+    campos = [tokenizar(curso.get(campo)) for campo in CAMPOS_BUSCA]
+    areas, habilidades = vocabulario()
+
+    pontuacoes = {}
+    for tipo, chaves in (('area', areas), ('habilidade', habilidades)):
+        for c in chaves:
+            pontuacao = _pontuacao(campos, c.split())
+            if pontuacao:
+                pontuacoes[(tipo, c)] = round(pontuacao, 6)
+    return pontuacoes
+
+
+def campos_indexados(curso):
+    """Campos derivados do texto do curso, gravados junto com ele"""
+    campos = [tokenizar(curso.get(campo)) for campo in CAMPOS_BUSCA]
+    visoes = pontuacoes_visoes(curso)
+
+    return {
+        'termos': sorted({t for termos in campos for t in termos}),
+        'tags_area': [c for tipo, c in visoes if tipo == 'area'],
+        'habilidades': [c for tipo, c in visoes if tipo == 'habilidade'],
+        'trigramas': sorted(ngramas(texto_trechos(curso))),
+        **{nome: len(termos) for nome, termos in zip(CAMPOS_TAMANHO, campos)}
+    }
+
+
+def documento(curso):
+    """Curso pronto para gravar: dados originais + campos indexados"""
+    return {**publico(curso), **campos_indexados(curso)}
+
+
+def publico(documento):
+    """Remove os campos indexados (uso interno do backend) do documento"""
+    return {k: v for k, v in documento.items() if k not in CAMPOS_INDEXADOS}
@@ -0,0 +1,258 @@
+"""
+Índice invertido do catálogo de cursos
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Construído uma única vez por snapshot do catálogo, mapeia termos
+normalizados (minúsculos e sem acentos) para os cursos em que aparecem,
+guardando as posições para permitir busca por frases ("Computer Vision").
+Também ranqueia os cursos por relevância com BM25F.
+
+O filtro mantém a semântica de substring do filtro original ("Java" também
+encontra "JavaScript"): postings de trigramas do texto de cada curso
+apontam os candidatos, e só neles o trecho é procurado.
+"""
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_right
+
+# Campos do curso que participam da busca
+CAMPOS_BUSCA = ('titulo', 'aprendizado', 'publico_alvo')
+
+# Peso de cada campo no ranking (mesma ordem de CAMPOS_BUSCA)
+PESOS_CAMPOS = (3.0, 1.5, 1.0)
+
+# Peso da área de interesse em relação a cada habilidade
+PESO_AREA = 2.0
+
+# Parâmetros do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Tamanho dos n-gramas de caracteres usados no filtro por substring
+TAMANHO_NGRAMA = 3
+
+# Mantém "+" e "#" para não confundir C, C++ e C#
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def normalizar(texto):
+    """Converte para minúsculas e remove acentos"""
+    texto = unicodedata.normalize('NFKD', texto or "")
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return texto.lower()
+
+
+def tokenizar(texto):
+    """Quebra o texto normalizado em termos"""
+    return _TOKEN_RE.findall(normalizar(texto))
+
+
+def texto_trechos(curso):
+    """Campos de busca concatenados, em minúsculas (texto do filtro por substring)"""
+    return "".join((curso.get(campo) or "").lower() for campo in CAMPOS_BUSCA)
+
+
+def ngramas(texto):
+    """Trigramas distintos do texto"""
+    return {texto[i:i + TAMANHO_NGRAMA] for i in range(len(texto) - TAMANHO_NGRAMA + 1)}
+
+
+class IndiceCursos:
+    """Índice invertido posicional sobre um snapshot do catálogo"""
+
+    def __init__(self, cursos, estatisticas=None):
+        """
+        Args:
+            cursos (list): Snapshot do catálogo; o id de cada curso é a sua
+                posição na lista, preservando a ordem original
+            estatisticas (dict): 'cursos' (total) e 'tamanho_medio' (por
+                campo) do catálogo inteiro, quando `cursos` é só uma parte
+                dele (ex.: candidatos de uma consulta no servidor); o idf e
+                a normalização de tamanho do BM25F passam a usá-los
+        """
+        self.cursos = cursos
+        self.postings = {}  # termo -> {curso_id: [posições]}
+        self.inicio_campos = []  # curso_id -> posição inicial de cada campo
+        self.tamanho_campos = []  # curso_id -> número de termos de cada campo
+        # Filtro por substring: montado no primeiro uso (o ranking não usa)
+        self._textos = None  # curso_id -> campos de busca concatenados, em minúsculas
+        self._ngramas = None  # trigrama -> [curso_id]
+        self._ngramas_lock = threading.Lock()
+
+        for curso_id, curso in enumerate(cursos):
+            posicao = 0
+            inicios, tamanhos = [], []
+            for campo in CAMPOS_BUSCA:
+                termos = tokenizar(curso.get(campo))
+                inicios.append(posicao)
+                tamanhos.append(len(termos))
+                for termo in termos:
+                    self.postings.setdefault(termo, {}).setdefault(curso_id, []).append(posicao)
+                    posicao += 1
+                # Lacuna entre campos: frases não atravessam campos
+                posicao += 1
+            self.inicio_campos.append(inicios)
+            self.tamanho_campos.append(tamanhos)
+
+        n = max(len(cursos), 1)
+        self.total_cursos = len(cursos)
+        self.tamanho_medio = [
+            max(sum(t[i] for t in self.tamanho_campos) / n, 1.0)
+            for i in range(len(CAMPOS_BUSCA))
+        ]
+        if estatisticas:
+            self.total_cursos = max(estatisticas['cursos'], len(cursos))
+            self.tamanho_medio = [max(t, 1.0) for t in estatisticas['tamanho_medio']]
+
+    def __len__(self):
+        return len(self.cursos)
+
+    def buscar_termo(self, texto):
+        """
+        Retorna os ids dos cursos que contêm o texto.
+
+        Termos de uma palavra são uma consulta direta no índice; termos de
+        várias palavras são a interseção dos postings seguida da checagem
+        de posições consecutivas.
+        """
+        return set(self._ocorrencias(tokenizar(texto)))
+
+    def _indice_trechos(self):
+        """Textos e postings de trigramas, construídos uma vez por snapshot"""
+        with self._ngramas_lock:
+            if self._ngramas is None:
+                textos, postings = [], {}
+                for curso_id, curso in enumerate(self.cursos):
+                    texto = texto_trechos(curso)
+                    textos.append(texto)
+                    for ngrama in ngramas(texto):
+                        postings.setdefault(ngrama, []).append(curso_id)
+                self._textos, self._ngramas = textos, postings
+        return self._textos, self._ngramas
+
+    def buscar_trecho(self, texto):
+        """
+        Retorna os ids dos cursos cujo texto contém o trecho (sem
+        diferenciar maiúsculas), como o filtro original por substring.
+
+        Os cursos com todos os trigramas do trecho são os candidatos; o
+        trecho só é procurado neles. Trechos menores que um trigrama são
+        procurados em todos os cursos.
+        """
+        trecho = (texto or "").lower()
+        if not trecho:
+            return set()
+
+        textos, postings_ngramas = self._indice_trechos()
+        if len(trecho) < TAMANHO_NGRAMA:
+            candidatos = range(len(textos))
+        else:
+            postings = [postings_ngramas.get(ngrama, ()) for ngrama in ngramas(trecho)]
+            # Interseção começando pelo posting mais curto
+            postings.sort(key=len)
+            candidatos = set(postings[0])
+            for posting in postings[1:]:
+                if not candidatos:
+                    break
+                candidatos.intersection_update(posting)
+
+        return {curso_id for curso_id in candidatos if trecho in textos[curso_id]}
+
+    def _ocorrencias(self, termos):
+        """Mapeia curso_id -> posições iniciais das ocorrências dos termos"""
+        if not termos:
+            return {}
+
+        if len(termos) == 1:
+            return self.postings.get(termos[0], {})
+
+        postings = [self.postings.get(t) for t in termos]
+        if not all(postings):
+            return {}
+
+        # Interseção começando pelo posting mais curto
+        candidatos = set(min(postings, key=len))
+        for posting in postings:
+            candidatos.intersection_update(posting)
+
+        ocorrencias = {}
+        for curso_id in candidatos:
+            inicios = set(postings[0][curso_id])
+            for deslocamento, posting in enumerate(postings[1:], 1):
+                inicios &= {p - deslocamento for p in posting[curso_id]}
+                if not inicios:
+                    break
+            if inicios:
+                ocorrencias[curso_id] = sorted(inicios)
+
+        return ocorrencias
+
+    def _frequencia_ponderada(self, curso_id, posicoes):
+        """Frequência do termo somada por campo, com peso e normalização BM25F"""
+        inicios = self.inicio_campos[curso_id]
+        tamanhos = self.tamanho_campos[curso_id]
+
+        contagem = [0] * len(CAMPOS_BUSCA)
+        for posicao in posicoes:
+            contagem[bisect_right(inicios, posicao) - 1] += 1
+
+        tf = 0.0
+        for i, freq in enumerate(contagem):
+            if freq:
+                norma = 1 - BM25_B + BM25_B * tamanhos[i] / self.tamanho_medio[i]
+                tf += PESOS_CAMPOS[i] * freq / norma
+        return tf
+
+    def filtrar(self, area_interesse=None, habilidades=None):
+        """
+        Cursos que citam a área de interesse ou alguma das habilidades
+        (como substring, ver buscar_trecho), na ordem do snapshot
+        """
+        ids = set()
+
+        if area_interesse:
+            ids |= self.buscar_trecho(area_interesse)
+
+        for habilidade in habilidades or []:
+            ids |= self.buscar_trecho(habilidade)
+
+        return [self.cursos[i] for i in sorted(ids)]
+
+    def ranquear(self, area_interesse=None, habilidades=None, limite=10):
+        """
+        Os `limite` cursos mais relevantes para a área e as habilidades.
+
+        Só são pontuados os cursos presentes nos postings da consulta, e a
+        seleção usa um heap limitado a `limite` elementos. Empates mantêm
+        a ordem do snapshot.
+        """
+        consultas = []
+        if area_interesse:
+            consultas.append((area_interesse, PESO_AREA))
+        for habilidade in habilidades or []:
+            consultas.append((habilidade, 1.0))
+
+        n = self.total_cursos
+        scores = {}
+
+        for texto, peso in consultas:
+            ocorrencias = self._ocorrencias(tokenizar(texto))
+            if not ocorrencias:
+                continue
+
+            df = len(ocorrencias)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+            for curso_id, posicoes in ocorrencias.items():
+                tf = self._frequencia_ponderada(curso_id, posicoes)
+                score = peso * idf * tf * (BM25_K1 + 1) / (BM25_K1 + tf)
+                scores[curso_id] = scores.get(curso_id, 0.0) + score
+
+        melhores = heapq.nlargest(
+            limite, scores.items(), key=lambda item: (item[1], -item[0])
+        )
+        return [self.cursos[curso_id] for curso_id, _ in melhores]
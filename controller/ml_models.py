@@ -9,13 +9,26 @@ Este módulo implementa e treina modelos de ML para:
 Modelos implementados:
 - Classificação: Random Forest e Gradient Boosting
 - Regressão: Random Forest Regressor e Linear Regression
+
+Os ajustes finais e os folds da validação cruzada de cada etapa são
+tarefas independentes e rodam em paralelo (joblib, processos) com
+`n_jobs` workers (env TREINAMENTO_N_JOBS). Os folds são os mesmos do
+cross_val_score e cada tarefa usa o random_state do modelo, então os
+resultados não dependem do número de workers.
+
+Com `compactar` (env TREINAMENTO_COMPACTAR=1), linhas de treino com as
+mesmas features viram uma linha só, com a contagem como sample_weight:
+por classe na classificação e com o alvo médio na regressão. Os folds da
+validação cruzada continuam sendo sobre as linhas originais (só a parte
+de treino de cada fold é compactada) e a avaliação usa o teste completo.
 """
 
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.base import clone, is_classifier
+from sklearn.model_selection import train_test_split, check_cv
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.ensemble import RandomForestRegressor
@@ -23,24 +36,170 @@ from sklearn.linear_model import LinearRegression
 from sklearn.metrics import (
     accuracy_score, precision_score, recall_score, f1_score,
     confusion_matrix, classification_report,
-    mean_squared_error, mean_absolute_error, r2_score
+    mean_squared_error, mean_absolute_error, r2_score, get_scorer
 )
+import joblib
+from joblib import Parallel, delayed
 import pickle
 import os
 import json
+import time
+from contextlib import contextmanager
+
+from arvores_compactas import TOLERANCIA, salvar_arvores, suporta, verificar_equivalencia
+from data_generator import carregar_shards, ler_manifesto
+from tabela_predicoes import ARQUIVO_TABELA, construir_grade, salvar_tabela
+
+N_JOBS = int(os.getenv('TREINAMENTO_N_JOBS', '-1'))
+FOLDS_CV = 5
+COMPACTAR = os.getenv('TREINAMENTO_COMPACTAR', '0') == '1'
+# Linhas lidas de um dataset em shards (amostra uniforme; 0 = todas)
+MAX_LINHAS = int(os.getenv('TREINAMENTO_MAX_LINHAS', '5000000'))
+
+# Colunas do dataset usadas no treinamento
+COLUNAS_CATEGORICAS = ['profissao_atual', 'nivel_atual', 'objetivo_principal', 'area_interesse']
+COLUNAS_NUMERICAS = ['anos_experiencia', 'tempo_disponivel_estudo', 'num_habilidades', 'motivacao', 'score_adequacao']
+COLUNAS_TREINO = COLUNAS_CATEGORICAS + COLUNAS_NUMERICAS
+
+
+def _memoria_processo():
+    """RSS atual e pico de RSS (VmHWM) do processo, em MB (Linux; None se indisponível)"""
+    memoria = {'VmRSS': None, 'VmHWM': None}
+    try:
+        with open('/proc/self/status') as f:
+            for linha in f:
+                campo, _, valor = linha.partition(':')
+                if campo in memoria:
+                    memoria[campo] = int(valor.split()[0]) / 1024
+    except OSError:
+        pass
+    return memoria['VmRSS'], memoria['VmHWM']
+
+
+def _zerar_pico_memoria():
+    """Reinicia o pico de RSS do processo no valor atual; False se não der (fora do Linux)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def otimizar_tipos(df):
+    """
+    Texto vira categórica (categorias em ordem alfabética, como as classes
+    do LabelEncoder) e inteiros são reduzidos ao menor tipo que os comporta.
+    Altera e devolve o próprio DataFrame.
+    """
+    for coluna in df.columns:
+        serie = df[coluna]
+        if coluna in COLUNAS_CATEGORICAS or pd.api.types.is_string_dtype(serie.dtype):
+            if not isinstance(serie.dtype, pd.CategoricalDtype):
+                serie = serie.astype('category')
+            serie = serie.cat.remove_unused_categories()
+            categorias = sorted(serie.cat.categories)
+            if list(serie.cat.categories) != categorias:
+                serie = serie.cat.reorder_categories(categorias)
+            df[coluna] = serie
+        elif pd.api.types.is_integer_dtype(serie.dtype):
+            df[coluna] = pd.to_numeric(serie, downcast='integer')
+    return df
+
+
+def _ajustar(modelo, X, y, pesos=None):
+    """Ajusta o modelo; retorna (modelo ajustado, segundos)"""
+    inicio = time.perf_counter()
+    if pesos is None:
+        modelo.fit(X, y)
+    else:
+        modelo.fit(X, y, sample_weight=pesos)
+    return modelo, time.perf_counter() - inicio
+
+
+def _linhas(dados, indices):
+    """Linhas de um DataFrame/Series (por posição) ou de um np.ndarray"""
+    if isinstance(dados, (pd.DataFrame, pd.Series)):
+        return dados.iloc[indices]
+    return np.take(dados, indices, axis=0)
+
+
+def _pontuar_fold(modelo, X, y, treino, teste, scoring, por_classe=None):
+    """
+    Um fold da validação cruzada; retorna (score, segundos)
+    
+    Com `por_classe` (True/False), a parte de treino do fold é compactada
+    antes do ajuste (ver compactar_linhas); o teste do fold fica completo.
+    """
+    inicio = time.perf_counter()
+    X_treino, y_treino = _linhas(X, treino), _linhas(y, treino)
+    pesos = None
+    if por_classe is not None:
+        X_treino, y_treino, pesos = compactar_linhas(X_treino, y_treino, por_classe)
+    modelo = _ajustar(clone(modelo), X_treino, y_treino, pesos)[0]
+    score = get_scorer(scoring)(modelo, _linhas(X, teste), _linhas(y, teste))
+    return score, time.perf_counter() - inicio
+
+
+def compactar_linhas(X, y, por_classe):
+    """
+    Junta linhas com as mesmas features, com a contagem como peso
+    
+    Args:
+        X (pd.DataFrame | np.ndarray): Features
+        y (pd.Series | np.ndarray): Alvo
+        por_classe (bool): True na classificação (uma linha por features +
+            classe); False na regressão (uma linha por features, com o
+            alvo médio)
+    
+    Returns:
+        tuple: (X, y, pesos) compactados, nos tipos recebidos; pesos em float64
+    """
+    matriz = not isinstance(X, pd.DataFrame)
+    if matriz:
+        X = pd.DataFrame(X)
+    if not isinstance(y, pd.Series):
+        y = pd.Series(y)
+    
+    colunas = list(X.columns)
+    dados = X.assign(_alvo=y.to_numpy())
+    if por_classe:
+        grupos = dados.groupby(colunas + ['_alvo'], sort=True).size().reset_index(name='_peso')
+    else:
+        grupos = dados.groupby(colunas, sort=True)['_alvo'].agg(['mean', 'size'])
+        grupos = grupos.rename(columns={'mean': '_alvo', 'size': '_peso'}).reset_index()
+    
+    X_compacto = grupos[colunas].astype(X.dtypes.to_dict())
+    y_compacto = grupos['_alvo'].astype(y.dtype if por_classe else np.float64)
+    y_compacto.name = y.name
+    pesos = grupos['_peso'].to_numpy(dtype=np.float64)
+    if matriz:
+        return X_compacto.to_numpy(), y_compacto.to_numpy(), pesos
+    return X_compacto, y_compacto, pesos
 
 
 class MLModels:
     """Classe para treinamento e avaliação de modelos de Machine Learning"""
     
-    def __init__(self, dataset_path='data/dataset_profissionais.csv'):
+    def __init__(self, dataset_path='data/dataset_profissionais.csv', n_jobs=N_JOBS, compactar=COMPACTAR,
+                 max_linhas=MAX_LINHAS):
         """
         Inicializa a classe com o dataset
         
         Args:
-            dataset_path (str): Caminho para o dataset CSV
+            dataset_path (str): Caminho para o dataset CSV ou para o
+                manifesto (.json) de um dataset em shards
+            n_jobs (int): Workers do treinamento (-1 = todos os núcleos,
+                1 = serial)
+            compactar (bool): Treina com as linhas repetidas agrupadas e
+                ponderadas (ver compactar_linhas)
+            max_linhas (int): Máximo de linhas lidas de um dataset em
+                shards (0 = todas)
         """
         self.dataset_path = dataset_path
+        self.n_jobs = n_jobs
+        self.compactar = compactar
+        self.max_linhas = max_linhas
         self.df = None
         self.label_encoders = {}
         self.scaler = StandardScaler()
@@ -54,71 +213,137 @@ class MLModels:
             'classificacao': {},
             'regressao': {}
         }
+        
+        # Tempo de parede x soma das tarefas, por etapa de treinamento
+        self.tempos_treinamento = {}
+        
+        # Tempo e pico de memória das etapas de carga e preprocessamento
+        self.metricas_etapas = {}
+        
+        # Linhas de treino antes/depois da compactação, por etapa
+        self.compactacao = {}
     
-    def carregar_dados(self):
-        """Carrega o dataset do arquivo CSV"""
+    @contextmanager
+    def _medir_etapa(self, etapa):
+        """
+        Mede o tempo e o pico de memória de uma etapa
+        
+        O pico é o do RSS do processo (zerado no início da etapa), então
+        inclui buffers nativos do pandas/pyarrow e não atrasa a etapa como
+        o tracemalloc. `pico_mb` é o quanto o pico passou do RSS inicial.
+        """
+        medir = _zerar_pico_memoria()
+        rss_inicial, _ = _memoria_processo()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            tempo = time.perf_counter() - inicio
+            _, pico = _memoria_processo()
+            metricas = {'tempo_s': round(tempo, 3), 'pico_mb': None, 'rss_pico_mb': None}
+            if medir and pico is not None:
+                metricas['pico_mb'] = round(pico - rss_inicial, 1)
+                metricas['rss_pico_mb'] = round(pico, 1)
+            self.metricas_etapas[etapa] = metricas
+            
+            memoria = (f", pico +{metricas['pico_mb']:,.1f} MB (RSS {metricas['rss_pico_mb']:,.0f} MB)"
+                       if metricas['pico_mb'] is not None else "")
+            print(f"   ⏱️  {etapa}: {tempo:.2f}s{memoria}")
+    
+    def carregar_dados(self, colunas=COLUNAS_TREINO):
+        """
+        Carrega o dataset com tipos compactos (ver otimizar_tipos)
+        
+        Aceita CSV, Parquet, Feather ou o manifesto (.json) dos shards
+        gerados por DataGenerator.gerar_shards; nos shards, os tipos são
+        reduzidos shard a shard. O treinamento precisa das linhas em
+        memória, então de um dataset em shards maior que `max_linhas` só
+        é carregada uma amostra uniforme desse tamanho.
+        
+        Args:
+            colunas (list): Colunas a carregar (padrão: as do treinamento;
+                None = todas)
+        """
         print("📂 Carregando dataset...")
-        self.df = pd.read_csv(self.dataset_path)
-        print(f"✅ Dataset carregado: {self.df.shape}")
+        with self._medir_etapa('carregar'):
+            if self.dataset_path.endswith('.json'):
+                self.df = carregar_shards(
+                    self.dataset_path, colunas, transformar=otimizar_tipos,
+                    max_linhas=self.max_linhas or None
+                )
+                total = sum(shard['linhas'] for shard in ler_manifesto(self.dataset_path)['shards'])
+                if len(self.df) < total:
+                    print(f"⚠️  Amostra de {len(self.df):,} das {total:,} linhas dos shards "
+                          f"(TREINAMENTO_MAX_LINHAS)")
+            elif self.dataset_path.endswith('.parquet'):
+                self.df = pd.read_parquet(self.dataset_path, columns=colunas)
+            elif self.dataset_path.endswith('.feather'):
+                self.df = pd.read_feather(self.dataset_path, columns=colunas)
+            else:
+                categoricas = [c for c in COLUNAS_CATEGORICAS if colunas is None or c in colunas]
+                self.df = pd.read_csv(
+                    self.dataset_path, usecols=colunas,
+                    dtype={c: 'category' for c in categoricas}
+                )
+            otimizar_tipos(self.df)
+        
+        memoria_mb = self.df.memory_usage(deep=True).sum() / 1024 ** 2
+        print(f"✅ Dataset carregado: {self.df.shape} ({memoria_mb:,.1f} MB)")
         print(f"\n📊 Primeiras linhas:\n{self.df.head()}")
         return self.df
     
     def preprocessar_dados(self):
         """
         Preprocessa os dados para ML:
-        - Codifica variáveis categóricas
+        - Codifica variáveis categóricas (códigos das categorias, sem
+          copiar o DataFrame)
         - Separa features e target
-        - Divide em treino e teste
+        - Divide em treino e teste com um único índice, estratificado pela
+          área, usado na classificação e na regressão
         """
         print("\n🔧 Preprocessando dados...")
         
-        # Criar cópia do dataframe
-        df_processed = self.df.copy()
-        
-        # Codificar variáveis categóricas
+        # Codificar variáveis categóricas e a área de interesse (target
+        # para classificação)
         categoricas = ['profissao_atual', 'nivel_atual', 'objetivo_principal']
         
-        for col in categoricas:
-            le = LabelEncoder()
-            df_processed[col + '_encoded'] = le.fit_transform(df_processed[col])
-            self.label_encoders[col] = le
-        
-        # Codificar a área de interesse (target para classificação)
-        le_target = LabelEncoder()
-        df_processed['area_interesse_encoded'] = le_target.fit_transform(df_processed['area_interesse'])
-        self.label_encoders['area_interesse'] = le_target
-        
-        # Features para os modelos
-        feature_cols = [
-            'profissao_atual_encoded',
-            'anos_experiencia',
-            'nivel_atual_encoded',
-            'objetivo_principal_encoded',
-            'tempo_disponivel_estudo',
-            'num_habilidades',
-            'motivacao'
-        ]
-        
-        X = df_processed[feature_cols]
-        
-        # Target para classificação (área de interesse)
-        y_clf = df_processed['area_interesse_encoded']
-        
-        # Target para regressão (score de adequação)
-        y_reg = df_processed['score_adequacao']
-        
-        # Dividir em treino e teste (80/20)
-        X_train_clf, X_test_clf, y_train_clf, y_test_clf = train_test_split(
-            X, y_clf, test_size=0.2, random_state=42, stratify=y_clf
-        )
-        
-        X_train_reg, X_test_reg, y_train_reg, y_test_reg = train_test_split(
-            X, y_reg, test_size=0.2, random_state=42
-        )
+        with self._medir_etapa('codificar'):
+            codigos = {col: self._codificar(col) for col in categoricas + ['area_interesse']}
+            
+            # Features para os modelos
+            X = pd.DataFrame({
+                'profissao_atual_encoded': codigos['profissao_atual'],
+                'anos_experiencia': self.df['anos_experiencia'],
+                'nivel_atual_encoded': codigos['nivel_atual'],
+                'objetivo_principal_encoded': codigos['objetivo_principal'],
+                'tempo_disponivel_estudo': self.df['tempo_disponivel_estudo'],
+                'num_habilidades': self.df['num_habilidades'],
+                'motivacao': self.df['motivacao']
+            })
+            feature_cols = list(X.columns)
+            
+            # Target para classificação (área de interesse)
+            y_clf = codigos['area_interesse']
+            
+            # Target para regressão (score de adequação)
+            y_reg = self.df['score_adequacao']
+        
+        # Dividir em treino e teste (80/20): um só índice para os dois problemas
+        with self._medir_etapa('dividir'):
+            treino, teste = train_test_split(
+                np.arange(len(X)), test_size=0.2, random_state=42, stratify=y_clf
+            )
+            X_train, X_test = X.iloc[treino], X.iloc[teste]
+            y_train_clf, y_test_clf = y_clf.iloc[treino], y_clf.iloc[teste]
+            y_train_reg, y_test_reg = y_reg.iloc[treino], y_reg.iloc[teste]
         
         # Escalonar features para modelos lineares
-        X_train_reg_scaled = self.scaler.fit_transform(X_train_reg)
-        X_test_reg_scaled = self.scaler.transform(X_test_reg)
+        with self._medir_etapa('escalonar'):
+            X_train_reg_scaled = self.scaler.fit_transform(X_train)
+            X_test_reg_scaled = self.scaler.transform(X_test)
+        
+        X_train_clf = X_train_reg = X_train
+        X_test_clf = X_test_reg = X_test
         
         print(f"✅ Dados preprocessados")
         print(f"   - Features: {feature_cols}")
@@ -141,6 +366,102 @@ class MLModels:
             'feature_cols': feature_cols
         }
     
+    def _treinar_em_paralelo(self, etapa, modelos, por_classe):
+        """
+        Ajusta os modelos e roda os folds da validação cruzada de todos
+        eles como uma única leva de tarefas paralelas
+        
+        Args:
+            etapa (str): Nome da etapa (chave em tempos_treinamento)
+            modelos (dict): nome -> (modelo, X_train, y_train, scoring)
+            por_classe (bool): Como compactar o treino, se self.compactar
+                (True na classificação, False na regressão)
+        
+        Returns:
+            dict: nome -> (modelo ajustado, np.array com os scores da CV)
+        """
+        compactar = por_classe if self.compactar else None
+        
+        tarefas = []
+        compactados = {}  # id(X) -> treino compactado, para modelos com o mesmo X
+        n_jobs_modelos = {}  # nome -> n_jobs original dos modelos com paralelismo próprio
+        for nome, (modelo, X, y, scoring) in modelos.items():
+            if self.n_jobs != 1 and 'n_jobs' in modelo.get_params():
+                # Cada tarefa já ocupa um worker: o Random Forest dentro dela
+                # roda serial para não criar núcleos x núcleos threads
+                n_jobs_modelos[nome] = modelo.get_params()['n_jobs']
+                modelo = clone(modelo).set_params(n_jobs=1)
+            X_fit, y_fit, pesos = X, y, None
+            if compactar is not None:
+                if id(X) not in compactados:
+                    compactados[id(X)] = self._compactar(etapa, X, y, compactar)
+                X_fit, y_fit, pesos = compactados[id(X)]
+            tarefas.append((nome, delayed(_ajustar)(modelo, X_fit, y_fit, pesos)))
+            
+            cv = check_cv(FOLDS_CV, y, classifier=is_classifier(modelo))
+            for treino, teste in cv.split(X, y):
+                tarefas.append((nome, delayed(_pontuar_fold)(modelo, X, y, treino, teste, scoring, compactar)))
+        
+        inicio = time.perf_counter()
+        saidas = Parallel(n_jobs=self.n_jobs)(tarefa for _, tarefa in tarefas)
+        parede = time.perf_counter() - inicio
+        
+        ajustados = {}
+        scores = {nome: [] for nome in modelos}
+        for (nome, _), (saida, _) in zip(tarefas, saidas):
+            if nome in ajustados:
+                scores[nome].append(saida)
+            else:
+                ajustados[nome] = saida  # a primeira tarefa de cada modelo é o ajuste final
+        for nome, n_jobs in n_jobs_modelos.items():
+            ajustados[nome].set_params(n_jobs=n_jobs)  # predições fora do treino usam o original
+        
+        serial = sum(duracao for _, duracao in saidas)
+        self.tempos_treinamento[etapa] = {
+            'tarefas': len(tarefas),
+            'n_jobs': self.n_jobs,
+            'tempo_s': round(parede, 3),
+            'soma_tarefas_s': round(serial, 3),
+            'speedup': round(serial / parede, 2) if parede else None
+        }
+        print(f"   ⏱️  {len(tarefas)} tarefas em {parede:.2f}s "
+              f"(serial {serial:.2f}s, speedup {serial / parede:.2f}x, n_jobs={self.n_jobs})")
+        
+        return {nome: (ajustados[nome], np.array(scores[nome])) for nome in modelos}
+    
+    def _compactar(self, etapa, X, y, por_classe):
+        """compactar_linhas + registro da razão de compactação da etapa"""
+        inicio = time.perf_counter()
+        X_compacto, y_compacto, pesos = compactar_linhas(X, y, por_classe)
+        tempo = time.perf_counter() - inicio
+        
+        # Etapas com mais de uma matriz de features (regressão) somam o tempo
+        anterior = self.compactacao.get(etapa, {}).get('tempo_s', 0)
+        self.compactacao[etapa] = {
+            'linhas': len(X),
+            'linhas_unicas': len(X_compacto),
+            'razao': round(len(X) / max(len(X_compacto), 1), 2),
+            'tempo_s': round(anterior + tempo, 3)
+        }
+        print(f"   🗜️  {len(X):,} linhas de treino -> {len(X_compacto):,} únicas "
+              f"({self.compactacao[etapa]['razao']}x)")
+        return X_compacto, y_compacto, pesos
+    
+    def _codificar(self, coluna):
+        """
+        Códigos da coluna categórica (iguais aos do LabelEncoder, pois as
+        categorias estão em ordem alfabética) e o encoder equivalente,
+        guardado para o MLPredictor
+        """
+        serie = self.df[coluna]
+        if not isinstance(serie.dtype, pd.CategoricalDtype):
+            serie = otimizar_tipos(serie.to_frame())[coluna]
+        
+        encoder = LabelEncoder()
+        encoder.classes_ = np.asarray(serie.cat.categories, dtype=object)
+        self.label_encoders[coluna] = encoder
+        return serie.cat.codes
+    
     def treinar_modelos_classificacao(self, dados):
         """
         Treina modelos de classificação
@@ -158,19 +479,30 @@ class MLModels:
         y_train = dados['y_train_clf']
         y_test = dados['y_test_clf']
         
-        # 1. Random Forest Classifier
-        print("\n📊 Modelo 1: Random Forest Classifier")
         rf_clf = RandomForestClassifier(
             n_estimators=100,
             max_depth=10,
             random_state=42,
             n_jobs=-1
         )
-        rf_clf.fit(X_train, y_train)
-        y_pred_rf = rf_clf.predict(X_test)
+        gb_clf = GradientBoostingClassifier(
+            n_estimators=100,
+            max_depth=5,
+            random_state=42
+        )
         
-        # Validação cruzada
-        cv_scores_rf = cross_val_score(rf_clf, X_train, y_train, cv=5, scoring='accuracy')
+        # Ajustes finais + validação cruzada (5 folds) em paralelo; no modo
+        # compactado, uma linha por features + classe
+        print("\n⚙️  Ajustando modelos e validação cruzada em paralelo...")
+        treinados = self._treinar_em_paralelo('classificacao', {
+            'RandomForest': (rf_clf, X_train, y_train, 'accuracy'),
+            'GradientBoosting': (gb_clf, X_train, y_train, 'accuracy')
+        }, por_classe=True)
+        
+        # 1. Random Forest Classifier
+        print("\n📊 Modelo 1: Random Forest Classifier")
+        rf_clf, cv_scores_rf = treinados['RandomForest']
+        y_pred_rf = rf_clf.predict(X_test)
         
         # Métricas
         acc_rf = accuracy_score(y_test, y_pred_rf)
@@ -200,17 +532,9 @@ class MLModels:
         
         # 2. Gradient Boosting Classifier
         print("\n📊 Modelo 2: Gradient Boosting Classifier")
-        gb_clf = GradientBoostingClassifier(
-            n_estimators=100,
-            max_depth=5,
-            random_state=42
-        )
-        gb_clf.fit(X_train, y_train)
+        gb_clf, cv_scores_gb = treinados['GradientBoosting']
         y_pred_gb = gb_clf.predict(X_test)
         
-        # Validação cruzada
-        cv_scores_gb = cross_val_score(gb_clf, X_train, y_train, cv=5, scoring='accuracy')
-        
         # Métricas
         acc_gb = accuracy_score(y_test, y_pred_gb)
         prec_gb = precision_score(y_test, y_pred_gb, average='weighted')
@@ -266,19 +590,26 @@ class MLModels:
         y_train = dados['y_train_reg']
         y_test = dados['y_test_reg']
         
-        # 1. Random Forest Regressor
-        print("\n📊 Modelo 1: Random Forest Regressor")
         rf_reg = RandomForestRegressor(
             n_estimators=100,
             max_depth=10,
             random_state=42,
             n_jobs=-1
         )
-        rf_reg.fit(X_train, y_train)
-        y_pred_rf = rf_reg.predict(X_test)
         
-        # Validação cruzada
-        cv_scores_rf = cross_val_score(rf_reg, X_train, y_train, cv=5, scoring='r2')
+        # Ajustes finais + validação cruzada (5 folds) em paralelo;
+        # a regressão linear usa as features escalonadas. No modo
+        # compactado, uma linha por features, com o score médio
+        print("\n⚙️  Ajustando modelos e validação cruzada em paralelo...")
+        treinados = self._treinar_em_paralelo('regressao', {
+            'RandomForest': (rf_reg, X_train, y_train, 'r2'),
+            'LinearRegression': (LinearRegression(), X_train_scaled, y_train, 'r2')
+        }, por_classe=False)
+        
+        # 1. Random Forest Regressor
+        print("\n📊 Modelo 1: Random Forest Regressor")
+        rf_reg, cv_scores_rf = treinados['RandomForest']
+        y_pred_rf = rf_reg.predict(X_test)
         
         # Métricas
         rmse_rf = np.sqrt(mean_squared_error(y_test, y_pred_rf))
@@ -304,19 +635,9 @@ class MLModels:
         
         # 2. Linear Regression
         print("\n📊 Modelo 2: Linear Regression")
-        lr_reg = LinearRegression()
-        lr_reg.fit(X_train_scaled, y_train)
+        lr_reg, cv_scores_lr = treinados['LinearRegression']
         y_pred_lr = lr_reg.predict(X_test_scaled)
         
-        # Validação cruzada
-        cv_scores_lr = cross_val_score(
-            LinearRegression(), 
-            X_train_scaled, 
-            y_train, 
-            cv=5, 
-            scoring='r2'
-        )
-        
         # Métricas
         rmse_lr = np.sqrt(mean_squared_error(y_test, y_pred_lr))
         mae_lr = mean_absolute_error(y_test, y_pred_lr)
@@ -342,22 +663,29 @@ class MLModels:
         print("\n✅ Modelos de regressão treinados com sucesso!")
     
     def salvar_modelos(self, output_dir='models'):
-        """Salva os modelos treinados em arquivos pickle"""
-        os.makedirs(output_dir, exist_ok=True)
+        """
+        Salva os modelos treinados em arquivos joblib
         
-        # Salvar modelos de classificação
-        for nome, modelo in self.clf_models.items():
-            caminho = os.path.join(output_dir, f'clf_{nome}.pkl')
-            with open(caminho, 'wb') as f:
-                pickle.dump(modelo, f)
-            print(f"✅ Modelo salvo: {caminho}")
+        O .joblib é gravado sem compressão para que o MLPredictor possa
+        abri-lo com mmap_mode (arrays numpy lidos direto do arquivo). Um
+        .pkl de treinamentos antigos é apagado para não ficar defasado. Os
+        ensembles de árvores também são achatados em <modelo>.arvores/,
+        arrays .npy que os workers mapeiam em memória e compartilham.
+        """
+        os.makedirs(output_dir, exist_ok=True)
         
-        # Salvar modelos de regressão
-        for nome, modelo in self.reg_models.items():
-            caminho = os.path.join(output_dir, f'reg_{nome}.pkl')
-            with open(caminho, 'wb') as f:
-                pickle.dump(modelo, f)
-            print(f"✅ Modelo salvo: {caminho}")
+        # Salvar modelos de classificação e regressão
+        modelos = [('clf', self.clf_models), ('reg', self.reg_models)]
+        for prefixo, dicionario in modelos:
+            for nome, modelo in dicionario.items():
+                caminho = os.path.join(output_dir, f'{prefixo}_{nome}.joblib')
+                joblib.dump(modelo, caminho)
+                legado = os.path.join(output_dir, f'{prefixo}_{nome}.pkl')
+                if os.path.exists(legado):
+                    os.remove(legado)
+                if suporta(modelo):
+                    salvar_arvores(modelo, os.path.join(output_dir, f'{prefixo}_{nome}.arvores'))
+                print(f"✅ Modelo salvo: {caminho}")
         
         # Salvar label encoders e scaler
         with open(os.path.join(output_dir, 'label_encoders.pkl'), 'wb') as f:
@@ -372,6 +700,62 @@ class MLModels:
         
         print(f"\n✅ Todos os modelos e artefatos salvos em: {output_dir}")
     
+    def verificar_motor_compilado(self, dados):
+        """
+        Confere se o motor de árvores compiladas reproduz o sklearn nos dados
+        de teste (probabilidades na classificação, scores na regressão)
+        
+        Returns:
+            dict: Maior diferença absoluta por modelo
+        """
+        print("\n🔬 Verificando motor de árvores compiladas...")
+        
+        conjuntos = [
+            ('clf', self.clf_models, dados['X_test_clf']),
+            ('reg', self.reg_models, dados['X_test_reg'])
+        ]
+        diferencas = {}
+        
+        for prefixo, modelos, X_test in conjuntos:
+            for nome, modelo in modelos.items():
+                if not suporta(modelo):
+                    continue
+                diferenca = verificar_equivalencia(modelo, X_test.to_numpy())
+                diferencas[f'{prefixo}_{nome}'] = diferenca
+                status = "✓" if diferenca <= TOLERANCIA else "❌"
+                print(f"   {status} {prefixo}_{nome}: diferença máxima {diferenca:.2e}")
+        
+        return diferencas
+    
+    def gerar_tabela_predicoes(self, output_dir='models'):
+        """
+        Pontua toda a grade de entradas possíveis do preditor com todos os
+        modelos e salva o resultado como tabela de consulta (.npz)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        
+        eixos, X = construir_grade(self.label_encoders)
+        print(f"\n🧮 Pontuando {len(X)} pontos da grade de entradas...")
+        
+        saidas_clf = {
+            nome: (modelo.classes_, modelo.predict_proba(X))
+            for nome, modelo in self.clf_models.items()
+        }
+        
+        # Mesmo caminho do MLPredictor: regressores recebem as features escalonadas
+        X_scaled = self.scaler.transform(X)
+        saidas_reg = {
+            nome: np.clip(modelo.predict(X_scaled), 0, 100)
+            for nome, modelo in self.reg_models.items()
+        }
+        
+        caminho = salvar_tabela(
+            os.path.join(output_dir, ARQUIVO_TABELA), eixos, saidas_clf, saidas_reg
+        )
+        tamanho_kb = os.path.getsize(caminho) / 1024
+        print(f"✅ Tabela de predições salva: {caminho} ({tamanho_kb:.0f} KB)")
+        return caminho
+    
     def gerar_visualizacoes(self, output_dir='visualizations'):
         """Gera visualizações dos resultados dos modelos"""
         os.makedirs(output_dir, exist_ok=True)
@@ -488,9 +872,15 @@ def main():
     # Treinar modelos de regressão
     ml.treinar_modelos_regressao(dados)
     
+    # Conferir o motor de árvores compiladas contra o sklearn
+    ml.verificar_motor_compilado(dados)
+    
     # Salvar modelos
     ml.salvar_modelos('models')
     
+    # Tabela de predições pré-computadas
+    ml.gerar_tabela_predicoes('models')
+    
     # Gerar visualizações
     ml.gerar_visualizacoes('visualizations')
     
@@ -2,19 +2,161 @@
 Módulo de Predição ML ajustado com paths absolutos e tratamento seguro
 """
 
+import copy
+import gzip
+import hashlib
 import pickle
 import os
+import threading
+import time
+from collections.abc import Mapping
+import joblib
 import numpy as np
 import json
 
+from arvores_compactas import ArvoresCompactas, suporta
+from cache_lru import CacheLRU
+from tabela_predicoes import ARQUIVO_TABELA, TabelaPredicoes
+
+
+def _memoria_residente():
+    """Memória residente (RSS) do processo em bytes, ou None fora do Linux"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ModelosSobDemanda(Mapping):
+    """
+    Dicionário de modelos que só lê cada artefato no primeiro acesso
+
+    Lê o formato .joblib (arrays numpy mapeados em memória, sem
+    desserializar os dados); o .pkl só é lido quando não há .joblib, em
+    pastas de modelos de versões antigas do treinamento. Com o
+    motor "mmap", ensembles de árvores são abertos a partir dos arrays
+    em <modelo>.arvores/, compartilhados entre processos; com o motor
+    "compilado", são convertidos em ArvoresCompactas logo após a leitura.
+    """
+
+    def __init__(self, models_dir, prefixo, nomes, motor="sklearn"):
+        self.motor = motor
+        extensoes = (".joblib", ".pkl")
+        if motor == "mmap":
+            extensoes = (".arvores",) + extensoes
+
+        self._caminhos = {}
+        for nome in nomes:
+            for extensao in extensoes:
+                caminho = os.path.join(models_dir, f"{prefixo}_{nome}{extensao}")
+                if os.path.exists(caminho):
+                    self._caminhos[nome] = caminho
+                    break
+
+        self._modelos = {}
+        self.relatorio = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, nome):
+        modelo = self._modelos.get(nome)
+        if modelo is not None:
+            return modelo
+
+        caminho = self._caminhos[nome]
+        with self._lock:
+            if nome not in self._modelos:
+                self._modelos[nome] = self._carregar(nome, caminho)
+        return self._modelos[nome]
+
+    def _carregar(self, nome, caminho):
+        memoria_antes = _memoria_residente()
+        inicio = time.perf_counter()
+
+        if caminho.endswith(".arvores"):
+            modelo = ArvoresCompactas.carregar(caminho, mmap_mode="r")
+        elif caminho.endswith(".joblib"):
+            modelo = joblib.load(caminho, mmap_mode="r")
+        else:
+            # Legado: modelos salvos em .pkl antes do formato joblib
+            with open(caminho, "rb") as f:
+                modelo = pickle.load(f)
+
+        if self.motor == "compilado" and suporta(modelo):
+            modelo = ArvoresCompactas.de_modelo(modelo)
+
+        tempo_ms = (time.perf_counter() - inicio) * 1000
+        memoria_depois = _memoria_residente()
+
+        if os.path.isdir(caminho):
+            tamanho = sum(
+                os.path.getsize(os.path.join(caminho, arquivo))
+                for arquivo in os.listdir(caminho)
+            )
+        else:
+            tamanho = os.path.getsize(caminho)
+
+        self.relatorio[nome] = {
+            "arquivo": os.path.basename(caminho),
+            "tamanho_arquivo_kb": tamanho / 1024,
+            "tempo_carregamento_ms": tempo_ms,
+            "memoria_residente_kb": (
+                (memoria_depois - memoria_antes) / 1024
+                if memoria_antes is not None else None
+            )
+        }
+        print(f"   ✓ {nome} carregado de {os.path.basename(caminho)} em {tempo_ms:.0f}ms")
+        return modelo
+
+    def __iter__(self):
+        return iter(self._caminhos)
+
+    def __len__(self):
+        return len(self._caminhos)
+
+    def carregados(self):
+        return list(self._modelos)
+
 
 class MLPredictor:
     """Classe para fazer predições usando os modelos treinados"""
 
-    def __init__(self, models_dir=None):
+    MODOS = ("modelos", "tabela")
+    MOTORES = ("sklearn", "compilado", "mmap")
+
+    def __init__(self, models_dir=None, cache_tamanho=None, cache_ttl=None, modo=None,
+                 motor=None):
+        """
+        Args:
+            models_dir (str): Pasta com os artefatos (padrão: models/)
+            cache_tamanho (int): Entradas do cache de predições (0 desativa)
+            cache_ttl (float): Validade das entradas do cache, em segundos
+            modo (str): "modelos" executa os modelos a cada predição;
+                "tabela" responde pela tabela pré-computada e só usa os
+                modelos para entradas fora da grade
+            motor (str): "sklearn" usa os estimadores desserializados;
+                "compilado" converte os ensembles em arrays planos e os
+                avalia com o motor vetorizado de arvores_compactas;
+                "mmap" usa o mesmo motor direto dos arrays mapeados em
+                memória (compartilhados entre workers)
+        """
         self.BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.models_dir = models_dir if models_dir else os.path.join(self.BASE_DIR, "models")
 
+        self.modo = modo or os.getenv("PREDICAO_MODO", "modelos")
+        if self.modo not in self.MODOS:
+            raise ValueError(f"Modo de predição inválido: {self.modo} (use {', '.join(self.MODOS)})")
+
+        self.motor = motor or os.getenv("PREDICAO_MOTOR", "sklearn")
+        if self.motor not in self.MOTORES:
+            raise ValueError(f"Motor de predição inválido: {self.motor} (use {', '.join(self.MOTORES)})")
+
+        # Cache de predições por vetor de features (0 desativa)
+        if cache_tamanho is None:
+            cache_tamanho = int(os.getenv("PREDICAO_CACHE_TAMANHO", "4096"))
+        if cache_ttl is None and os.getenv("PREDICAO_CACHE_TTL"):
+            cache_ttl = float(os.getenv("PREDICAO_CACHE_TTL"))
+        self.cache = CacheLRU(cache_tamanho, cache_ttl)
 
         # Estruturas internas
         self.clf_models = {}
@@ -22,27 +164,51 @@ class MLPredictor:
         self.label_encoders = {}
         self.scaler = None
         self.resultados_treinamento = {}
+        self.resultados_serializados = None
+        self.versao_modelos = None
+        self.tabela = None
+
+        self._carregar_modelos()
 
+    def recarregar_modelos(self):
+        """Relê os artefatos de models/ e invalida o cache de predições"""
+        self.clf_models = {}
+        self.reg_models = {}
+        self.label_encoders = {}
+        self.scaler = None
+        self.resultados_treinamento = {}
+        self.resultados_serializados = None
+        self.tabela = None
         self._carregar_modelos()
+        self.cache.limpar()
+
+    def _calcular_versao(self):
+        """Identifica a versão dos modelos pelo nome, tamanho e data dos artefatos"""
+        assinatura = hashlib.sha1()
+        for arquivo in sorted(os.listdir(self.models_dir)):
+            if arquivo.endswith((".pkl", ".joblib", ".json", ".npz")):
+                info = os.stat(os.path.join(self.models_dir, arquivo))
+                assinatura.update(f"{arquivo}:{info.st_size}:{info.st_mtime_ns};".encode())
+        return assinatura.hexdigest()[:12]
 
     def _carregar_modelos(self):
         print("📂 Carregando modelos treinados...")
 
-        # Carregar classificação
-        for nome in ["RandomForest", "GradientBoosting"]:
-            path = os.path.join(self.models_dir, f"clf_{nome}.pkl")
-            if os.path.exists(path):
-                with open(path, "rb") as f:
-                    self.clf_models[nome] = pickle.load(f)
-                print(f"   ✓ {nome} (Classificação)")
-
-        # Carregar regressão
-        for nome in ["RandomForest", "LinearRegression"]:
-            path = os.path.join(self.models_dir, f"reg_{nome}.pkl")
-            if os.path.exists(path):
-                with open(path, "rb") as f:
-                    self.reg_models[nome] = pickle.load(f)
-                print(f"   ✓ {nome} (Regressão)")
+        if os.path.isdir(self.models_dir):
+            self.versao_modelos = self._calcular_versao()
+
+        # Classificação e regressão: cada modelo é lido no primeiro uso
+        self.clf_models = ModelosSobDemanda(
+            self.models_dir, "clf", ["RandomForest", "GradientBoosting"], self.motor
+        )
+        for nome in self.clf_models:
+            print(f"   ✓ {nome} (Classificação, sob demanda)")
+
+        self.reg_models = ModelosSobDemanda(
+            self.models_dir, "reg", ["RandomForest", "LinearRegression"], self.motor
+        )
+        for nome in self.reg_models:
+            print(f"   ✓ {nome} (Regressão, sob demanda)")
 
         # Carregar encoders
         enc_path = os.path.join(self.models_dir, "label_encoders.pkl")
@@ -63,21 +229,53 @@ class MLPredictor:
         if os.path.exists(resultados_path):
             with open(resultados_path, "r", encoding="utf-8") as f:
                 self.resultados_treinamento = json.load(f)
+            self.resultados_serializados = self._serializar_resultados(resultados_path)
             print("   ✓ Resultados de Treinamento")
 
+        # Carregar tabela de predições (modo "tabela")
+        if self.modo == "tabela":
+            self.tabela = TabelaPredicoes.carregar(self.models_dir)
+            if self.tabela is not None:
+                print(f"   ✓ Tabela de Predições ({len(self.tabela)} entradas)")
+            else:
+                print(f"   ⚠️  {ARQUIVO_TABELA} não encontrada, usando os modelos")
+
         print("✅ Modelos carregados!\n")
 
-    def _safe_encode(self, encoder, value):
-        """Evita erro caso o valor não esteja no encoder"""
-        if value in encoder.classes_:
-            return encoder.transform([value])[0]
-        else:
-            return 0  # fallback seguro
+    def _serializar_resultados(self, caminho):
+        """
+        Serializa os resultados de treinamento uma única vez (JSON e gzip),
+        com ETag e data de modificação para respostas HTTP condicionais
+        """
+        corpo = json.dumps(self.resultados_treinamento, ensure_ascii=False).encode("utf-8")
+        return {
+            "json": corpo,
+            "gzip": gzip.compress(corpo),
+            "etag": hashlib.sha1(corpo).hexdigest()[:16],
+            "modificado_em": os.path.getmtime(caminho)
+        }
 
-    def preparar_input(self, formulario):
+    def carregar_todos(self):
+        """Força o carregamento de todos os modelos (ex.: aquecer um worker)"""
+        for modelos in (self.clf_models, self.reg_models):
+            for nome in modelos:
+                modelos[nome]
+
+    def relatorio_carregamento(self):
+        """Tempo de carga e memória de cada modelo já carregado"""
+        return {
+            "classificacao": dict(self.clf_models.relatorio),
+            "regressao": dict(self.reg_models.relatorio)
+        }
+
+    def _codificar(self, coluna, valores):
+        """Codifica uma coluna inteira; valores fora do encoder viram 0 (fallback seguro)"""
+        mapa = {classe: i for i, classe in enumerate(self.label_encoders[coluna].classes_)}
+        return [mapa.get(valor, 0) for valor in valores]
 
+    def _extrair_campos(self, formulario):
+        """Lê do formulário os campos usados como features"""
         prof = formulario.get('profissao_atual', 'Desenvolvedor')
-        prof_encoded = self._safe_encode(self.label_encoders['profissao_atual'], prof)
 
         anos_exp = int(formulario.get("anos_experiencia", 3))
 
@@ -88,10 +286,7 @@ class MLPredictor:
         else:
             nivel = "Sênior"
 
-        nivel_encoded = self._safe_encode(self.label_encoders['nivel_atual'], nivel)
-
         objetivo = formulario.get("objetivo_principal", "Atualizar Carreira")
-        objetivo_encoded = self._safe_encode(self.label_encoders['objetivo_principal'], objetivo)
 
         tempo_estudo = formulario.get("tempo_disponivel_estudo", "10")
         tempo_estudo = int(tempo_estudo.split()[0])
@@ -101,62 +296,167 @@ class MLPredictor:
             habilidades = [h.strip() for h in habilidades.split(",")]
         num_habilidades = len(habilidades)
 
+        return prof, anos_exp, nivel, objetivo, tempo_estudo, num_habilidades
+
+    def preparar_input_lote(self, formularios):
+        """Monta a matriz de features (n x 7) de vários formulários de uma vez"""
+        campos = [self._extrair_campos(f) for f in formularios]
+        profs, anos, niveis, objetivos, tempos, num_habs = (
+            zip(*campos) if campos else ([],) * 6
+        )
+
         motivacao = 8
 
-        features = np.array([[
-            prof_encoded,
-            anos_exp,
-            nivel_encoded,
-            objetivo_encoded,
-            tempo_estudo,
-            num_habilidades,
-            motivacao
-        ]])
+        features = np.column_stack([
+            self._codificar('profissao_atual', profs),
+            anos,
+            self._codificar('nivel_atual', niveis),
+            self._codificar('objetivo_principal', objetivos),
+            tempos,
+            num_habs,
+            np.full(len(campos), motivacao)
+        ]).astype(np.int64)
 
         return features
 
+    def preparar_input(self, formulario):
+        return self.preparar_input_lote([formulario])
+
     def prever(self, formulario):
+        return self.prever_lote([formulario])[0]
 
-        print("🔮 Fazendo predições...")
+    def prever_lote(self, formularios):
+        """
+        Faz as predições de vários perfis com uma única passada por modelo
 
-        X = self.preparar_input(formulario)
-        X_scaled = self.scaler.transform(X) if self.scaler else X
+        Vetores de features já vistos (com a mesma versão dos modelos) são
+        respondidos pelo cache; só os demais passam pelos modelos.
+
+        Returns:
+            list: Um dicionário por formulário, no mesmo formato de prever()
+        """
+        print(f"🔮 Fazendo predições ({len(formularios)} perfis)...")
+
+        if not formularios:
+            return []
 
-        resultados = {"classificacao": {}, "regressao": {}, "recomendacao_final": {}}
+        X = self.preparar_input_lote(formularios)
+        chaves = [(self.versao_modelos, tuple(linha.tolist())) for linha in X]
 
-        # Classificação
-        for nome, modelo in self.clf_models.items():
+        resultados = [self.cache.obter(chave) for chave in chaves]
+        faltas = [i for i, resultado in enumerate(resultados) if resultado is None]
 
-            pred_encoded = modelo.predict(X)[0]
-            pred_proba = modelo.predict_proba(X)[0]
+        # Cópias: quem chama pode alterar o resultado sem afetar o cache
+        resultados = [copy.deepcopy(r) if r is not None else None for r in resultados]
 
-            area_pred = self.label_encoders["area_interesse"].inverse_transform([pred_encoded])[0]
+        if faltas:
+            novos = self._prever_matriz(X[faltas])
+            for i, resultado in zip(faltas, novos):
+                self.cache.gravar(chaves[i], copy.deepcopy(resultado))
+                resultados[i] = resultado
 
-            top_idx = np.argsort(pred_proba)[-3:][::-1]
-            top_areas = [{
-                "area": self.label_encoders["area_interesse"].inverse_transform([i])[0],
-                "probabilidade": float(pred_proba[i]),
-                "percentual": f"{pred_proba[i] * 100:.1f}%"
-            } for i in top_idx]
+        return resultados
 
-            resultados["classificacao"][nome] = {
-                "area_prevista": area_pred,
-                "confianca": float(pred_proba.max()),
-                "top_3_areas": top_areas
-            }
+    def _prever_matriz(self, X):
+        """Executa os modelos (ou a tabela) sobre uma matriz de features já codificada"""
+        if self.tabela is None:
+            saidas_clf, saidas_reg = self._saidas_modelos(X)
+        else:
+            saidas_clf, saidas_reg = self._saidas_tabela(X)
 
-        # Regressão
-        for nome, modelo in self.reg_models.items():
+        return self._montar_resultados(X.shape[0], saidas_clf, saidas_reg)
 
-            pred_score = modelo.predict(X_scaled)[0]
-            pred_score = float(np.clip(pred_score, 0, 100))
+    def _saidas_modelos(self, X):
+        """
+        Probabilidades e scores calculados pelos modelos
 
-            resultados["regressao"][nome] = {
-                "score_adequacao": pred_score,
-                "nivel_adequacao": self._classificar_score(pred_score)
-            }
+        Returns:
+            tuple: (nome -> (classes, probabilidades), nome -> scores)
+        """
+        X_scaled = self.scaler.transform(X) if self.scaler else X
 
-        # Consolidação final
+        # Classificação: predict_proba uma vez; a classe prevista é o argmax
+        saidas_clf = {
+            nome: (modelo.classes_, modelo.predict_proba(X))
+            for nome, modelo in self.clf_models.items()
+        }
+
+        saidas_reg = {
+            nome: np.clip(modelo.predict(X_scaled), 0, 100)
+            for nome, modelo in self.reg_models.items()
+        }
+
+        return saidas_clf, saidas_reg
+
+    def _saidas_tabela(self, X):
+        """Saídas lidas da tabela pré-computada; linhas fora da grade usam os modelos"""
+        indices, na_grade = self.tabela.localizar(X)
+
+        saidas_clf = {
+            nome: (classes, probas[indices])
+            for nome, (classes, probas) in self.tabela.clf.items()
+        }
+        saidas_reg = {nome: scores[indices] for nome, scores in self.tabela.reg.items()}
+
+        if not na_grade.all():
+            fora = ~na_grade
+            clf_vivo, reg_vivo = self._saidas_modelos(X[fora])
+            for nome, (_, probas) in clf_vivo.items():
+                saidas_clf[nome][1][fora] = probas
+            for nome, scores in reg_vivo.items():
+                saidas_reg[nome][fora] = scores
+
+        return saidas_clf, saidas_reg
+
+    def _montar_resultados(self, n, saidas_clf, saidas_reg):
+        """Converte probabilidades e scores na estrutura de resposta de prever()"""
+        encoder_area = self.label_encoders["area_interesse"]
+        resultados = [
+            {"classificacao": {}, "regressao": {}, "recomendacao_final": {}}
+            for _ in range(n)
+        ]
+
+        for nome, (classes, probas) in saidas_clf.items():
+
+            linhas = np.arange(n)[:, None]
+
+            pred_idx = probas.argmax(axis=1)
+            top_idx = np.argsort(probas, axis=1)[:, -3:][:, ::-1]
+
+            areas_pred = encoder_area.inverse_transform(classes[pred_idx])
+            top_areas = encoder_area.inverse_transform(
+                classes[top_idx].ravel()
+            ).reshape(top_idx.shape)
+            top_probas = probas[linhas, top_idx]
+            confiancas = probas.max(axis=1)
+
+            for i in range(n):
+                resultados[i]["classificacao"][nome] = {
+                    "area_prevista": areas_pred[i],
+                    "confianca": float(confiancas[i]),
+                    "top_3_areas": [{
+                        "area": area,
+                        "probabilidade": float(proba),
+                        "percentual": f"{proba * 100:.1f}%"
+                    } for area, proba in zip(top_areas[i], top_probas[i])]
+                }
+
+        for nome, pred_scores in saidas_reg.items():
+
+            for i in range(n):
+                pred_score = float(pred_scores[i])
+                resultados[i]["regressao"][nome] = {
+                    "score_adequacao": pred_score,
+                    "nivel_adequacao": self._classificar_score(pred_score)
+                }
+
+        for resultado in resultados:
+            self._consolidar(resultado)
+
+        return resultados
+
+    def _consolidar(self, resultados):
+        """Consolida as predições dos modelos na recomendação final"""
         from collections import Counter
 
         areas = [r["area_prevista"] for r in resultados["classificacao"].values()]
@@ -172,8 +472,6 @@ class MLPredictor:
             "consenso_modelos": areas.count(area_final)
         }
 
-        return resultados
-
     def _classificar_score(self, score):
         if score >= 80:
             return "Excelente"
@@ -0,0 +1,299 @@
+"""
+Geração Assíncrona de Planos de Carreira
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Os planos do Gemini levam segundos para ficar prontos, então são gerados
+como jobs: `submeter` devolve na hora o id do job e `consultar` informa o
+estado (pendente, executando, concluido ou erro) e o plano quando pronto.
+
+- Entradas idênticas (input normalizado + cursos selecionados) têm a mesma
+  chave: enquanto um job com a chave está em andamento, novos pedidos
+  recebem o mesmo job em vez de gerar outro plano.
+- Planos concluídos ficam em um cache em disco com TTL e são servidos sem
+  chamar o LLM.
+- No máximo `concorrencia` gerações rodam ao mesmo tempo, protegendo a
+  cota da API.
+
+`fluxo` entrega o mesmo plano em trechos, conforme o modelo gera (usado
+pelo endpoint SSE), compartilhando o cache e o limite de concorrência.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from gpt_recommender import cliente_llm_padrao, montar_input, montar_prompt, selecionar_cursos
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_CACHE = os.getenv("PLANOS_CACHE", os.path.join(BASE_DIR, "data", "cache_planos.json"))
+CACHE_TTL = float(os.getenv("PLANOS_CACHE_TTL", str(7 * 24 * 3600)))  # segundos
+CONCORRENCIA = int(os.getenv("PLANOS_CONCORRENCIA", "2"))
+
+
+def normalizar_input(input_data):
+    """
+    Forma canônica do input: textos sem espaços nas pontas, listas
+    ordenadas e campos vazios removidos
+    """
+    normalizado = {}
+    for campo, valor in input_data.items():
+        if isinstance(valor, str):
+            valor = valor.strip()
+        elif isinstance(valor, (list, tuple)):
+            valor = sorted({str(v).strip() for v in valor if str(v).strip()})
+        if valor in (None, "", []):
+            continue
+        normalizado[campo] = valor
+    return normalizado
+
+
+def chave_plano(input_data, cursos):
+    """Hash do input normalizado + URLs dos cursos que entram no prompt"""
+    conteudo = json.dumps(
+        {'input': input_data, 'cursos': [c.get('url') for c in cursos]},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+class CachePlanos:
+    """Planos já gerados, por chave, persistidos em JSON com TTL"""
+
+    def __init__(self, caminho=CAMINHO_CACHE, ttl=CACHE_TTL):
+        self.caminho = caminho
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entradas = {}
+
+        if caminho and os.path.exists(caminho):
+            with open(caminho, "r", encoding="utf-8") as f:
+                self._entradas = json.load(f)
+
+    def obter(self, chave):
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return None
+            if self.ttl and time.time() - entrada['gerado_em'] > self.ttl:
+                del self._entradas[chave]
+                return None
+            return entrada
+
+    def gravar(self, chave, plano):
+        with self._lock:
+            agora = time.time()
+            self._entradas[chave] = {'plano': plano, 'gerado_em': agora}
+            # Aproveita a escrita para descartar o que já expirou
+            if self.ttl:
+                self._entradas = {
+                    k: v for k, v in self._entradas.items() if agora - v['gerado_em'] <= self.ttl
+                }
+            self._salvar()
+
+    def _salvar(self):
+        if not self.caminho:
+            return
+        os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(self._entradas, f, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+
+
+class GerenciadorPlanos:
+    """Fila de jobs de geração de planos com deduplicação e cache"""
+
+    def __init__(self, cliente=None, concorrencia=CONCORRENCIA, cache=None, historico=1000):
+        """
+        Args:
+            cliente: Cliente LLM com gerar(prompt) e gerar_fluxo(prompt)
+                (padrão: PLANOS_LLM)
+            concorrencia (int): Gerações simultâneas no máximo
+            cache (CachePlanos): Cache persistente (padrão: PLANOS_CACHE)
+            historico (int): Jobs mantidos em memória para consulta
+        """
+        self._cliente = cliente
+        self.concorrencia = concorrencia
+        self.cache = cache if cache is not None else CachePlanos()
+        self.historico = historico
+
+        self._executor = ThreadPoolExecutor(max_workers=concorrencia, thread_name_prefix="plano")
+        # Vagas de geração compartilhadas entre jobs e fluxos
+        self._vagas = threading.BoundedSemaphore(concorrencia)
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()  # id -> job
+        self._em_andamento = {}  # chave -> id do job
+        self.estatisticas = {
+            'submetidos': 0, 'cache': 0, 'deduplicados': 0, 'gerados': 0, 'erros': 0,
+            'fluxos': 0, 'fluxos_cancelados': 0
+        }
+
+    @property
+    def cliente(self):
+        if self._cliente is None:
+            self._cliente = cliente_llm_padrao()
+        return self._cliente
+
+    def preparar(self, formulario):
+        """
+        Input normalizado, cursos e chave de um formulário
+
+        Returns:
+            tuple: (input_data, cursos, chave)
+        """
+        input_data = normalizar_input(montar_input(formulario))
+        cursos = selecionar_cursos(input_data)
+        return input_data, cursos, chave_plano(input_data, cursos)
+
+    def submeter(self, formulario):
+        """
+        Cria (ou reaproveita) o job que gera o plano do formulário
+
+        Returns:
+            dict: Estado atual do job (inclui o id)
+        """
+        input_data, cursos, chave = self.preparar(formulario)
+
+        with self._lock:
+            self.estatisticas['submetidos'] += 1
+
+            job_id = self._em_andamento.get(chave)
+            if job_id is not None:
+                self.estatisticas['deduplicados'] += 1
+                return self._copia(self._jobs[job_id])
+
+            job = {
+                'id': uuid.uuid4().hex,
+                'chave': chave,
+                'estado': 'pendente',
+                'plano': None,
+                'erro': None,
+                'origem': None,
+                'criado_em': time.time(),
+                'concluido_em': None
+            }
+            self._registrar(job)
+
+            em_cache = self.cache.obter(chave)
+            if em_cache is not None:
+                self.estatisticas['cache'] += 1
+                self._concluir(job, plano=em_cache['plano'], origem='cache')
+                return self._copia(job)
+
+            if not cursos:
+                self._concluir(job, erro="Nenhum curso encontrado. Execute: python controller/alura_scraper.py")
+                return self._copia(job)
+
+            self._em_andamento[chave] = job['id']
+
+        self._executor.submit(self._executar, job, montar_prompt(input_data, cursos))
+        return self.consultar(job['id'])
+
+    def consultar(self, job_id):
+        """Estado do job (None se o id não existir)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._copia(job) if job else None
+
+    def aguardar(self, job_id, timeout=None, intervalo=0.05):
+        """Bloqueia até o job terminar (útil em scripts e testes)"""
+        limite = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.consultar(job_id)
+            if job is None or job['estado'] in ('concluido', 'erro'):
+                return job
+            if limite is not None and time.monotonic() >= limite:
+                return job
+            time.sleep(intervalo)
+
+    def _executar(self, job, prompt):
+        with self._lock:
+            job['estado'] = 'executando'
+
+        try:
+            with self._vagas:
+                plano = self.cliente.gerar(prompt)
+        except Exception as e:
+            print(f"❌ Erro ao gerar plano: {e}")
+            with self._lock:
+                self.estatisticas['erros'] += 1
+                self._concluir(job, erro=str(e))
+                self._em_andamento.pop(job['chave'], None)
+            return
+
+        # Grava no cache antes de liberar a chave: um pedido idêntico que
+        # chegue agora encontra o plano pronto em vez de gerar outro
+        self.cache.gravar(job['chave'], plano)
+        with self._lock:
+            self.estatisticas['gerados'] += 1
+            self._concluir(job, plano=plano, origem='llm')
+            self._em_andamento.pop(job['chave'], None)
+
+    def fluxo(self, formulario):
+        """
+        Gerador com os trechos do plano à medida que são produzidos
+
+        Um plano em cache sai de uma vez; senão o texto vem do modo
+        streaming do cliente e, se chegar ao fim, entra no cache. Fechar
+        o gerador (cliente HTTP desconectou) fecha o fluxo do modelo e
+        libera a vaga de geração.
+        """
+        input_data, cursos, chave = self.preparar(formulario)
+        with self._lock:
+            self.estatisticas['fluxos'] += 1
+
+        em_cache = self.cache.obter(chave)
+        if em_cache is not None:
+            with self._lock:
+                self.estatisticas['cache'] += 1
+            yield em_cache['plano']
+            return
+
+        if not cursos:
+            raise RuntimeError("Nenhum curso encontrado. Execute: python controller/alura_scraper.py")
+
+        trechos = []
+        with self._vagas:
+            fluxo_modelo = self.cliente.gerar_fluxo(montar_prompt(input_data, cursos))
+            try:
+                for trecho in fluxo_modelo:
+                    trechos.append(trecho)
+                    yield trecho
+            except GeneratorExit:
+                with self._lock:
+                    self.estatisticas['fluxos_cancelados'] += 1
+                raise
+            finally:
+                fluxo_modelo.close()
+
+        self.cache.gravar(chave, "".join(trechos))
+        with self._lock:
+            self.estatisticas['gerados'] += 1
+
+    def _concluir(self, job, plano=None, erro=None, origem=None):
+        job['estado'] = 'erro' if erro else 'concluido'
+        job['plano'] = plano
+        job['erro'] = erro
+        job['origem'] = origem
+        job['concluido_em'] = time.time()
+
+    def _registrar(self, job):
+        self._jobs[job['id']] = job
+        # Descarta os jobs mais antigos já terminados
+        while len(self._jobs) > self.historico:
+            antigo_id, antigo = next(iter(self._jobs.items()))
+            if antigo['estado'] not in ('concluido', 'erro'):
+                break
+            del self._jobs[antigo_id]
+
+    @staticmethod
+    def _copia(job):
+        return {k: v for k, v in job.items() if k != 'chave'}
+
+    def encerrar(self):
+        self._executor.shutdown(wait=True)
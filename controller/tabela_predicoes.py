@@ -0,0 +1,139 @@
+"""
+Tabela de Predições Pré-Computadas
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Todas as features usadas pelo MLPredictor vêm de um conjunto pequeno e
+discreto de valores, então o espaço de entrada inteiro pode ser enumerado
+no treinamento. Este módulo monta a grade, salva as saídas de todos os
+modelos em um arquivo .npz e responde consultas por indexação direta.
+"""
+
+import os
+import numpy as np
+
+ARQUIVO_TABELA = 'tabela_predicoes.npz'
+
+# Valores de cada eixo da grade (profissão e objetivo vêm dos encoders)
+ANOS_EXPERIENCIA = np.arange(0, 21)
+TEMPOS_ESTUDO = np.array([5, 10, 15, 20, 25, 30])
+NUM_HABILIDADES = np.arange(0, 11)
+MOTIVACAO = 8
+
+
+def _nivel(anos_exp):
+    if anos_exp < 3:
+        return 'Júnior'
+    elif anos_exp < 7:
+        return 'Pleno'
+    return 'Sênior'
+
+
+def construir_grade(label_encoders):
+    """
+    Enumera todas as combinações de features da grade
+
+    Returns:
+        tuple: (eixos, X) - dicionário com os valores de cada eixo e a
+            matriz de features (uma linha por ponto da grade, na ordem C)
+    """
+    eixos = {
+        'profissao': np.arange(len(label_encoders['profissao_atual'].classes_)),
+        'anos': ANOS_EXPERIENCIA,
+        'objetivo': np.arange(len(label_encoders['objetivo_principal'].classes_)),
+        'tempo': TEMPOS_ESTUDO,
+        'habilidades': NUM_HABILIDADES
+    }
+
+    prof, anos, objetivo, tempo, habilidades = (
+        g.ravel() for g in np.meshgrid(*eixos.values(), indexing='ij')
+    )
+
+    # O nível é derivado dos anos de experiência, como no preditor
+    codigos_nivel = label_encoders['nivel_atual'].transform(
+        [_nivel(a) for a in ANOS_EXPERIENCIA]
+    )
+    nivel = codigos_nivel[anos - ANOS_EXPERIENCIA[0]]
+
+    X = np.column_stack([
+        prof, anos, nivel, objetivo, tempo, habilidades,
+        np.full(len(prof), MOTIVACAO)
+    ]).astype(np.int64)
+
+    return eixos, X
+
+
+def salvar_tabela(caminho, eixos, saidas_clf, saidas_reg):
+    """
+    Salva a tabela em formato .npz comprimido
+
+    Args:
+        caminho (str): Arquivo de saída
+        eixos (dict): Eixos retornados por construir_grade
+        saidas_clf (dict): nome -> (classes, probabilidades n x k)
+        saidas_reg (dict): nome -> scores (n,)
+    """
+    arrays = {f'eixo_{nome}': valores for nome, valores in eixos.items()}
+    arrays['motivacao'] = np.array(MOTIVACAO)
+    arrays['clf_nomes'] = np.array(list(saidas_clf))
+    arrays['reg_nomes'] = np.array(list(saidas_reg))
+
+    for nome, (classes, probas) in saidas_clf.items():
+        arrays[f'clf_classes_{nome}'] = np.asarray(classes)
+        arrays[f'clf_proba_{nome}'] = np.asarray(probas, dtype=np.float64)
+
+    for nome, scores in saidas_reg.items():
+        arrays[f'reg_score_{nome}'] = np.asarray(scores, dtype=np.float64)
+
+    np.savez_compressed(caminho, **arrays)
+    return caminho
+
+
+class TabelaPredicoes:
+    """Consulta da tabela pré-computada por indexação na grade"""
+
+    EIXOS = ('profissao', 'anos', 'objetivo', 'tempo', 'habilidades')
+    # Coluna da matriz de features correspondente a cada eixo
+    COLUNAS = (0, 1, 3, 4, 5)
+
+    def __init__(self, caminho):
+        with np.load(caminho) as dados:
+            self.eixos = [dados[f'eixo_{nome}'] for nome in self.EIXOS]
+            self.motivacao = int(dados['motivacao'])
+            self.clf = {
+                nome: (dados[f'clf_classes_{nome}'], dados[f'clf_proba_{nome}'])
+                for nome in dados['clf_nomes'].tolist()
+            }
+            self.reg = {
+                nome: dados[f'reg_score_{nome}']
+                for nome in dados['reg_nomes'].tolist()
+            }
+        self.formato = tuple(len(eixo) for eixo in self.eixos)
+
+    @classmethod
+    def carregar(cls, models_dir):
+        """Carrega a tabela de models/, se existir"""
+        caminho = os.path.join(models_dir, ARQUIVO_TABELA)
+        return cls(caminho) if os.path.exists(caminho) else None
+
+    def __len__(self):
+        return int(np.prod(self.formato))
+
+    def localizar(self, X):
+        """
+        Posição de cada linha de X na tabela
+
+        Returns:
+            tuple: (indices, na_grade) - índice linear de cada linha e a
+                máscara das linhas que de fato estão na grade
+        """
+        na_grade = X[:, 6] == self.motivacao
+        posicoes = []
+
+        for eixo, coluna in zip(self.eixos, self.COLUNAS):
+            valores = X[:, coluna]
+            pos = np.clip(np.searchsorted(eixo, valores), 0, len(eixo) - 1)
+            na_grade &= eixo[pos] == valores
+            posicoes.append(pos)
+
+        indices = np.ravel_multi_index(posicoes, self.formato)
+        return indices, na_grade
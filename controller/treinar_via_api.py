@@ -1,8 +1,13 @@
 """
 Script Standalone para Treinamento de Modelos ML
 Execute este script DIRETAMENTE - não precisa do servidor rodando
+
+Uso:
+    python controller/treinar_via_api.py
+    python controller/treinar_via_api.py --amostras 10000000 --tamanho-shard 1000000
 """
 
+import argparse
 import os
 import sys
 
@@ -15,6 +20,18 @@ CONTROLLER_DIR = os.path.join(BASE_DIR, 'controller')
 # Adiciona o diretório 'controller' ao path do Python para que os módulos internos sejam importados
 sys.path.insert(0, CONTROLLER_DIR)
 
+parser = argparse.ArgumentParser(description="Gera o dataset sintético e treina os modelos")
+parser.add_argument('--amostras', type=int, default=1000, help='Total de amostras do dataset')
+parser.add_argument('--tamanho-shard', type=int, default=None,
+                    help='Gera o dataset em shards deste tamanho (Parquet + manifesto) em vez de um CSV')
+parser.add_argument('--workers', type=int, default=None, help='Processos na geração em shards (padrão: todos os núcleos)')
+parser.add_argument('--formato', choices=['parquet', 'feather'], default='parquet', help='Formato dos shards')
+parser.add_argument('--compactar', action='store_true',
+                    help='Treina com as linhas repetidas agrupadas e ponderadas (TREINAMENTO_COMPACTAR=1)')
+parser.add_argument('--max-linhas', type=int, default=None,
+                    help='Máximo de linhas dos shards usadas no treinamento (TREINAMENTO_MAX_LINHAS; 0 = todas)')
+args = parser.parse_args()
+
 print("="*70)
 print("🚀 TREINAMENTO DE MODELOS ML - SKILLBRIDGE")
 print("FIAP Global Solution 2025 - Futuro do Trabalho")
@@ -53,7 +70,7 @@ try:
 except ImportError as e:
     print(f"\n❌ Erro ao importar módulos: {e}")
     print("\n💡 Instale as dependências:")
-    print("   pip install pandas numpy scikit-learn matplotlib seaborn")
+    print("   pip install pandas numpy scikit-learn matplotlib seaborn pyarrow")
     sys.exit(1)
 
 # Criar pastas necessárias
@@ -73,14 +90,25 @@ print("="*70)
 
 try:
     generator = DataGenerator()
-    print("\n🔄 Gerando 1000 amostras de profissionais...")
-    df = generator.gerar_dataset(n_amostras=1000)
     
-    dataset_path = os.path.join(DATA_FOLDER, 'dataset_profissionais.csv')
-    generator.salvar_dataset(df, dataset_path)
+    if args.tamanho_shard:
+        # Shards gerados em paralelo + manifesto (o treino lê até --max-linhas)
+        dataset_path = generator.gerar_shards(
+            args.amostras,
+            os.path.join(DATA_FOLDER, 'dataset_profissionais'),
+            tamanho_shard=args.tamanho_shard,
+            workers=args.workers,
+            formato=args.formato
+        )
+    else:
+        print(f"\n🔄 Gerando {args.amostras} amostras de profissionais...")
+        df = generator.gerar_dataset(n_amostras=args.amostras)
+        
+        dataset_path = os.path.join(DATA_FOLDER, 'dataset_profissionais.csv')
+        generator.salvar_dataset(df, dataset_path)
+        print(f"   📊 Shape: {df.shape}")
     
     print(f"\n✅ Dataset gerado com sucesso!")
-    print(f"   📊 Shape: {df.shape}")
     print(f"   📁 Salvo em: {dataset_path}")
     
 except Exception as e:
@@ -96,6 +124,10 @@ print("="*70)
 
 try:
     ml = MLModels(dataset_path)
+    if args.compactar:
+        ml.compactar = True
+    if args.max_linhas is not None:
+        ml.max_linhas = args.max_linhas
     print("\n📂 Carregando dataset...")
     ml.carregar_dados()
     
@@ -103,6 +135,9 @@ try:
     dados = ml.preprocessar_dados()
     
     print("\n✅ Pré-processamento concluído!")
+    for etapa, metricas in ml.metricas_etapas.items():
+        memoria = f", pico +{metricas['pico_mb']:,.1f} MB" if metricas['pico_mb'] is not None else ""
+        print(f"   ⏱️  {etapa}: {metricas['tempo_s']:.2f}s{memoria}")
     
 except Exception as e:
     print(f"\n❌ Erro no pré-processamento: {e}")
@@ -125,6 +160,13 @@ try:
     ml.treinar_modelos_regressao(dados)
     
     print("\n✅ Todos os modelos treinados!")
+    for etapa, info in ml.compactacao.items():
+        print(f"   🗜️  {etapa}: {info['linhas']:,} -> {info['linhas_unicas']:,} linhas ({info['razao']}x)")
+    for etapa, tempos in ml.tempos_treinamento.items():
+        print(f"   ⏱️  {etapa}: {tempos['tempo_s']:.2f}s "
+              f"(serial {tempos['soma_tarefas_s']:.2f}s, speedup {tempos['speedup']}x)")
+
+    ml.verificar_motor_compilado(dados)
     
 except Exception as e:
     print(f"\n❌ Erro no treinamento: {e}")
@@ -141,6 +183,9 @@ try:
     print("\n💾 Salvando modelos...")
     ml.salvar_modelos(MODELS_FOLDER)
     
+    print("\n🧮 Pré-computando tabela de predições...")
+    ml.gerar_tabela_predicoes(MODELS_FOLDER)
+    
     print("\n📊 Gerando visualizações...")
     ml.gerar_visualizacoes(VIZ_FOLDER)
     
@@ -158,20 +203,21 @@ print("🎉 TREINAMENTO CONCLUÍDO COM SUCESSO!")
 print("="*70)
 
 print("\n📊 RESUMO:")
-print(f"   ✅ Dataset: {df.shape[0]} amostras, {df.shape[1]} features")
+print(f"   ✅ Dataset: {ml.df.shape[0]} amostras, {ml.df.shape[1]} features")
 print(f"   ✅ Modelos treinados: 4")
 print(f"   ✅ Visualizações geradas: 4")
 
 print("\n📁 ARQUIVOS GERADOS:")
 print(f"   📂 {DATA_FOLDER}/")
-print(f"      └── dataset_profissionais.csv")
+print(f"      └── {os.path.relpath(dataset_path, DATA_FOLDER)}")
 print(f"   📂 {MODELS_FOLDER}/")
-print(f"      ├── clf_RandomForest.pkl")
-print(f"      ├── clf_GradientBoosting.pkl")
-print(f"      ├── reg_RandomForest.pkl")
-print(f"      ├── reg_LinearRegression.pkl")
+print(f"      ├── clf_RandomForest.joblib")
+print(f"      ├── clf_GradientBoosting.joblib")
+print(f"      ├── reg_RandomForest.joblib")
+print(f"      ├── reg_LinearRegression.joblib")
 print(f"      ├── label_encoders.pkl")
 print(f"      ├── scaler.pkl")
+print(f"      ├── tabela_predicoes.npz")
 print(f"      └── resultados.json")
 print(f"   📂 {VIZ_FOLDER}/")
 print(f"      ├── feature_importance_clf.png")
@@ -0,0 +1,17 @@
+"""
+Configuração dos testes
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Os módulos da aplicação ficam em controller/ e são importados pelo nome,
+como nos scripts (ex.: `from database import firebase_db`). O app Flask
+(app/main.py) é importado como `main`.
+"""
+
+import os
+import sys
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CONTROLLER_DIR = os.path.join(BASE_DIR, 'controller')
+APP_DIR = os.path.join(BASE_DIR, 'app')
+sys.path.insert(0, CONTROLLER_DIR)
+sys.path.insert(0, APP_DIR)
@@ -0,0 +1,252 @@
+"""
+Firestore em Memória
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Cliente falso com o subconjunto da API do Firestore usado por database.py
+(coleções, documentos, consultas com filtros/cursores/count e write
+batches), usado pelos testes para exercitar o catálogo sem credenciais
+nem rede:
+
+    from database import firebase_db
+    from firestore_memoria import ClienteFirestoreMemoria
+
+    firebase_db.usar_cliente(ClienteFirestoreMemoria())
+"""
+
+import copy
+import threading
+import uuid
+
+# Mesmo limite de operações por write batch do Firestore
+LIMITE_BATCH = 500
+
+
+class SnapshotMemoria:
+    def __init__(self, referencia, dados):
+        self.reference = referencia
+        self.id = referencia.id
+        self.exists = dados is not None
+        self._dados = dados
+
+    def to_dict(self):
+        return copy.deepcopy(self._dados) if self.exists else None
+
+
+class DocumentoMemoria:
+    def __init__(self, colecao, doc_id):
+        self._colecao = colecao
+        self.id = doc_id
+
+    def collection(self, nome):
+        """Subcoleção do documento (existe mesmo sem o documento, como no Firestore)"""
+        return self._colecao._cliente.collection(f"{self._colecao.caminho}/{self.id}/{nome}")
+
+    def get(self, field_paths=None):
+        with self._colecao._cliente._lock:
+            dados = copy.deepcopy(self._colecao._docs.get(self.id))
+        if dados is not None and field_paths is not None:
+            dados = {campo: dados[campo] for campo in field_paths if campo in dados}
+        return SnapshotMemoria(self, dados)
+
+    def set(self, dados):
+        with self._colecao._cliente._lock:
+            self._colecao._docs[self.id] = copy.deepcopy(dados)
+            self._colecao._cliente.escritas += 1
+
+    def delete(self):
+        with self._colecao._cliente._lock:
+            self._colecao._docs.pop(self.id, None)
+            self._colecao._cliente.escritas += 1
+
+
+class ConsultaMemoria:
+    """Consulta imutável: where / order_by / start_after / limit / count / sum"""
+
+    ASCENDING = 'ASCENDING'
+    DESCENDING = 'DESCENDING'
+
+    OPERADORES = {
+        '==': lambda campo, valor: campo == valor,
+        'in': lambda campo, valor: campo in valor,
+        'array_contains': lambda campo, valor: isinstance(campo, list) and valor in campo,
+        'array_contains_any': lambda campo, valor: isinstance(campo, list) and any(v in campo for v in valor),
+    }
+
+    def __init__(self, colecao, filtros=(), ordem=None, direcao=ASCENDING, inicio=None, limite=None):
+        self._colecao = colecao
+        self._filtros = filtros
+        self._ordem = ordem
+        self._direcao = direcao
+        self._inicio = inicio
+        self._limite = limite
+
+    def _copiar(self, **mudancas):
+        atributos = {
+            'filtros': self._filtros, 'ordem': self._ordem, 'direcao': self._direcao,
+            'inicio': self._inicio, 'limite': self._limite
+        }
+        atributos.update(mudancas)
+        return ConsultaMemoria(self._colecao, **atributos)
+
+    def where(self, campo, operador, valor):
+        if operador not in self.OPERADORES:
+            raise ValueError(f"Operador não suportado: {operador}")
+        if operador in ('in', 'array_contains_any') and len(valor) > 30:
+            raise ValueError("Filtros in/array_contains_any aceitam no máximo 30 valores")
+        return self._copiar(filtros=self._filtros + ((campo, operador, valor),))
+
+    def order_by(self, campo, direction=ASCENDING):
+        return self._copiar(ordem=campo, direcao=direction)
+
+    def start_after(self, valores):
+        return self._copiar(inicio=valores[self._ordem])
+
+    def limit(self, n):
+        return self._copiar(limite=n)
+
+    def _filtrados(self):
+        return [
+            (doc_id, dados) for doc_id, dados in self._colecao._docs.items()
+            if all(
+                campo in dados and self.OPERADORES[operador](dados[campo], valor)
+                for campo, operador, valor in self._filtros
+            )
+        ]
+
+    def _resultados(self):
+        with self._colecao._cliente._lock:
+            itens = [(doc_id, copy.deepcopy(dados)) for doc_id, dados in self._filtrados()]
+
+        if self._ordem:
+            # Empates pelo ID do documento, na mesma direção (como no Firestore)
+            itens = sorted(
+                (i for i in itens if self._ordem in i[1]),
+                key=lambda i: (i[1][self._ordem], i[0]),
+                reverse=self._direcao == self.DESCENDING
+            )
+            if self._inicio is not None:
+                itens = [i for i in itens if i[1][self._ordem] > self._inicio]
+        if self._limite is not None:
+            itens = itens[:self._limite]
+
+        # Documentos lidos (cobrados) pela consulta
+        with self._colecao._cliente._lock:
+            self._colecao._cliente.leituras += len(itens)
+        return itens
+
+    def stream(self):
+        return iter([
+            SnapshotMemoria(self._colecao.document(doc_id), dados)
+            for doc_id, dados in self._resultados()
+        ])
+
+    def count(self, alias=None):
+        return _AgregacaoMemoria(self).count(alias)
+
+    def sum(self, campo, alias=None):
+        return _AgregacaoMemoria(self).sum(campo, alias)
+
+
+class _AgregacaoMemoria:
+    """Consulta de agregação: count e sum, encadeáveis como no Firestore"""
+
+    def __init__(self, consulta):
+        self._consulta = consulta
+        self._agregacoes = []
+
+    def count(self, alias=None):
+        self._agregacoes.append((alias or 'count', None))
+        return self
+
+    def sum(self, campo, alias=None):
+        self._agregacoes.append((alias or f'sum_{campo}', campo))
+        return self
+
+    def get(self):
+        # Mesmo formato do Firestore: [[AggregationResult, ...]]
+        with self._consulta._colecao._cliente._lock:
+            docs = [dados for _, dados in self._consulta._filtrados()]
+        return [[
+            _ResultadoAgregacao(alias, len(docs) if campo is None else sum(
+                d[campo] for d in docs if isinstance(d.get(campo), (int, float))
+            ))
+            for alias, campo in self._agregacoes
+        ]]
+
+
+class _ResultadoAgregacao:
+    def __init__(self, alias, value):
+        self.alias = alias
+        self.value = value
+
+
+class ColecaoMemoria(ConsultaMemoria):
+    def __init__(self, cliente, caminho):
+        super().__init__(self)
+        self._cliente = cliente
+        self.caminho = caminho
+        self._docs = {}
+
+    def document(self, doc_id=None):
+        return DocumentoMemoria(self, doc_id or uuid.uuid4().hex[:20])
+
+
+class LoteMemoria:
+    """Write batch: as operações só são aplicadas, todas juntas, no commit"""
+
+    def __init__(self, cliente):
+        self._cliente = cliente
+        self._operacoes = []
+
+    def _adicionar(self, operacao):
+        if len(self._operacoes) >= LIMITE_BATCH:
+            raise ValueError(f"Um batch aceita no máximo {LIMITE_BATCH} escritas")
+        self._operacoes.append(operacao)
+
+    def set(self, referencia, dados):
+        self._adicionar(('set', referencia, copy.deepcopy(dados)))
+
+    def delete(self, referencia):
+        self._adicionar(('delete', referencia, None))
+
+    def commit(self):
+        with self._cliente._lock:
+            for tipo, referencia, dados in self._operacoes:
+                docs = referencia._colecao._docs
+                if tipo == 'set':
+                    docs[referencia.id] = dados
+                else:
+                    docs.pop(referencia.id, None)
+            self._cliente.escritas += len(self._operacoes)
+            self._cliente.commits += 1
+        return []
+
+
+class ClienteFirestoreMemoria:
+    """Cliente Firestore em memória (thread-safe) com contadores de leitura e escrita"""
+
+    def __init__(self):
+        self._colecoes = {}
+        self._lock = threading.RLock()
+        self.escritas = 0
+        self.leituras = 0
+        self.commits = 0
+
+    def collection(self, nome):
+        with self._lock:
+            if nome not in self._colecoes:
+                self._colecoes[nome] = ColecaoMemoria(self, nome)
+            return self._colecoes[nome]
+
+    def batch(self):
+        return LoteMemoria(self)
+
+    def get_all(self, referencias, field_paths=None):
+        """
+        Lê vários documentos de uma vez (inexistentes vêm com exists=False);
+        com `field_paths`, só esses campos
+        """
+        snapshots = [referencia.get(field_paths) for referencia in referencias]
+        with self._lock:
+            self.leituras += len(snapshots)
+        return iter(snapshots)
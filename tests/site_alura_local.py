@@ -0,0 +1,101 @@
+"""
+Site da Alura Local
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Servidor HTTP (http.server) que serve as páginas de paginas_alura/ no
+lugar do site real, para exercitar o CrawlerAlura sem rede:
+
+    with SiteAluraLocal(diretorio, falhas={'/curso-online-sql': [503, 503]}) as site:
+        crawler = CrawlerAlura(base_url=site.url)
+
+`falhas` mapeia um caminho para os status devolvidos nas primeiras
+requisições, antes da página de verdade. Arquivos ausentes dão 404, e
+If-Modified-Since é respondido com 304 pelo próprio SimpleHTTPRequestHandler.
+"""
+
+import os
+import shutil
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+PAGINAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'paginas_alura')
+
+
+def copiar_paginas(destino):
+    """Cópia das páginas de exemplo, que o teste pode alterar à vontade"""
+    return shutil.copytree(PAGINAS, destino)
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, site, **kwargs):
+        self.site = site
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        self.site._entrar(self.path)
+        try:
+            # Demora de rede: deixa as requisições simultâneas se sobreporem
+            time.sleep(self.site.latencia)
+            status = self.site._proxima_falha(self.path)
+            if status:
+                self.send_error(status)
+                return
+            super().do_GET()
+        finally:
+            self.site._sair()
+
+    def send_response(self, code, message=None):
+        self.site._registrar_status(self.path, code)
+        super().send_response(code, message)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SiteAluraLocal:
+    """Servidor local com falhas programadas e contadores por caminho"""
+
+    def __init__(self, diretorio=PAGINAS, falhas=None, latencia=0.05):
+        self.latencia = latencia
+        self.falhas = {caminho: list(status) for caminho, status in (falhas or {}).items()}
+        self.requisicoes = {}  # caminho -> número de GETs
+        self.historico = []  # caminhos na ordem em que chegaram
+        self.respostas = {}  # caminho -> status devolvidos, em ordem
+        self.simultaneas = 0
+        self.max_simultaneas = 0
+        self._lock = threading.Lock()
+
+        handler = partial(_Handler, site=self, directory=diretorio)
+        self.servidor = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.url = f"http://127.0.0.1:{self.servidor.server_address[1]}"
+        self._thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+    def _entrar(self, caminho):
+        with self._lock:
+            self.requisicoes[caminho] = self.requisicoes.get(caminho, 0) + 1
+            self.historico.append(caminho)
+            self.simultaneas += 1
+            self.max_simultaneas = max(self.max_simultaneas, self.simultaneas)
+
+    def _sair(self):
+        with self._lock:
+            self.simultaneas -= 1
+
+    def _proxima_falha(self, caminho):
+        with self._lock:
+            pendentes = self.falhas.get(caminho)
+            return pendentes.pop(0) if pendentes else None
+
+    def _registrar_status(self, caminho, status):
+        with self._lock:
+            self.respostas.setdefault(caminho, []).append(status)
@@ -0,0 +1,93 @@
+"""
+Testes do catálogo em SQLite (FTS5)
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+A busca filtrada do CatalogoSQLite tem de devolver os mesmos cursos que
+o índice em memória (substring: "Java" também encontra "JavaScript"), e
+o ranking tem de pesar a área de interesse com PESO_AREA.
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from catalogo_sqlite import CatalogoSQLite
+from indice_cursos import IndiceCursos
+
+TEMAS = ['Python', 'Java', 'JavaScript', 'SQL', 'Docker', 'Kubernetes', 'C#', 'Ação e reação']
+
+
+def _catalogo(n, semente=13):
+    rng = random.Random(semente)
+    return [
+        {
+            'titulo': f"{rng.choice(TEMAS)} {rng.choice(['básico', 'avançado'])} {i}",
+            'url': f'https://www.alura.com.br/curso-online-{i}',
+            'aprendizado': ' | '.join(rng.choices(TEMAS + ['dados', 'projetos'], k=rng.randint(1, 6))),
+            'publico_alvo': rng.choice(['Iniciantes', 'Pessoas desenvolvedoras'])
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def cursos():
+    return _catalogo(300)
+
+
+@pytest.fixture
+def catalogo(cursos):
+    catalogo = CatalogoSQLite(':memory:')
+    catalogo.sincronizar_cursos(cursos)
+    return catalogo
+
+
+@pytest.mark.parametrize('area, habilidades', [
+    (None, ['Java']),
+    (None, ['Kube']),
+    (None, ['c#', 'SQL']),
+    ('Desenvolvimento', ['AÇÃO']),
+    (None, ['ja']),
+])
+def test_filtro_igual_ao_indice_em_memoria(catalogo, cursos, area, habilidades):
+    esperados = IndiceCursos(cursos).filtrar(area, habilidades)
+    assert esperados
+
+    assert catalogo.buscar_cursos_filtrados(area, habilidades) == esperados
+
+
+def test_filtro_acompanha_as_escritas(catalogo, cursos):
+    catalogo.salvar_cursos([{**cursos[0], 'titulo': 'Kotlin para Android'}])
+    catalogo.remover_ausentes([curso['url'] for curso in cursos[1:]])
+    catalogo.salvar_cursos([{**cursos[1], 'titulo': 'Kotlin com Spring'}])
+
+    assert [c['titulo'] for c in catalogo.buscar_cursos_filtrados(None, ['kotlin'])] == ['Kotlin com Spring']
+
+
+def test_banco_anterior_ao_indice_de_trechos_e_migrado(tmp_path, cursos):
+    caminho = str(tmp_path / 'catalogo.db')
+    CatalogoSQLite(caminho).sincronizar_cursos(cursos)
+
+    conn = sqlite3.connect(caminho)
+    conn.executescript("""
+        DROP TRIGGER cursos_ai; DROP TRIGGER cursos_ad; DROP TRIGGER cursos_au;
+        DROP TABLE cursos_trechos;
+    """)
+    conn.close()
+
+    assert CatalogoSQLite(caminho).buscar_cursos_filtrados(None, ['Kube']) == \
+        IndiceCursos(cursos).filtrar(None, ['Kube'])
+
+
+def test_ranking_pondera_a_area():
+    catalogo = CatalogoSQLite(':memory:')
+    catalogo.sincronizar_cursos([
+        {'titulo': titulo, 'url': f'https://www.alura.com.br/curso-online-{i}',
+         'aprendizado': 'Projetos', 'publico_alvo': 'Iniciantes'}
+        for i, titulo in enumerate(['Python aplicado', 'Data Science aplicada', 'Excel', 'Figma'])
+    ])
+
+    ranking = catalogo.buscar_cursos_filtrados('Data Science', ['Python'], limite=2)
+
+    assert [c['titulo'] for c in ranking] == ['Data Science aplicada', 'Python aplicado']
@@ -0,0 +1,82 @@
+"""
+Testes do checkpoint do scraper
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+extrair_todos_detalhes grava no catálogo (SQLite em memória) os cursos
+servidos pelo site local: o checkpoint só retoma passagens interrompidas,
+e um curso que falha sempre não pode travar as execuções seguintes.
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("lxml")
+pytest.importorskip("firebase_admin")  # catalogo_db padrão, importado pelo scraper
+
+import alura_scraper
+from alura_scraper import CheckpointScraper, CrawlerAlura, extrair_todos_detalhes
+from catalogo_sqlite import CatalogoSQLite
+from site_alura_local import SiteAluraLocal, copiar_paginas
+
+
+@pytest.fixture
+def catalogo(monkeypatch):
+    catalogo = CatalogoSQLite(':memory:')
+    monkeypatch.setattr(alura_scraper, 'catalogo_db', catalogo)
+    return catalogo
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return CheckpointScraper(str(tmp_path / 'checkpoint.jsonl'), str(tmp_path / 'falhas.json'))
+
+
+def _rodar(site, checkpoint):
+    crawler = CrawlerAlura(base_url=site.url, concorrencia=1, requisicoes_por_segundo=0,
+                           tentativas=2, backoff=0.01)
+    extrair_todos_detalhes(crawler, tamanho_lote=2, checkpoint=checkpoint)
+    return crawler
+
+
+def test_falha_permanente_nao_trava_o_checkpoint(catalogo, checkpoint, tmp_path):
+    with SiteAluraLocal(copiar_paginas(tmp_path / 'paginas')) as site:
+        _rodar(site, checkpoint)
+        removido = f"{site.url}/curso-online-removido"
+
+        assert len(catalogo.buscar_cursos()) == 5
+        assert not os.path.exists(checkpoint.caminho)
+        assert checkpoint.carregar_falhas() == [removido]
+
+        # Próxima passagem: tudo de novo, começando pela falha anterior
+        del site.historico[:]
+        _rodar(site, checkpoint)
+
+    assert site.historico[:2] == ['/cursos-online-tecnologia', '/curso-online-removido']
+    assert sorted(site.historico[2:]) == [f'/curso-online-{nome}' for nome in
+                                          ['docker', 'kubernetes', 'python-fundamentos', 'react', 'sql']]
+    assert not os.path.exists(checkpoint.caminho)
+    assert checkpoint.carregar_falhas() == [removido]
+
+
+def test_retoma_passagem_interrompida_e_limpa_as_falhas(catalogo, checkpoint, tmp_path):
+    paginas = copiar_paginas(tmp_path / 'paginas')
+    os.remove(os.path.join(paginas, 'curso-online-sql'))
+    with SiteAluraLocal(paginas) as site:
+        # Execução anterior caiu depois de gravar docker e react
+        checkpoint.registrar([f"{site.url}/curso-online-docker", f"{site.url}/curso-online-react"])
+        checkpoint.registrar_falhas([f"{site.url}/curso-online-sql"])
+
+        with open(os.path.join(paginas, 'curso-online-removido'), 'w', encoding='utf-8') as f:
+            f.write('<h1 class="curso-banner-course-title">Curso de volta</h1>')
+        with open(os.path.join(paginas, 'curso-online-sql'), 'w', encoding='utf-8') as f:
+            f.write('<h1 class="curso-banner-course-title">SQL de novo</h1>')
+
+        _rodar(site, checkpoint)
+
+    # Falha anterior primeiro; o que o checkpoint já tinha não é baixado
+    assert site.historico == ['/cursos-online-tecnologia', '/curso-online-sql', '/curso-online-kubernetes',
+                              '/curso-online-python-fundamentos', '/curso-online-removido']
+    assert {c['titulo'] for c in catalogo.buscar_cursos()} >= {'Curso de volta', 'SQL de novo'}
+    assert not os.path.exists(checkpoint.caminho)
+    assert not os.path.exists(checkpoint.caminho_falhas)
@@ -0,0 +1,90 @@
+"""
+Testes da busca filtrada no modo servidor (CATALOGO_CONSULTA=servidor)
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Filtrando no Firestore (em memória) e ranqueando só os candidatos, o
+resultado tem de ser o mesmo do índice sobre o snapshot completo, mesmo
+quando a consulta casa com centenas de cursos. Sem limite, o filtro por
+substring ("Java" também encontra "JavaScript") vale nos dois modos.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("firebase_admin")
+
+from database import firebase_db
+from firestore_memoria import ClienteFirestoreMemoria
+
+TEMAS = ['Python', 'Java', 'JavaScript', 'SQL', 'Docker', 'Machine Learning', 'React', 'Excel']
+
+
+def _catalogo(n, semente=7):
+    rng = random.Random(semente)
+    return [
+        {
+            'titulo': f"{rng.choice(TEMAS)} {rng.choice(['básico', 'avançado', 'na prática'])} {i}",
+            'url': f'https://www.alura.com.br/curso-online-{i}',
+            'aprendizado': ' '.join(rng.choices(TEMAS + ['dados', 'projetos', 'testes'], k=rng.randint(3, 30))),
+            'publico_alvo': rng.choice(['Iniciantes', 'Pessoas desenvolvedoras', 'Analistas de dados'])
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def cliente():
+    cliente = ClienteFirestoreMemoria()
+    firebase_db.usar_cliente(cliente)
+    firebase_db.sincronizar_cursos(_catalogo(600))
+    yield cliente
+    firebase_db.invalidar_cache()
+
+
+@pytest.mark.parametrize('area, habilidades', [
+    ('Data Science', ['Python', 'SQL']),
+    (None, ['Java']),
+    ('Desenvolvimento Web', ['React', 'Machine Learning', 'Kotlin']),
+])
+def test_ranking_no_servidor_igual_ao_snapshot(cliente, monkeypatch, area, habilidades):
+    snapshot = firebase_db.buscar_cursos_filtrados(area, habilidades, limite=10)
+
+    monkeypatch.setattr(firebase_db, 'CONSULTA', 'servidor')
+    servidor = firebase_db.buscar_cursos_filtrados(area, habilidades, limite=10)
+
+    assert [c['url'] for c in servidor] == [c['url'] for c in snapshot]
+
+
+def test_filtro_no_servidor_le_todos_os_candidatos(cliente, monkeypatch):
+    snapshot = firebase_db.buscar_cursos_filtrados(None, ['Python'])
+    assert len(snapshot) > 200
+
+    monkeypatch.setattr(firebase_db, 'CONSULTA', 'servidor')
+    servidor = firebase_db.buscar_cursos_filtrados(None, ['Python'])
+
+    assert {c['url'] for c in servidor} == {c['url'] for c in snapshot}
+
+
+@pytest.mark.parametrize('habilidades, esperados', [
+    (['Java'], {'JavaScript moderno', 'Java e orientação a objetos'}),
+    (['Kube'], {'Docker e Kubernetes'}),
+    (['Ja', 'Go'], {'JavaScript moderno', 'Java e orientação a objetos', 'Go para back-end'}),
+])
+def test_filtro_no_servidor_casa_trechos_como_o_snapshot(monkeypatch, habilidades, esperados):
+    firebase_db.usar_cliente(ClienteFirestoreMemoria())
+    firebase_db.sincronizar_cursos([
+        {'titulo': titulo, 'url': f'https://www.alura.com.br/curso-online-{i}',
+         'aprendizado': '', 'publico_alvo': 'Pessoas desenvolvedoras'}
+        for i, titulo in enumerate(['JavaScript moderno', 'Java e orientação a objetos',
+                                    'Docker e Kubernetes', 'Go para back-end', 'Excel avançado'])
+    ])
+    try:
+        snapshot = firebase_db.buscar_cursos_filtrados(None, habilidades)
+        monkeypatch.setattr(firebase_db, 'CONSULTA', 'servidor')
+        servidor = firebase_db.buscar_cursos_filtrados(None, habilidades)
+    finally:
+        firebase_db.invalidar_cache()
+
+    assert {c['titulo'] for c in snapshot} == esperados
+    assert {c['titulo'] for c in servidor} == esperados
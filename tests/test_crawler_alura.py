@@ -0,0 +1,122 @@
+"""
+Testes do crawler concorrente da Alura
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+O CrawlerAlura roda contra um servidor local (site_alura_local.py) que
+serve as páginas de paginas_alura/ e devolve 429/5xx programados: as
+novas tentativas, o backoff, o paralelismo, as estatísticas por URL e
+o recrawl com GET condicional (304 -> inalterado) têm de aparecer nas
+contagens do próprio servidor.
+"""
+
+import os
+import time
+
+import pytest
+
+pytest.importorskip("lxml")
+pytest.importorskip("firebase_admin")  # catalogo_db padrão, importado pelo scraper
+
+from alura_scraper import CrawlerAlura
+from cache_paginas import CachePaginas
+from site_alura_local import SiteAluraLocal, copiar_paginas
+
+CURSOS = ['docker', 'kubernetes', 'python-fundamentos', 'react', 'removido', 'sql']
+
+
+def _crawler(site, **opcoes):
+    opcoes = {'concorrencia': 4, 'requisicoes_por_segundo': 0, 'tentativas': 3, 'backoff': 0.05, **opcoes}
+    return CrawlerAlura(base_url=site.url, **opcoes)
+
+
+@pytest.fixture
+def paginas(tmp_path):
+    return copiar_paginas(tmp_path / 'paginas')
+
+
+def test_extrai_links_e_cursos_em_paralelo(paginas):
+    with SiteAluraLocal(paginas) as site:
+        crawler = _crawler(site)
+        links = crawler.extrair_links()
+        cursos = crawler.extrair_detalhes(links)
+
+    assert links == [f"{site.url}/curso-online-{nome}" for nome in CURSOS]
+    assert cursos[0] == {
+        'titulo': 'Docker: criando containers',
+        'url': f"{site.url}/curso-online-docker",
+        'aprendizado': 'Imagens e containers | Volumes | Docker Compose',
+        'publico_alvo': 'Pessoas desenvolvedoras e de infraestrutura'
+    }
+    assert cursos[CURSOS.index('removido')] is None
+    assert crawler.resumo_situacoes() == {'novo': 5, 'alterado': 0, 'inalterado': 0, 'erro': 1}
+    assert 1 < site.max_simultaneas <= crawler.concorrencia
+
+
+def test_retenta_429_e_5xx_com_backoff(paginas):
+    falhas = {
+        '/curso-online-docker': [503, 503],  # recupera na 3ª tentativa
+        '/curso-online-sql': [429],  # recupera na 2ª
+        '/curso-online-react': [500] * 5,  # esgota as tentativas
+    }
+    with SiteAluraLocal(paginas, falhas=falhas) as site:
+        crawler = _crawler(site)
+        links = [f"{site.url}/curso-online-{nome}" for nome in CURSOS]
+        cursos = dict(zip(CURSOS, crawler.extrair_detalhes(links)))
+
+    assert cursos['docker']['titulo'] == 'Docker: criando containers'
+    assert cursos['sql']['titulo'] == 'SQL com MySQL'
+    assert cursos['react'] is None
+    assert cursos['removido'] is None
+
+    # Servidor e crawler contam as mesmas tentativas; 404 não é retentado
+    tentativas = {nome: site.requisicoes[f'/curso-online-{nome}'] for nome in CURSOS}
+    assert tentativas == {'docker': 3, 'kubernetes': 1, 'python-fundamentos': 1,
+                          'react': 3, 'removido': 1, 'sql': 2}
+    estatisticas = {nome: crawler.estatisticas[f"{site.url}/curso-online-{nome}"] for nome in CURSOS}
+    assert {nome: e['tentativas'] for nome, e in estatisticas.items()} == tentativas
+    assert {nome: e['status'] for nome, e in estatisticas.items()} == {
+        'docker': 200, 'kubernetes': 200, 'python-fundamentos': 200,
+        'react': 500, 'removido': 404, 'sql': 200
+    }
+
+    # Backoff: 0.05 * (1 + 2) com jitter de no mínimo 0.5x antes da 3ª tentativa
+    assert estatisticas['docker']['tempo_ms'] >= 75
+    assert estatisticas['react']['tempo_ms'] >= 75
+
+    resumo = crawler.resumo_estatisticas()
+    assert resumo['urls'] == len(CURSOS)
+    assert resumo['falhas'] == 2
+    assert resumo['novas_tentativas'] == 2 + 1 + 2
+    assert resumo['tempo_p50_ms'] <= resumo['tempo_p95_ms'] <= resumo['tempo_max_ms']
+
+
+def test_recrawl_com_get_condicional(paginas, tmp_path):
+    caminho_cache = str(tmp_path / 'cache_paginas.json')
+
+    with SiteAluraLocal(paginas) as site:
+        primeira = _crawler(site, cache=CachePaginas(caminho_cache))
+        links = primeira.extrair_links()
+        assert len(primeira.extrair_detalhes(links, apenas_alterados=True)) == 5
+        primeira.cache.salvar()
+
+        # Segunda execução: o cache em disco manda If-Modified-Since
+        segunda = _crawler(site, cache=CachePaginas(caminho_cache))
+        assert segunda.extrair_detalhes(links, apenas_alterados=True) == []
+        assert segunda.resumo_situacoes() == {'novo': 0, 'alterado': 0, 'inalterado': 5, 'erro': 1}
+        assert site.respostas['/curso-online-sql'] == [200, 304]
+
+        # Página alterada (Last-Modified mais novo) volta com 200 e novo conteúdo
+        sql = os.path.join(paginas, 'curso-online-sql')
+        with open(sql, encoding='utf-8') as f:
+            conteudo = f.read().replace('SQL com MySQL', 'SQL com PostgreSQL')
+        with open(sql, 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+        futuro = time.time() + 60
+        os.utime(sql, (futuro, futuro))
+
+        terceira = _crawler(site, cache=CachePaginas(caminho_cache))
+        alterados = terceira.extrair_detalhes(links, apenas_alterados=True)
+
+    assert [curso['titulo'] for curso in alterados] == ['SQL com PostgreSQL']
+    assert terceira.resumo_situacoes() == {'novo': 0, 'alterado': 1, 'inalterado': 4, 'erro': 1}
+    assert site.respostas['/curso-online-sql'] == [200, 304, 200]
@@ -0,0 +1,151 @@
+"""
+Testes do plano de carreira em fluxo (SSE)
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+O endpoint /planos/fluxo roda no test client do Flask com o
+ClienteLLMFalso: os eventos trecho/fim/erro têm de chegar na ordem, e um
+cliente que fecha a resposta no meio tem de cancelar a geração no modelo.
+"""
+
+import json
+import types
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("firebase_admin")  # catalogo_db padrão, importado pelo gpt_recommender
+
+import main
+import planos_carreira
+from gpt_recommender import ClienteGemini, ClienteLLMFalso
+from planos_carreira import CachePlanos, GerenciadorPlanos
+
+CURSOS = [
+    {'titulo': 'Python para Data Science', 'url': 'https://www.alura.com.br/curso-online-python',
+     'aprendizado': 'Pandas | NumPy', 'publico_alvo': 'Iniciantes'}
+]
+PLANO = "Mês 1: Python\nMês 2: SQL\nMês 3: Pandas\nMês 4: Projeto final\n"
+FORMULARIO = {'profissao_atual': 'Analista de dados', 'objetivo_principal': 'Atualizar Carreira',
+              'area_especializacao_desejada': 'Data Science'}
+
+
+class ClienteQuebrado(ClienteLLMFalso):
+    """Falha depois do primeiro trecho, como uma conexão perdida com a API"""
+
+    def gerar_fluxo(self, prompt):
+        yield "Mês 1: Python\n"
+        raise RuntimeError("conexão com o modelo perdida")
+
+
+def _eventos(corpo):
+    """[(evento, dados)] de um corpo text/event-stream"""
+    eventos = []
+    for bloco in corpo.strip().split("\n\n"):
+        campos = dict(linha.split(": ", 1) for linha in bloco.splitlines())
+        eventos.append((campos.get('event'), json.loads(campos['data'])))
+    return eventos
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(planos_carreira, 'selecionar_cursos', lambda input_data: CURSOS)
+    gerenciadores = []
+
+    def usar(cliente):
+        gerenciador = GerenciadorPlanos(cliente=cliente, cache=CachePlanos(None))
+        gerenciadores.append(gerenciador)
+        monkeypatch.setattr(main, '_gerenciador_planos', gerenciador)
+        return main.app.test_client(), gerenciador
+
+    yield usar
+    for gerenciador in gerenciadores:
+        gerenciador.encerrar()
+
+
+def test_fluxo_envia_trechos_e_fim(app):
+    cliente_http, gerenciador = app(ClienteLLMFalso(resposta=PLANO, atraso_trecho=0))
+
+    resposta = cliente_http.post('/planos/fluxo', json=FORMULARIO)
+
+    assert resposta.mimetype == 'text/event-stream'
+    eventos = _eventos(resposta.get_data(as_text=True))
+    assert eventos == [('trecho', {'texto': linha}) for linha in PLANO.splitlines(keepends=True)] + [('fim', {})]
+
+    # Concluído, entra no cache: o próximo pedido sai em um trecho só
+    eventos = _eventos(cliente_http.post('/planos/fluxo', json=FORMULARIO).get_data(as_text=True))
+    assert eventos == [('trecho', {'texto': PLANO}), ('fim', {})]
+    assert gerenciador.cliente.chamadas == 1
+    assert gerenciador.estatisticas['gerados'] == 1
+
+
+def test_fluxo_com_falha_termina_com_erro(app):
+    cliente_http, gerenciador = app(ClienteQuebrado())
+
+    eventos = _eventos(cliente_http.post('/planos/fluxo', json=FORMULARIO).get_data(as_text=True))
+
+    assert eventos == [
+        ('trecho', {'texto': "Mês 1: Python\n"}),
+        ('erro', {'mensagem': "conexão com o modelo perdida"})
+    ]
+    assert gerenciador.estatisticas['gerados'] == 0
+
+
+def test_cliente_que_desconecta_cancela_a_geracao(app):
+    cliente_http, gerenciador = app(ClienteLLMFalso(resposta=PLANO, atraso_trecho=0))
+
+    resposta = cliente_http.post('/planos/fluxo', json=FORMULARIO, buffered=False)
+    primeiro = next(iter(resposta.response))
+    resposta.close()
+
+    assert _eventos(primeiro.decode('utf-8')) == [('trecho', {'texto': "Mês 1: Python\n"})]
+    assert gerenciador.cliente.cancelados == 1
+    assert gerenciador.estatisticas['fluxos_cancelados'] == 1
+    assert gerenciador.estatisticas['gerados'] == 0
+
+    # A vaga de geração foi devolvida: um novo fluxo completa normalmente
+    eventos = _eventos(cliente_http.post('/planos/fluxo', json=FORMULARIO).get_data(as_text=True))
+    assert eventos[-1] == ('fim', {})
+
+
+class _TrechoSemTexto:
+    """Trecho do Gemini sem partes: .text levanta ValueError"""
+
+    def __init__(self, prompt_feedback=None, candidates=()):
+        self.prompt_feedback = prompt_feedback
+        self.candidates = list(candidates)
+
+    @property
+    def text(self):
+        raise ValueError("The `response.text` quick accessor requires the response to contain a valid `Part`")
+
+
+def _cliente_gemini(trechos):
+    cliente = ClienteGemini.__new__(ClienteGemini)
+    cliente.model = types.SimpleNamespace(generate_content=lambda prompt, stream: iter(trechos))
+    return cliente
+
+
+def test_gemini_pula_trechos_sem_texto():
+    cliente = _cliente_gemini([
+        types.SimpleNamespace(text="Mês 1: Python\n"),
+        _TrechoSemTexto(),
+        types.SimpleNamespace(text=""),
+        types.SimpleNamespace(text="Mês 2: SQL\n"),
+        _TrechoSemTexto(candidates=[types.SimpleNamespace(finish_reason=types.SimpleNamespace(name='STOP'))]),
+    ])
+
+    assert list(cliente.gerar_fluxo("prompt")) == ["Mês 1: Python\n", "Mês 2: SQL\n"]
+
+
+def test_gemini_bloqueado_vira_erro_no_fluxo(app):
+    bloqueado = _TrechoSemTexto(
+        candidates=[types.SimpleNamespace(finish_reason=types.SimpleNamespace(name='SAFETY'))]
+    )
+    cliente_http, _ = app(_cliente_gemini([types.SimpleNamespace(text="Mês 1: Python\n"), bloqueado]))
+
+    eventos = _eventos(cliente_http.post('/planos/fluxo', json=FORMULARIO).get_data(as_text=True))
+
+    assert eventos == [
+        ('trecho', {'texto': "Mês 1: Python\n"}),
+        ('erro', {'mensagem': "Resposta bloqueada pelo Gemini (SAFETY)"})
+    ]
@@ -0,0 +1,155 @@
+"""
+Testes da geração assíncrona de planos de carreira
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+GerenciadorPlanos roda com o ClienteLLMFalso (sem API) e com os cursos
+fixos: pedidos idênticos em andamento viram um job só, o cache em disco
+expira com o TTL e nunca há mais gerações simultâneas que `concorrencia`.
+"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("firebase_admin")  # catalogo_db padrão, importado pelo gpt_recommender
+
+import planos_carreira
+from gpt_recommender import ClienteLLMFalso
+from planos_carreira import CachePlanos, GerenciadorPlanos
+
+CURSOS = [
+    {'titulo': 'Python para Data Science', 'url': 'https://www.alura.com.br/curso-online-python',
+     'aprendizado': 'Pandas | NumPy', 'publico_alvo': 'Iniciantes'}
+]
+
+
+def _formulario(profissao='Analista de dados'):
+    return {
+        'profissao_atual': profissao,
+        'anos_experiencia': 3,
+        'nivel_atual': 'Pleno',
+        'habilidades_atuais_hard': ['SQL', 'Python'],
+        'objetivo_principal': 'Atualizar Carreira',
+        'area_especializacao_desejada': 'Data Science',
+    }
+
+
+class ClienteContador(ClienteLLMFalso):
+    """ClienteLLMFalso que registra quantas gerações rodam ao mesmo tempo"""
+
+    def __init__(self, **opcoes):
+        super().__init__(**opcoes)
+        self._lock = threading.Lock()
+        self.simultaneas = 0
+        self.max_simultaneas = 0
+
+    def gerar(self, prompt):
+        with self._lock:
+            self.simultaneas += 1
+            self.max_simultaneas = max(self.max_simultaneas, self.simultaneas)
+        try:
+            return super().gerar(prompt)
+        finally:
+            with self._lock:
+                self.simultaneas -= 1
+
+
+@pytest.fixture(autouse=True)
+def cursos_fixos(monkeypatch):
+    monkeypatch.setattr(planos_carreira, 'selecionar_cursos', lambda input_data: CURSOS)
+
+
+@pytest.fixture
+def gerenciador(tmp_path):
+    gerenciador = GerenciadorPlanos(
+        cliente=ClienteContador(atraso=0.2), concorrencia=2,
+        cache=CachePlanos(str(tmp_path / 'cache_planos.json'), ttl=60)
+    )
+    yield gerenciador
+    gerenciador.encerrar()
+
+
+def test_pedidos_identicos_em_andamento_viram_um_job(gerenciador):
+    jobs = [gerenciador.submeter(_formulario()) for _ in range(5)]
+    # Mesmo input com espaços e ordem diferentes
+    jobs.append(gerenciador.submeter({**_formulario(), 'profissao_atual': ' Analista de dados ',
+                                      'habilidades_atuais_hard': ['Python', 'SQL']}))
+
+    assert len({job['id'] for job in jobs}) == 1
+    concluido = gerenciador.aguardar(jobs[0]['id'], timeout=5)
+    assert (concluido['estado'], concluido['origem']) == ('concluido', 'llm')
+    assert concluido['plano'].startswith('PLANO DE CARREIRA')
+
+    # Depois de pronto, o mesmo pedido sai do cache sem chamar o modelo
+    do_cache = gerenciador.submeter(_formulario())
+    assert do_cache['id'] != jobs[0]['id']
+    assert (do_cache['estado'], do_cache['origem']) == ('concluido', 'cache')
+    assert do_cache['plano'] == concluido['plano']
+
+    assert gerenciador.cliente.chamadas == 1
+    assert gerenciador.estatisticas['deduplicados'] == 5
+    assert gerenciador.estatisticas['cache'] == 1
+    assert gerenciador.estatisticas['gerados'] == 1
+
+
+def test_cache_expira_com_o_ttl(tmp_path):
+    caminho = str(tmp_path / 'cache_planos.json')
+    cliente = ClienteLLMFalso(atraso=0)
+    gerenciador = GerenciadorPlanos(cliente=cliente, cache=CachePlanos(caminho, ttl=0.3))
+    try:
+        gerenciador.aguardar(gerenciador.submeter(_formulario())['id'], timeout=5)
+        assert gerenciador.submeter(_formulario())['origem'] == 'cache'
+
+        # O cache em disco vale para outro processo enquanto não expira
+        chave = gerenciador.preparar(_formulario())[2]
+        assert CachePlanos(caminho, ttl=0.3).obter(chave) is not None
+
+        time.sleep(0.4)
+        assert CachePlanos(caminho, ttl=0.3).obter(chave) is None
+        job = gerenciador.aguardar(gerenciador.submeter(_formulario())['id'], timeout=5)
+    finally:
+        gerenciador.encerrar()
+
+    assert job['origem'] == 'llm'
+    assert cliente.chamadas == 2
+
+
+def test_limite_de_geracoes_simultaneas(gerenciador):
+    jobs = [gerenciador.submeter(_formulario(f'Profissão {i}')) for i in range(6)]
+    assert len({job['id'] for job in jobs}) == 6
+
+    estados = [gerenciador.aguardar(job['id'], timeout=10)['estado'] for job in jobs]
+
+    assert estados == ['concluido'] * 6
+    assert gerenciador.cliente.chamadas == 6
+    assert gerenciador.cliente.max_simultaneas == gerenciador.concorrencia == 2
+
+
+def test_gerenciador_do_app_e_criado_uma_vez(monkeypatch):
+    main = pytest.importorskip("main")
+    criados = []
+
+    class GerenciadorLento:
+        def __init__(self):
+            time.sleep(0.05)  # abre a janela da corrida entre os primeiros pedidos
+            criados.append(self)
+
+    monkeypatch.setattr(planos_carreira, 'GerenciadorPlanos', GerenciadorLento)
+    monkeypatch.setattr(main, '_gerenciador_planos', None)
+
+    barreira = threading.Barrier(8)
+    obtidos = []
+
+    def pedir():
+        barreira.wait()
+        obtidos.append(main.gerenciador_planos())
+
+    threads = [threading.Thread(target=pedir) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(criados) == 1
+    assert all(obtido is criados[0] for obtido in obtidos)
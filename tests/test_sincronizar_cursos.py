@@ -0,0 +1,88 @@
+"""
+Testes da sincronização do catálogo no Firestore
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+FirebaseDB.sincronizar_cursos roda sobre o Firestore em memória
+(firestore_memoria.py): as contagens devolvidas têm de bater com o que
+foi de fato escrito na coleção.
+"""
+
+import pytest
+
+pytest.importorskip("firebase_admin")
+
+from catalogo_base import id_curso
+from database import firebase_db
+from firestore_memoria import ClienteFirestoreMemoria
+
+
+def _curso(n, aprendizado="Fundamentos de Python e SQL"):
+    return {
+        'titulo': f'Curso {n}',
+        'url': f'https://www.alura.com.br/curso-online-{n}',
+        'aprendizado': aprendizado,
+        'publico_alvo': 'Pessoas desenvolvedoras'
+    }
+
+
+def _titulos(cliente):
+    colecao = cliente.collection(firebase_db.COLLECTION_NAME)
+    return sorted(doc.to_dict()['titulo'] for doc in colecao.stream())
+
+
+@pytest.fixture
+def cliente():
+    cliente = ClienteFirestoreMemoria()
+    firebase_db.usar_cliente(cliente)
+    yield cliente
+    firebase_db.invalidar_cache()
+
+
+def test_sincronizar_adiciona_cursos(cliente):
+    resumo = firebase_db.sincronizar_cursos([_curso(1), _curso(2), _curso(3)])
+
+    assert resumo['adicionados'] == 3
+    assert (resumo['atualizados'], resumo['removidos'], resumo['inalterados']) == (0, 0, 0)
+    assert resumo['batches'] == 1
+    assert _titulos(cliente) == ['Curso 1', 'Curso 2', 'Curso 3']
+
+
+def test_sincronizar_escreve_so_a_diferenca(cliente):
+    firebase_db.sincronizar_cursos([_curso(1), _curso(2), _curso(3)])
+    colecao = cliente.collection(firebase_db.COLLECTION_NAME)
+    intocado = colecao.document(id_curso(_curso(1))).get().to_dict()
+
+    # 1 inalterado, 2 alterado, 3 removido, 4 novo
+    novos = [_curso(1), _curso(2, aprendizado="Docker e Kubernetes"), _curso(4)]
+    resumo = firebase_db.sincronizar_cursos(novos)
+
+    assert resumo['adicionados'] == 1
+    assert resumo['atualizados'] == 1
+    assert resumo['removidos'] == 1
+    assert resumo['inalterados'] == 1
+    assert _titulos(cliente) == ['Curso 1', 'Curso 2', 'Curso 4']
+    assert colecao.document(id_curso(_curso(2))).get().to_dict()['aprendizado'] == "Docker e Kubernetes"
+    assert colecao.document(id_curso(_curso(1))).get().to_dict() == intocado
+
+
+def test_sincronizar_sem_mudancas_nao_escreve(cliente):
+    cursos = [_curso(1), _curso(2)]
+    firebase_db.sincronizar_cursos(cursos)
+    escritas = cliente.escritas
+
+    resumo = firebase_db.sincronizar_cursos(cursos)
+
+    assert resumo['inalterados'] == 2
+    assert (resumo['adicionados'], resumo['atualizados'], resumo['removidos']) == (0, 0, 0)
+    assert resumo['batches'] == 0
+    assert cliente.escritas == escritas
+
+
+def test_sincronizar_sem_remover_ausentes(cliente):
+    firebase_db.sincronizar_cursos([_curso(1), _curso(2)])
+
+    resumo = firebase_db.sincronizar_cursos([_curso(1)], remover_ausentes=False)
+
+    assert resumo['removidos'] == 0
+    assert resumo['inalterados'] == 1
+    assert _titulos(cliente) == ['Curso 1', 'Curso 2']
@@ -0,0 +1,115 @@
+"""
+Testes das visões materializadas (área/habilidade -> cursos)
+Sistema de Recomendação de Carreira - FIAP Global Solution 2025
+
+Depois de cada ingestão, o documento de cada visão tem de ter exatamente
+os cursos que montar_visoes calcula sobre o catálogo gravado, sem as
+pontuações de todos os cursos no próprio documento.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("firebase_admin")
+
+from database import firebase_db
+from firestore_memoria import ClienteFirestoreMemoria
+from indexacao_cursos import TAMANHO_VISAO, id_visao, montar_visoes, publico, visoes
+
+TEMAS = ['Python', 'Java', 'SQL', 'Docker', 'Machine Learning', 'React', 'Figma', 'Data Science', 'DevOps']
+
+
+def _curso(i, rng):
+    return {
+        'titulo': f"{rng.choice(TEMAS)} {i}",
+        'url': f'https://www.alura.com.br/curso-online-{i}',
+        'aprendizado': ' '.join(rng.choices(TEMAS + ['projetos', 'testes'], k=rng.randint(2, 12))),
+        'publico_alvo': rng.choice(['Iniciantes', 'Pessoas desenvolvedoras'])
+    }
+
+
+def _conferir_visoes(cliente):
+    """As visões gravadas batem com as calculadas sobre a coleção"""
+    colecao = cliente.collection(firebase_db.COLLECTION_NAME)
+    esperadas = montar_visoes([publico(doc.to_dict()) for doc in colecao.stream()])
+
+    visoes_ref = cliente.collection(firebase_db.COLLECTION_VISOES)
+    for tipo, c in visoes():
+        gravada = visoes_ref.document(id_visao(tipo, c)).get().to_dict()
+        assert set(gravada) == {'tipo', 'chave', 'cursos'}
+        assert len(gravada['cursos']) <= TAMANHO_VISAO
+        assert gravada['cursos'] == esperadas.get(id_visao(tipo, c), [])
+
+
+@pytest.fixture
+def cliente():
+    cliente = ClienteFirestoreMemoria()
+    firebase_db.usar_cliente(cliente)
+    yield cliente
+    firebase_db.invalidar_cache()
+
+
+def test_visoes_acompanham_as_ingestoes(cliente):
+    rng = random.Random(3)
+    cursos = [_curso(i, rng) for i in range(150)]
+
+    firebase_db.sincronizar_cursos(cursos)
+    _conferir_visoes(cliente)
+
+    # Alterados (mudam de visões), removidos e novos
+    cursos = [_curso(i, rng) if i % 7 == 0 else curso for i, curso in enumerate(cursos[:120])]
+    cursos += [_curso(i, rng) for i in range(150, 170)]
+    firebase_db.sincronizar_cursos(cursos)
+    _conferir_visoes(cliente)
+
+    firebase_db.salvar_cursos([_curso(i, rng) for i in range(0, 40, 3)])
+    _conferir_visoes(cliente)
+
+    firebase_db.remover_ausentes([curso['url'] for curso in cursos[:100]])
+    _conferir_visoes(cliente)
+
+
+def test_visoes_no_formato_antigo_sao_reconstruidas(cliente):
+    rng = random.Random(5)
+    firebase_db.sincronizar_cursos([_curso(i, rng) for i in range(60)])
+
+    # Documento de visão com o mapa de pontuações embutido (formato antigo)
+    vid = id_visao('habilidade', 'python')
+    visoes_ref = cliente.collection(firebase_db.COLLECTION_VISOES)
+    antiga = visoes_ref.document(vid).get().to_dict()
+    visoes_ref.document(vid).set({**antiga, 'pontuacoes': {item['id']: item['pontuacao'] for item in antiga['cursos']}})
+
+    firebase_db.salvar_cursos([_curso(60, rng)])
+    _conferir_visoes(cliente)
+
+
+def test_recomendados_iguais_no_snapshot_e_no_servidor(cliente, monkeypatch):
+    rng = random.Random(9)
+    firebase_db.sincronizar_cursos([_curso(i, rng) for i in range(200)])
+
+    consulta = ('Data Science', ['Python', 'SQL', 'Docker'])
+    snapshot = firebase_db.buscar_cursos_recomendados(*consulta, limite=10)
+    leituras = cliente.leituras
+    assert firebase_db.buscar_cursos_recomendados(*consulta, limite=10) == snapshot
+    assert cliente.leituras == leituras  # servido do snapshot em memória
+
+    monkeypatch.setattr(firebase_db, 'CONSULTA', 'servidor')
+    assert firebase_db.buscar_cursos_recomendados(*consulta, limite=10) == snapshot
+
+
+def test_habilidade_fora_do_vocabulario_usa_a_busca_filtrada(cliente):
+    rng = random.Random(11)
+    cursos = [_curso(i, rng) for i in range(80)]
+    cursos.append({
+        'titulo': 'Testes automatizados com Selenium',
+        'url': 'https://www.alura.com.br/curso-online-selenium',
+        'aprendizado': 'Selenium WebDriver e Python',
+        'publico_alvo': 'Pessoas testadoras'
+    })
+    firebase_db.sincronizar_cursos(cursos)
+
+    recomendados = firebase_db.buscar_cursos_recomendados('Data Science', ['Python', 'Selenium'], limite=10)
+
+    assert recomendados == firebase_db.buscar_cursos_filtrados('Data Science', ['Python', 'Selenium'], limite=10)
+    assert 'Testes automatizados com Selenium' in [c['titulo'] for c in recomendados]